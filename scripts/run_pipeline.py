@@ -10,6 +10,7 @@ import argparse
 import json
 import os
 import sys
+from functools import partial
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
@@ -20,11 +21,16 @@ project_root = script_dir.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
-from src.core.guard_registry import get_sorted_guards  # noqa: E402
+from src.core.document_analysis import DocumentAnalysis  # noqa: E402
+from src.core.guard_cache import get_result_cache  # noqa: E402
+from src.core.guard_executor import execute_guards  # noqa: E402
+from src.core.guard_registry import enabled_guards, load_guards  # noqa: E402
+from src.core.guard_session import get_guard_session  # noqa: E402
+from src.core.guard_stats import GuardStats  # noqa: E402
 from src.core.retry_controller import run_with_retry  # noqa: E402
 from src.exceptions import RetryException  # noqa: E402
 from src.llm.gemini_client import GeminiClient  # noqa: E402
-from src.utils.path_helper import data_path  # noqa: E402
+from src.utils.path_helper import data_path, out_path  # noqa: E402
 
 # TODO: from src.main import run_pipeline  # Not used in current implementation
 
@@ -73,22 +79,10 @@ def test_guards_auto_registry(episode_num: int, project: str = "default") -> boo
     Returns
     -------
     bool
-        True if all guards pass, False otherwise
+        True if every guard with input to check passes, False otherwise
     """
-    # Import all guards to trigger registration
-    import src.plugins.anchor_guard  # noqa: F401
-    import src.plugins.critique_guard  # noqa: F401
-    import src.plugins.date_guard  # noqa: F401
-    import src.plugins.emotion_guard  # noqa: F401
-    import src.plugins.immutable_guard  # noqa: F401
-    import src.plugins.lexi_guard  # noqa: F401
-    import src.plugins.pacing_guard  # noqa: F401
-    import src.plugins.relation_guard  # noqa: F401
-    import src.plugins.rule_guard  # noqa: F401
-    import src.plugins.schedule_guard  # noqa: F401
-
-    # Get registered guards in order
-    guard_classes = get_sorted_guards()
+    # Import only the guards enabled for the project (all when unconfigured)
+    guard_classes = load_guards(enabled_guards(project))
     guards_passed = 0
     total_guards = len(guard_classes)
 
@@ -101,75 +95,72 @@ def test_guards_auto_registry(episode_num: int, project: str = "default") -> boo
 
     print(f"Testing {total_guards} guards using auto-registry...")
 
-    for _i, guard_class in enumerate(guard_classes, 1):
+    # Tokenize the draft once; text guards share the cached analysis
+    analysis = DocumentAnalysis(draft_content)
+
+    # Guards are built once per project and reused across episodes
+    session = get_guard_session(project)
+    # Unchanged inputs and config replay the cached outcome of pure guards
+    cache = get_result_cache(project)
+
+    jobs = {}
+    for guard_class in guard_classes:
         guard_name = guard_class.__name__
+        # Get guard instance with error handling for constructor issues
         try:
-            # Create guard instance with error handling for constructor issues
+            guard = session.get(guard_class)
+        except TypeError:
+            # Try without project parameter for guards that don't accept it
             try:
-                guard = guard_class(project=project)
+                guard = guard_class()
             except TypeError:
-                # Try without project parameter for guards that don't accept it
-                try:
-                    guard = guard_class()
-                except TypeError:
-                    print(f"⚠️  {guard_name} SKIP: Constructor incompatible")
-                    continue
-
-            # Prepare appropriate arguments based on guard type
-            if guard_name == "LexiGuard":
-                run_with_retry(guard.check, draft_content)
-            elif guard_name == "EmotionGuard":
-                prev_text = "This is some neutral previous content."
-                run_with_retry(guard.check, prev_text, draft_content)
-            elif guard_name == "ScheduleGuard":
-                run_with_retry(guard.check, episode_num)
-            elif guard_name == "ImmutableGuard":
-                # Load or create sample character data
-                char_path = data_path("characters.json", project)
-                try:
-                    with open(char_path, encoding="utf-8") as f:
-                        characters = json.load(f)
-                except FileNotFoundError:
-                    characters = {
-                        "main_character": {
-                            "name": "TestCharacter",
-                            "role": "protagonist",
-                            "traits": ["brave", "intelligent"],
-                            "immutable": ["name", "role"],
-                        }
-                    }
-                run_with_retry(guard.check, characters)
-            elif guard_name == "DateGuard":
-                date_context = {
-                    "current_date": f"2024-{episode_num:02d}-01",
-                    "episode": episode_num,
-                }
-                run_with_retry(guard.check, date_context, episode_num)
-            elif guard_name == "AnchorGuard":
-                run_with_retry(guard.check, draft_content, episode_num)
-            elif guard_name == "RuleGuard":
-                run_with_retry(guard.check, draft_content)
-            elif guard_name == "RelationGuard":
-                run_with_retry(guard.check, episode_num)
-            elif guard_name == "PacingGuard":
-                scene_texts = [
-                    draft_content[: len(draft_content) // 3],
-                    draft_content[len(draft_content) // 3 : 2 * len(draft_content) // 3],
-                    draft_content[2 * len(draft_content) // 3 :],
-                ]
-                run_with_retry(guard.check, scene_texts, episode_num)
-            elif guard_name == "CritiqueGuard":
-                run_with_retry(guard.check, draft_content)
-            else:
-                print(f"⚠️  Unknown guard: {guard_name}")
+                print(f"⚠️  {guard_name} SKIP: Constructor incompatible")
                 continue
+        except Exception as e:
+            print(f"⚠️  {guard_name} ERROR: {e}")
+            continue
 
-            print(f"✅ {guard_name} PASS")
-            guards_passed += 1
-        except RetryException as e:
-            print(f"❌ {guard_name} FAIL: {e}")
+        # Each guard builds its own check() arguments (BaseGuard.job_args)
+        try:
+            args = guard_class.job_args(draft_content, analysis, episode_num, session)
         except Exception as e:
             print(f"⚠️  {guard_name} ERROR: {e}")
+            continue
+        if args is None:
+            # Nothing to check (e.g. no characters.json) is not a failure
+            print(f"⏭️  {guard_name} SKIP: no input for episode {episode_num}")
+            total_guards -= 1
+            continue
+
+        # Guard checks are deterministic, so no retry: the executor times (and
+        # GuardStats records) the check alone, not retry backoff sleeps
+        check = partial(cache.call, guard) if cache is not None else guard.check
+        jobs[guard_class] = partial(check, *args)
+
+    # Pure guards run concurrently, stateful guards are serialized and expensive
+    # guards are skipped once a cheaper guard has failed (fail-fast)
+    stats = GuardStats.load(project)
+    report = execute_guards(
+        jobs,
+        stats=stats,
+        episode=episode_num,
+        input_sizes={guard_class: len(draft_content) for guard_class in jobs},
+        profile_dir=out_path("profiles", project),
+    )
+    stats.save()
+
+    for guard_name, entry in report["results"].items():
+        if entry["status"] == "passed":
+            print(f"✅ {guard_name} PASS")
+            guards_passed += 1
+        elif entry["status"] == "skipped":
+            print(f"⏭️  {guard_name} SKIP: draft already failed")
+        elif entry["status"] == "timeout":
+            print(f"⏱️  {guard_name} TIMEOUT: {entry['error']}")
+        elif entry["status"] == "failed":
+            print(f"❌ {guard_name} FAIL: {entry['error']}")
+        else:
+            print(f"⚠️  {guard_name} ERROR: {entry['error']}")
 
     print(f"\nGuard Results: {guards_passed}/{total_guards} passed")
     return guards_passed == total_guards
@@ -16,8 +16,10 @@ from pathlib import Path
 from dotenv import load_dotenv
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 
+from src.core.circuit_breaker import get_circuit_breaker, guarded_critique, llm_endpoint
+from src.core.retry_budget import RetryBudget, estimate_tokens
 from src.core.retry_controller import run_with_retry
-from src.exceptions import RetryException
+from src.exceptions import BudgetExhaustedException, CircuitOpenException, RetryException
 from src.plugins.critique_guard import critique_guard
 
 # Load environment variables
@@ -127,7 +129,7 @@ beat_tp: "Fast mode stub turning point"'''
         client = GeminiClient(temperature=temperature)
 
         logger.info(f"⚡ Beat Planner… (temperature={temperature})")
-        result = client.generate(prompt)
+        result = client.complete(prompt)
 
         logger.info(f"Generated beats: {len(result)} characters")
         return result
@@ -183,7 +185,11 @@ def _mock_beats(episode_num: int, flat: bool = False) -> dict:
 
 
 def plan_beats(
-    episode_num: int, prev_beats: list[str] = None, *, return_flat: bool = False
+    episode_num: int,
+    prev_beats: list[str] = None,
+    *,
+    return_flat: bool = False,
+    budget: RetryBudget | None = None,
 ) -> dict:
     """
     Generate beats for all 6 sequences of an episode using 3-Act structure.
@@ -196,6 +202,9 @@ def plan_beats(
         Previous episode beats for context
     return_flat : bool, optional
         If True, return flat list of beat dicts. If False, return nested dict.
+    budget : RetryBudget, optional
+        Episode-wide retry budget; every LLM attempt spends from it and
+        fallback beats are used once it is exhausted
 
     Returns
     -------
@@ -230,6 +239,9 @@ def plan_beats(
     episode_key = f"ep_{episode_num}"
     episode_data = {}
 
+    # Shared per endpoint/stage: once open, remaining sequences fall back immediately
+    breaker = get_circuit_breaker(llm_endpoint(), "beat")
+
     # Generate beats for all 6 sequences
     for seq_num in range(1, 7):
         try:
@@ -238,7 +250,13 @@ def plan_beats(
 
             # Call LLM with retry mechanism and critique validation
             def llm_wrapper(prompt=prompt):
-                raw_output = call_llm(prompt)
+                if budget is not None:
+                    budget.spend_attempt("beat")
+                raw_output = breaker.call(call_llm, prompt)
+                if budget is not None:
+                    budget.charge_tokens(
+                        "beat", estimate_tokens(prompt) + estimate_tokens(raw_output)
+                    )
                 # Parse and validate the output
                 beats = parse_beat_output(raw_output)
                 if len(beats) != 4:
@@ -251,7 +269,7 @@ def plan_beats(
                 beats_text = "\n".join(
                     [f"Beat {i+1}: {list(beats.values())[i]}" for i in range(len(beats))]
                 )
-                validate_beats_with_critique(beats_text)
+                validate_beats_with_critique(beats_text, budget=budget)
 
                 return beats
 
@@ -292,7 +310,7 @@ def plan_beats(
     return beats_result
 
 
-def validate_beats_with_critique(beats_text: str) -> None:
+def validate_beats_with_critique(beats_text: str, budget: RetryBudget | None = None) -> None:
     """
     Validate beat descriptions with critique guard.
 
@@ -300,6 +318,9 @@ def validate_beats_with_critique(beats_text: str) -> None:
     ----------
     beats_text : str
         Combined text of all beats to validate
+    budget : RetryBudget, optional
+        Episode-wide retry budget; critique is low priority and is skipped
+        when the budget can no longer afford it
 
     Raises
     ------
@@ -312,8 +333,10 @@ def validate_beats_with_critique(beats_text: str) -> None:
         return
 
     try:
-        critique_guard(beats_text)
+        guarded_critique("beat_critique", beats_text, budget, critique_guard)
         logger.info("Beat critique validation PASS")
+    except (CircuitOpenException, BudgetExhaustedException) as e:
+        logger.warning(f"Beat critique validation SKIPPED: {e}")
     except RetryException as e:
         logger.warning(f"Beat critique validation FAIL: {e}")
         raise
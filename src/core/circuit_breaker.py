@@ -0,0 +1,325 @@
+"""
+circuit_breaker.py
+
+Circuit Breaker for Final Engine - fails fast while an LLM endpoint is degraded.
+
+One breaker is shared per (endpoint, stage) pair, e.g. ("gemini-2.5-pro", "scene").
+Breakers track the outcome of the most recent calls and move between three states:
+
+- closed    → calls go through; outcomes are recorded in a sliding window
+- open      → failure rate exceeded the threshold; calls are rejected with
+              CircuitOpenException so callers jump straight to their fallbacks
+- half-open → after the reset timeout a limited number of trial calls are let
+              through; a success closes the circuit, a failure re-opens it
+
+Thresholds can be tuned with the CB_FAILURE_RATE, CB_WINDOW, CB_MIN_CALLS and
+CB_RESET_TIMEOUT environment variables.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from src.core.retry_budget import RetryBudget, estimate_tokens
+from src.exceptions import CircuitOpenException, RetryException
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Failure-rate based circuit breaker for a single endpoint/stage.
+
+    Parameters
+    ----------
+    name : str
+        Identifier used in logs and exception messages
+    failure_rate_threshold : float, optional
+        Failure ratio (0-1) within the window that opens the circuit
+    window_size : int, optional
+        Number of most recent calls considered for the failure rate
+    min_calls : int, optional
+        Minimum number of recorded calls before the circuit may open
+    reset_timeout : float, optional
+        Seconds to stay open before allowing half-open trial calls
+    half_open_max_calls : int, optional
+        Number of concurrent trial calls allowed while half-open
+    excluded_exceptions : tuple, optional
+        Exception types that mean "the endpoint answered" and are recorded as
+        successes by ``call`` (e.g. RetryException raised by a guard verdict)
+    clock : callable, optional
+        Monotonic time source, injectable for tests
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 10,
+        min_calls: int = 4,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        excluded_exceptions: tuple[type[BaseException], ...] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.excluded_exceptions = excluded_exceptions
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, promoting open → half-open once the timeout has elapsed."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._half_open_in_flight = 0
+            logger.info(f"Circuit {self.name}: open → half-open")
+        return self._state
+
+    def failure_rate(self) -> float:
+        """
+        Get the failure ratio over the current window.
+
+        Returns
+        -------
+        float
+            Failures / recorded calls, or 0.0 when nothing has been recorded
+        """
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed, reserving a trial slot when half-open.
+
+        Returns
+        -------
+        bool
+            False while the circuit is open (or half-open with no free slot)
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call; closes the circuit when half-open."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                logger.info(f"Circuit {self.name}: half-open → closed")
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._half_open_in_flight = 0
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Record a failed call; may open (or re-open) the circuit."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trip()
+                return
+
+            self._outcomes.append(False)
+            if len(self._outcomes) < self.min_calls:
+                return
+
+            failure_rate = self._outcomes.count(False) / len(self._outcomes)
+            if failure_rate >= self.failure_rate_threshold:
+                self._trip()
+
+    def _trip(self) -> None:
+        logger.warning(
+            f"Circuit {self.name}: opened for {self.reset_timeout}s "
+            f"({self._outcomes.count(False)}/{len(self._outcomes)} recent calls failed)"
+        )
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._half_open_in_flight = 0
+        self._outcomes.clear()
+
+    def reset(self) -> None:
+        """Force the circuit closed and forget recorded outcomes."""
+        with self._lock:
+            self._state = CLOSED
+            self._outcomes.clear()
+            self._half_open_in_flight = 0
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call func through the breaker.
+
+        Parameters
+        ----------
+        func : callable
+            Function to execute
+        *args : tuple
+            Positional arguments to pass to func
+        **kwargs : dict
+            Keyword arguments to pass to func
+
+        Returns
+        -------
+        Any
+            Return value of func
+
+        Raises
+        ------
+        CircuitOpenException
+            If the circuit is open and the call was not attempted
+        Exception
+            Any exception raised by func (recorded as a failure unless excluded)
+        """
+        if not self.allow_request():
+            raise CircuitOpenException(
+                f"Circuit {self.name} is open - skipping call", circuit_name=self.name
+            )
+
+        try:
+            result = func(*args, **kwargs)
+        except self.excluded_exceptions:
+            self.record_success()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+
+        self.record_success()
+        return result
+
+
+# Global breakers shared per (endpoint, stage)
+_breakers: dict[tuple[str, str], CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def llm_endpoint() -> str:
+    """
+    Get the endpoint identifier for the configured LLM.
+
+    Returns
+    -------
+    str
+        Model name from MODEL_NAME, defaulting to gemini-2.5-pro
+    """
+    return os.getenv("MODEL_NAME", "gemini-2.5-pro")
+
+
+def get_circuit_breaker(endpoint: str, stage: str, **config) -> CircuitBreaker:
+    """
+    Get the shared circuit breaker for an endpoint and pipeline stage.
+
+    The breaker is created on first use; ``config`` only applies then and
+    overrides the environment defaults.
+
+    Parameters
+    ----------
+    endpoint : str
+        Endpoint identifier (e.g. model name)
+    stage : str
+        Pipeline stage using the endpoint (e.g. "beat", "scene", "draft")
+    **config : dict
+        CircuitBreaker keyword arguments
+
+    Returns
+    -------
+    CircuitBreaker
+        Breaker shared by every caller with the same endpoint and stage
+    """
+    key = (endpoint, stage)
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            settings = {
+                "failure_rate_threshold": float(os.getenv("CB_FAILURE_RATE", "0.5")),
+                "window_size": int(os.getenv("CB_WINDOW", "10")),
+                "min_calls": int(os.getenv("CB_MIN_CALLS", "4")),
+                "reset_timeout": float(os.getenv("CB_RESET_TIMEOUT", "30")),
+            }
+            settings.update(config)
+            breaker = CircuitBreaker(f"{endpoint}/{stage}", **settings)
+            _breakers[key] = breaker
+        return breaker
+
+
+def guarded_critique(
+    stage: str,
+    text: str,
+    budget: RetryBudget | None,
+    critique: Callable[[str], Any],
+) -> None:
+    """
+    Run a critique call under the retry budget and the stage's circuit breaker.
+
+    Parameters
+    ----------
+    stage : str
+        Critique stage (e.g. "beat_critique") used as the breaker key
+    text : str
+        Text to critique
+    budget : RetryBudget, optional
+        Episode-wide retry budget charged one critique attempt and the tokens
+        of every call that actually ran
+    critique : callable
+        Critique function raising RetryException on a failing verdict
+
+    Raises
+    ------
+    RetryException
+        If the text fails critique
+    CircuitOpenException
+        If the critique endpoint is currently failing fast
+    BudgetExhaustedException
+        If the budget denies the critique attempt
+    """
+
+    def _critique(text: str) -> None:
+        # Charge whenever the critique call actually ran, whatever its verdict
+        try:
+            critique(text)
+        finally:
+            if budget is not None:
+                budget.charge_tokens("critique", estimate_tokens(text))
+
+    # A low score is a verdict, not an outage - only errors count against the circuit
+    breaker = get_circuit_breaker(llm_endpoint(), stage, excluded_exceptions=(RetryException,))
+    if budget is not None:
+        budget.spend_attempt("critique")
+    breaker.call(_critique, text)
+
+
+def reset_circuit_breakers() -> None:
+    """
+    Drop all shared circuit breakers.
+
+    Primarily used for testing to ensure clean state.
+    """
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,201 @@
+"""
+document_analysis.py
+
+Shared Document Analysis for Final Engine - tokenizes a draft once for the whole guard chain.
+
+Guards used to re-tokenize the same draft independently (LexiGuard twice,
+EmotionGuard twice per text, PacingGuard re-splitting sentences and dialog).
+A DocumentAnalysis is built once per draft and handed to every guard; each
+view (tokens, sentences, dialog, scenes) is computed lazily on first access
+and cached, so guards only pay for what they use and never pay twice.
+
+The views delegate to the shared, memoized tokenizer in ``src.text``, so
+separate analyses of the same text (episodes re-checked, scenes split
+again) reuse the same tokenization within the process.
+
+Guards accept either raw text or a DocumentAnalysis; use ``as_analysis`` to
+normalise the argument. ``encode_batch`` maps the tokens of many texts onto
+one shared vocabulary for the guards' vectorized batch checks.
+"""
+
+from functools import cached_property
+from itertools import chain
+
+import numpy as np
+
+from src import text as text_lib
+from src.text import (  # noqa: F401 - re-exported for existing imports
+    DIALOG_PATTERN,
+    SCENE_BREAK_PATTERN,
+    SENTENCE_PATTERN,
+    SENTENCE_SPLIT_PATTERN,
+    WORD_PATTERN,
+)
+
+# Scenes used when a draft has no explicit scene breaks
+DEFAULT_SCENE_COUNT = 3
+
+
+class DocumentAnalysis:
+    """
+    Lazily computed, cached views of a single text.
+
+    Parameters
+    ----------
+    text : str
+        Text to analyze
+    scene_count : int, optional
+        Number of equal slices used as scenes when the text has no explicit
+        scene breaks
+    """
+
+    def __init__(self, text: str, scene_count: int = DEFAULT_SCENE_COUNT):
+        self.text = text or ""
+        self.scene_count = scene_count
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __repr__(self) -> str:
+        return f"DocumentAnalysis({len(self.text)} chars)"
+
+    def is_blank(self) -> bool:
+        """True if the text is empty or whitespace only."""
+        return not self.text.strip()
+
+    @cached_property
+    def lower_text(self) -> str:
+        """Lowercased text."""
+        return self.text.lower()
+
+    @cached_property
+    def token_spans(self) -> list[tuple[int, int]]:
+        """(start, end) character offsets of every word token."""
+        return list(text_lib.token_spans(self.text))
+
+    @cached_property
+    def tokens(self) -> list[str]:
+        """Word tokens in original case."""
+        return list(text_lib.tokenize(self.text))
+
+    @cached_property
+    def lower_tokens(self) -> list[str]:
+        """Word tokens of the lowercased text."""
+        return list(text_lib.lower_tokens(self.text))
+
+    @cached_property
+    def token_ids(self) -> tuple[list[str], np.ndarray]:
+        """Vocabulary in order of first appearance and the id of every lowercased token."""
+        tokens = [] if self.is_blank() else self.lower_tokens
+        vocab = {token: index for index, token in enumerate(dict.fromkeys(tokens))}
+        ids = np.fromiter(map(vocab.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        return list(vocab), ids
+
+    @cached_property
+    def sentence_spans(self) -> list[tuple[int, int]]:
+        """(start, end) offsets of sentences, whitespace trimmed, newlines as boundaries."""
+        return list(text_lib.sentence_spans(self.text))
+
+    @cached_property
+    def sentences(self) -> list[str]:
+        """Sentence strings (see sentence_spans)."""
+        return [self.text[start:end] for start, end in self.sentence_spans]
+
+    @cached_property
+    def dialog_spans(self) -> list[tuple[int, int]]:
+        """(start, end) offsets of quoted dialog, quotes included."""
+        return list(text_lib.dialog_spans(self.text))
+
+    @cached_property
+    def dialog_lines(self) -> list[str]:
+        """Non-empty dialog contents with quotes and surrounding whitespace removed."""
+        lines = (self.text[start + 1 : end - 1].strip() for start, end in self.dialog_spans)
+        return [line for line in lines if line]
+
+    @cached_property
+    def narration_sentences(self) -> list[str]:
+        """Sentences of the text with all quoted dialog removed."""
+        return list(text_lib.narration_sentences(self.text))
+
+    @cached_property
+    def scene_spans(self) -> list[tuple[int, int]]:
+        """
+        (start, end) offsets of scenes.
+
+        Explicit scene-break lines split the text when present; otherwise the
+        text is cut into ``scene_count`` equal slices.
+        """
+        breaks = list(SCENE_BREAK_PATTERN.finditer(self.text))
+        if breaks:
+            spans = []
+            cursor = 0
+            for match in breaks:
+                spans.append((cursor, match.start()))
+                cursor = match.end()
+            spans.append((cursor, len(self.text)))
+            return [(start, end) for start, end in spans if self.text[start:end].strip()]
+
+        length = len(self.text)
+        count = max(1, self.scene_count)
+        return [(i * length // count, (i + 1) * length // count) for i in range(count)]
+
+    @cached_property
+    def scenes(self) -> list["DocumentAnalysis"]:
+        """Analyses of each scene (see scene_spans)."""
+        return [DocumentAnalysis(self.text[start:end], 1) for start, end in self.scene_spans]
+
+
+def as_analysis(text_or_analysis: str | DocumentAnalysis) -> DocumentAnalysis:
+    """
+    Normalise a guard input to a DocumentAnalysis.
+
+    Parameters
+    ----------
+    text_or_analysis : str or DocumentAnalysis
+        Raw text or an existing analysis
+
+    Returns
+    -------
+    DocumentAnalysis
+        The given analysis, or a new one wrapping the text
+    """
+    if isinstance(text_or_analysis, DocumentAnalysis):
+        return text_or_analysis
+    return DocumentAnalysis(text_or_analysis)
+
+
+def encode_batch(
+    texts: list[str | DocumentAnalysis],
+) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode the lowercased tokens of many texts over a shared vocabulary.
+
+    Ids are assigned in order of first appearance with a dict, so no string
+    array is sorted; a single text reuses its cached ``token_ids``.
+
+    Parameters
+    ----------
+    texts : List[str or DocumentAnalysis]
+        Texts (or analyses) to encode; blank texts have no tokens
+
+    Returns
+    -------
+    Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]
+        Vocabulary, token id per position (int64), text index per position
+        (int64) and token count per text (int64)
+    """
+    analyses = [as_analysis(text) for text in texts]
+    if len(analyses) == 1:
+        vocab, ids = analyses[0].token_ids
+        lengths = np.array([len(ids)], dtype=np.int64)
+        return vocab, ids, np.zeros(len(ids), dtype=np.int64), lengths
+
+    token_lists = [[] if analysis.is_blank() else analysis.lower_tokens for analysis in analyses]
+    lengths = np.fromiter(
+        (len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists)
+    )
+    doc = np.repeat(np.arange(len(token_lists), dtype=np.int64), lengths)
+    tokens = list(chain.from_iterable(token_lists))
+    vocab = {token: index for index, token in enumerate(dict.fromkeys(tokens))}
+    ids = np.fromiter(map(vocab.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+    return list(vocab), ids, doc, lengths
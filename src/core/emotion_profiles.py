@@ -0,0 +1,181 @@
+"""
+emotion_profiles.py
+
+Emotion Profile Store for Final Engine - per-episode emotion vectors.
+
+Checking the emotional transition into episode N needs the emotions of
+episode N-1. Re-reading and re-classifying the previous episode's text for
+every check is wasteful, so the pipeline used a fixed neutral string instead.
+The store keeps, per project, three 7-dimensional emotion vectors for every
+finished episode - the whole episode, its opening scene and its closing
+scene - in one NumPy array file (``data/emotion_profiles.npy``, shape
+(episodes + 1, 3, 7), indexed by episode number, NaN for unknown episodes).
+Looking up the previous episode is an O(1) array access.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from src.core.document_analysis import DocumentAnalysis, as_analysis
+from src.utils.path_helper import data_path
+
+logger = logging.getLogger(__name__)
+
+# Vectors stored per episode, in array order
+PROFILE_PARTS = ("episode", "opening", "closing")
+
+# Emotion dimensions (see emotion_guard.EMOTION_ORDER)
+EMOTION_DIMENSIONS = 7
+
+
+def emotion_profile(text: str | DocumentAnalysis) -> np.ndarray:
+    """
+    Classify an episode and its first and last scenes.
+
+    Parameters
+    ----------
+    text : str or DocumentAnalysis
+        Final episode text
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (3, 7): episode, opening scene and closing scene
+        vectors in EMOTION_ORDER
+    """
+    from src.plugins.emotion_guard import classify_emotions_batch
+
+    analysis = as_analysis(text)
+    scenes = analysis.scenes or [analysis]
+    return classify_emotions_batch([analysis, scenes[0], scenes[-1]])
+
+
+class EmotionProfileStore:
+    """
+    Emotion vectors of every finished episode of a project.
+
+    Parameters
+    ----------
+    path : Path, optional
+        .npy file of the profiles; kept in memory only when None
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._profiles = self._load()
+
+    def _load(self) -> np.ndarray:
+        empty = np.full((0, len(PROFILE_PARTS), EMOTION_DIMENSIONS), np.nan)
+        if self.path is None or not self.path.exists():
+            return empty
+        try:
+            profiles = np.load(self.path)
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not read emotion profiles {self.path}: {e}")
+            return empty
+        if profiles.ndim != 3 or profiles.shape[1:] != empty.shape[1:]:
+            logger.warning(f"Ignoring emotion profiles {self.path} with shape {profiles.shape}")
+            return empty
+        return profiles
+
+    def get(self, episode: int) -> dict[str, list[float]] | None:
+        """
+        Get the stored vectors of an episode.
+
+        Parameters
+        ----------
+        episode : int
+            Episode number
+
+        Returns
+        -------
+        Dict[str, List[float]] or None
+            "episode", "opening" and "closing" emotion vectors, or None if
+            the episode has no profile
+        """
+        with self._lock:
+            if not 0 <= episode < len(self._profiles):
+                return None
+            profile = self._profiles[episode]
+        if np.isnan(profile).any():
+            return None
+        return dict(zip(PROFILE_PARTS, profile.tolist(), strict=True))
+
+    def put(self, episode: int, text: str | DocumentAnalysis) -> dict[str, list[float]]:
+        """
+        Classify a finished episode and store its profile.
+
+        Parameters
+        ----------
+        episode : int
+            Episode number
+        text : str or DocumentAnalysis
+            Final episode text
+
+        Returns
+        -------
+        Dict[str, List[float]]
+            The stored "episode", "opening" and "closing" vectors
+        """
+        profile = emotion_profile(text)
+        with self._lock:
+            if episode >= len(self._profiles):
+                grown = np.full((episode + 1, *self._profiles.shape[1:]), np.nan)
+                grown[: len(self._profiles)] = self._profiles
+                self._profiles = grown
+            self._profiles[episode] = profile
+            self._save()
+        return dict(zip(PROFILE_PARTS, profile.tolist(), strict=True))
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.path.with_name(f"{self.path.stem}.tmp.npy")
+            np.save(temp, self._profiles)
+            os.replace(temp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save emotion profiles {self.path}: {e}")
+
+
+# Stores shared per project for the lifetime of the process
+_stores: dict[str, EmotionProfileStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_emotion_store(project: str = "default") -> EmotionProfileStore:
+    """
+    Get the shared emotion profile store of a project.
+
+    Parameters
+    ----------
+    project : str, optional
+        Project ID, defaults to "default"
+
+    Returns
+    -------
+    EmotionProfileStore
+        Store backed by the project's data/emotion_profiles.npy
+    """
+    with _stores_lock:
+        store = _stores.get(project)
+        if store is None:
+            store = EmotionProfileStore(data_path("emotion_profiles.npy", project))
+            _stores[project] = store
+        return store
+
+
+def reset_emotion_stores() -> None:
+    """
+    Drop all shared emotion profile stores.
+
+    Primarily used for testing to ensure clean state.
+    """
+    with _stores_lock:
+        _stores.clear()
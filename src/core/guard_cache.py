@@ -0,0 +1,311 @@
+"""
+guard_cache.py
+
+Guard Result Cache for Final Engine - memoizes guard checks on unchanged inputs.
+
+Re-running the guard chain on an unchanged draft (full-season replays,
+resumed runs, repeated validations) used to redo every check. The cache keys
+each check on:
+
+- the guard class and its ``version`` (bump it when check logic changes)
+- the guard's ``cache_params()`` (instance settings such as thresholds)
+- sha256 of every file in the guard's ``config_paths()``
+- sha256 of the check arguments (DocumentAnalysis inputs hash their text)
+
+and stores the result dict, or the RetryException payload for failed checks,
+which is re-raised on a hit. Stateful guards (``pure=False``) and guards with
+``cacheable = False`` always run. take_cache_hit() tells the guard executor
+whether the check it just ran was a hit, so replays are not timed as runs.
+
+GUARD_CACHE selects the backend: "memory" (default), "disk" (JSON files in
+the project's data/guard_cache directory, survives restarts) or "off".
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from src.core.document_analysis import DocumentAnalysis
+from src.core.guard_registry import BaseGuard
+from src.core.guard_session import FileSignature, file_signature
+from src.exceptions import RetryException
+from src.utils.path_helper import data_path
+
+logger = logging.getLogger(__name__)
+
+# Whether the latest call() on this thread was answered from the cache
+_last_call = threading.local()
+
+
+def _canonical(value: Any) -> Any:
+    """Convert check arguments into a JSON-encodable, order-independent structure."""
+    if isinstance(value, DocumentAnalysis):
+        return ["doc", value.text, value.scene_count]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda i: str(i[0]))}
+    if isinstance(value, list | tuple):
+        return [_canonical(v) for v in value]
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if isinstance(value, Path):
+        return str(value)
+    return repr(value)
+
+
+def _json_default(value: Any) -> Any:
+    """Encode numpy scalars/arrays and other objects found in guard results."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=str)
+    return str(value)
+
+
+class GuardResultCache:
+    """
+    Cache of guard check outcomes.
+
+    Parameters
+    ----------
+    directory : Path, optional
+        Directory for persistent JSON entries; memory only when None
+    max_entries : int, optional
+        In-memory LRU capacity
+    """
+
+    def __init__(self, directory: Path | None = None, max_entries: int = 2048):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._file_hashes: dict[str, tuple[FileSignature, str | None]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _file_hash(self, path: Path) -> str | None:
+        """sha256 of a file, recomputed only when its signature changes."""
+        signature = file_signature(path)
+        with self._lock:
+            cached = self._file_hashes.get(str(path))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        digest = None
+        if signature[1] is not None:
+            try:
+                digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+            except OSError:
+                digest = None
+        with self._lock:
+            self._file_hashes[str(path)] = (signature, digest)
+        return digest
+
+    def key_for(self, guard: BaseGuard, args: tuple, kwargs: dict) -> str | None:
+        """
+        Build the cache key of a check call.
+
+        Parameters
+        ----------
+        guard : BaseGuard
+            Guard instance
+        args : tuple
+            Positional check arguments
+        kwargs : dict
+            Keyword check arguments
+
+        Returns
+        -------
+        str or None
+            Hex digest key, or None if the guard must not be cached
+        """
+        guard_class = type(guard)
+        if not getattr(guard_class, "pure", True) or not getattr(guard_class, "cacheable", True):
+            return None
+
+        payload = {
+            "guard": f"{guard_class.__module__}.{guard_class.__qualname__}",
+            "version": str(getattr(guard_class, "version", "1")),
+            "params": _canonical(guard.cache_params()),
+            "config": [[str(p), self._file_hash(p)] for p in guard.config_paths()],
+            "args": _canonical(list(args)),
+            "kwargs": _canonical(kwargs),
+        }
+        encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=repr)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """
+        Look up a cached entry.
+
+        Parameters
+        ----------
+        key : str
+            Key from key_for
+
+        Returns
+        -------
+        Dict[str, Any] or None
+            Entry with "status" ("passed"/"failed") and its payload
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.directory is None:
+            return None
+        try:
+            with open(self.directory / f"{key}.json", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        """
+        Store an entry in memory and, if configured, on disk.
+
+        Parameters
+        ----------
+        key : str
+            Key from key_for
+        entry : Dict[str, Any]
+            Entry with "status" and its payload
+        """
+        self._remember(key, entry)
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            encoded = json.dumps(entry, ensure_ascii=False, default=_json_default)
+            (self.directory / f"{key}.json").write_text(encoded, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not persist guard result {key}: {e}")
+
+    def _remember(self, key: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def call(self, guard: BaseGuard, *args, **kwargs) -> Any:
+        """
+        Run guard.check through the cache.
+
+        Parameters
+        ----------
+        guard : BaseGuard
+            Guard instance
+        *args : tuple
+            Positional check arguments
+        **kwargs : dict
+            Keyword check arguments
+
+        Returns
+        -------
+        Any
+            The (possibly cached) check result
+
+        Raises
+        ------
+        RetryException
+            If the check failed (now or when it was cached)
+        """
+        _last_call.hit = False
+        key = self.key_for(guard, args, kwargs)
+        if key is None:
+            return guard.check(*args, **kwargs)
+
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            _last_call.hit = True
+            if entry["status"] == "failed":
+                raise RetryException(
+                    entry["message"],
+                    flags=copy.deepcopy(entry["flags"]),
+                    guard_name=entry["guard_name"],
+                )
+            return copy.deepcopy(entry["result"])
+
+        self.misses += 1
+        try:
+            result = guard.check(*args, **kwargs)
+        except RetryException as e:
+            message = e.args[0] if e.args else ""
+            self.put(
+                key,
+                {
+                    "status": "failed",
+                    "message": message,
+                    "flags": copy.deepcopy(e.flags),
+                    "guard_name": e.guard_name,
+                },
+            )
+            raise
+        self.put(key, {"status": "passed", "result": copy.deepcopy(result)})
+        return result
+
+
+def take_cache_hit() -> bool:
+    """
+    Report and clear whether the latest call() on this thread was a cache hit.
+
+    Returns
+    -------
+    bool
+        True if the outcome was replayed rather than checked
+    """
+    hit = getattr(_last_call, "hit", False)
+    _last_call.hit = False
+    return hit
+
+
+# Result caches shared per project for the lifetime of the process
+_caches: dict[str, GuardResultCache | None] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(project: str = "default") -> GuardResultCache | None:
+    """
+    Get the shared result cache of a project, as selected by GUARD_CACHE.
+
+    Parameters
+    ----------
+    project : str, optional
+        Project ID, defaults to "default"
+
+    Returns
+    -------
+    GuardResultCache or None
+        Memory cache, disk cache in data/guard_cache, or None when
+        GUARD_CACHE is "off"
+    """
+    with _caches_lock:
+        if project not in _caches:
+            mode = os.getenv("GUARD_CACHE", "memory").lower()
+            if mode in ("off", "0", "false"):
+                _caches[project] = None
+            else:
+                directory = data_path("guard_cache", project) if mode == "disk" else None
+                _caches[project] = GuardResultCache(directory)
+        return _caches[project]
+
+
+def reset_result_caches() -> None:
+    """
+    Drop all shared result caches.
+
+    Primarily used for testing to ensure clean state.
+    """
+    with _caches_lock:
+        _caches.clear()
@@ -0,0 +1,438 @@
+"""
+guard_executor.py
+
+Guard Executor for Final Engine - runs the guard chain concurrently where it is safe.
+
+Guards declare through the registry whether they are pure and which resources
+they touch (see ``register_guard``). The executor groups guards into lanes:
+
+- all stateful guards (``pure=False``) share one lane and run in registry order
+- pure guards sharing a resource with another guard join that guard's lane
+- every other pure guard gets a lane of its own
+
+Lanes run concurrently in a thread pool, so chain latency approaches that of
+the slowest lane (typically CritiqueGuard's LLM call). Guards within a lane
+always run one after another.
+
+Guards are ranked by expected cost / failure probability from recorded
+GuardStats, in registry order until statistics exist. Lanes start in that
+order and run their guards in that order, so cheap guards that often fail
+run first. The same order applies with GUARD_PARALLEL=0.
+
+Fail-fast mode (GUARD_FAIL_FAST, on by default) runs cheap guards before
+expensive ones. Once a cheap guard fails the draft, a retry is certain. The
+expensive pure guards are then skipped: those with an expected cost of at
+least EXPENSIVE_COST ms, e.g. the LLM-backed CritiqueGuard. Cheap guards
+all still run, so every failure flag is available for partial regeneration.
+
+Concurrency can be tuned with GUARD_WORKERS; GUARD_PARALLEL=0 runs the whole
+chain sequentially on the calling thread.
+
+Every check has a time budget (the guard's ``timeout`` attribute, else
+GUARD_TIMEOUT seconds, default 60; 0 disables it), so chain latency has a
+hard upper bound. The check runs on a watchdog worker thread; when the
+budget runs out the guard is reported with the "timeout" outcome and the
+lane of a pure guard moves on while the abandoned thread finishes in the
+background. A stateful guard's thread may still write state files, so its
+lane gives it a bounded grace period (GUARD_TIMEOUT_GRACE seconds, default
+5) to exit. If it is still running after that, the lane's remaining
+stateful guards are skipped with a GuardTimeoutException instead of running
+next to it. Every timeout is recorded in GuardStats as a failure costing the
+whole budget, so a guard that keeps timing out moves later in the order.
+Threads cannot interrupt C code that holds the
+GIL (e.g. a backtracking regex), so guards at risk of that kill a subprocess
+themselves (see RuleGuard). GUARD_PARALLEL=0 keeps checks on the calling
+thread for debugging and does not enforce budgets; the report's
+"timeouts_enforced" says whether they were.
+
+Every guard invocation records its wall time, CPU time (of the thread running
+it), input size and outcome, and passes through the registry's pre/post guard
+hooks. GUARD_PROFILE=<GuardName> additionally runs that guard under cProfile
+and writes one .prof file per episode to the given profile directory.
+Outcomes replayed by the guard result cache are marked "cached" and left
+out of GuardStats, so hits neither lower a guard's cost nor repeat a failure.
+"""
+
+import cProfile
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from src.core.guard_cache import take_cache_hit
+from src.core.guard_registry import BaseGuard, run_guard_hooks
+from src.core.guard_stats import GuardStats
+from src.exceptions import GuardTimeoutException, RetryException
+
+logger = logging.getLogger(__name__)
+
+# Outcome labels used in the report
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+SKIPPED = "skipped"
+TIMEOUT = "timeout"
+
+# Default seconds a guard check may take (GUARD_TIMEOUT, 0 disables)
+DEFAULT_TIMEOUT = 60.0
+
+# Default seconds a timed-out stateful check gets to exit (GUARD_TIMEOUT_GRACE)
+DEFAULT_TIMEOUT_GRACE = 5.0
+
+# Guards expected to take at least this many milliseconds are skipped by fail-fast
+EXPENSIVE_COST = 100.0
+
+# A job runs one guard and returns its check() result
+GuardJob = Callable[[], Any]
+
+
+def plan_lanes(guard_classes: list[type[BaseGuard]]) -> list[list[type[BaseGuard]]]:
+    """
+    Group guards into lanes that may run concurrently with each other.
+
+    Parameters
+    ----------
+    guard_classes : List[Type[BaseGuard]]
+        Guard classes in registry order
+
+    Returns
+    -------
+    List[List[Type[BaseGuard]]]
+        Lanes of guards; each lane keeps registry order
+    """
+    # Union-find over guard indices: stateful guards and resource sharers end up together
+    parent = list(range(len(guard_classes)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        parent[max(find(i), find(j))] = min(find(i), find(j))
+
+    first_stateful: int | None = None
+    resource_owner: dict[str, int] = {}
+    for i, guard_class in enumerate(guard_classes):
+        if not getattr(guard_class, "pure", True):
+            if first_stateful is None:
+                first_stateful = i
+            union(first_stateful, i)
+        for resource in getattr(guard_class, "resources", frozenset()):
+            if resource in resource_owner:
+                union(resource_owner[resource], i)
+            else:
+                resource_owner[resource] = i
+
+    lanes: dict[int, list[type[BaseGuard]]] = {}
+    for i, guard_class in enumerate(guard_classes):
+        lanes.setdefault(find(i), []).append(guard_class)
+    return list(lanes.values())
+
+
+def guard_timeout(guard_class: type[BaseGuard]) -> float | None:
+    """
+    Get the time budget of a guard.
+
+    Parameters
+    ----------
+    guard_class : Type[BaseGuard]
+        Guard class
+
+    Returns
+    -------
+    float or None
+        Seconds per check from the guard's ``timeout`` attribute, else
+        GUARD_TIMEOUT; None when the limit is disabled
+    """
+    timeout = getattr(guard_class, "timeout", None)
+    if timeout is None:
+        timeout = float(os.getenv("GUARD_TIMEOUT", str(DEFAULT_TIMEOUT)))
+    return timeout if timeout > 0 else None
+
+
+def timeouts_enforced() -> bool:
+    """Whether guard time budgets are enforced (not with GUARD_PARALLEL=0)."""
+    return os.getenv("GUARD_PARALLEL", "1") != "0"
+
+
+def _call_job(job: GuardJob, profiler: cProfile.Profile | None, outcome: dict[str, Any]) -> None:
+    """Run a job, storing its result or exception and its CPU time in outcome."""
+    cpu_started = time.thread_time()
+    try:
+        outcome["result"] = profiler.runcall(job) if profiler is not None else job()
+    except Exception as e:
+        outcome["error"] = e
+    outcome["cpu"] = time.thread_time() - cpu_started
+    # Jobs routed through the result cache run on this thread
+    outcome["cached"] = take_cache_hit()
+
+
+def _run_job(guard_name: str, job: GuardJob, context: dict[str, Any]) -> dict[str, Any]:
+    """Run one guard job and describe its outcome, timings and input size."""
+    entry: dict[str, Any] = {
+        "guard": guard_name,
+        "episode": context.get("episode"),
+        "input_size": context.get("input_sizes", {}).get(guard_name, 0),
+    }
+    run_guard_hooks("pre", guard_name, entry)
+
+    profiler = None
+    if context.get("profile_dir") is not None and os.getenv("GUARD_PROFILE") == guard_name:
+        profiler = cProfile.Profile()
+
+    timeout = context.get("timeouts", {}).get(guard_name)
+    outcome: dict[str, Any] = {}
+    started = time.perf_counter()
+    if timeout is None:
+        _call_job(job, profiler, outcome)
+    else:
+        # The worker only writes to outcome, so an abandoned check cannot touch the entry
+        worker = threading.Thread(
+            target=_call_job, args=(job, profiler, outcome), name=f"guard-{guard_name}", daemon=True
+        )
+        worker.start()
+        worker.join(timeout)
+        if worker.is_alive():
+            if guard_name in context.get("stateful", ()):
+                # Give the check a bounded chance to finish its state writes
+                worker.join(float(os.getenv("GUARD_TIMEOUT_GRACE", str(DEFAULT_TIMEOUT_GRACE))))
+                # Still running: the lane must not start another stateful guard
+                entry["abandoned"] = worker.is_alive()
+            outcome = {
+                "error": GuardTimeoutException(
+                    f"{guard_name} exceeded its {timeout:g}s time budget",
+                    guard_name=guard_name,
+                    timeout=timeout,
+                ),
+                # CPU time of the timed-out thread is unknown
+                "cpu": 0.0,
+            }
+            profiler = None
+    entry["elapsed"] = time.perf_counter() - started
+    entry["cpu"] = outcome["cpu"]
+    entry["cached"] = outcome.get("cached", False)
+
+    error = outcome.get("error")
+    if error is None:
+        entry["result"] = outcome.get("result")
+        entry["status"] = PASSED
+    elif isinstance(error, RetryException):
+        entry["status"] = FAILED
+        entry["error"] = error
+    elif isinstance(error, GuardTimeoutException):
+        logger.warning(str(error))
+        entry["status"] = TIMEOUT
+        entry["error"] = error
+    else:
+        logger.warning(f"{guard_name} raised {type(error).__name__}: {error}")
+        entry["status"] = ERROR
+        entry["error"] = error
+
+    if profiler is not None:
+        entry["profile"] = _dump_profile(profiler, guard_name, entry["episode"], context)
+    run_guard_hooks("post", guard_name, entry)
+    return entry
+
+
+def _dump_profile(
+    profiler: cProfile.Profile, guard_name: str, episode: int | None, context: dict[str, Any]
+) -> str | None:
+    """Write a guard's cProfile stats to <profile_dir>/<guard>_episode_<n>.prof."""
+    suffix = f"episode_{episode}" if episode is not None else "run"
+    path = Path(context["profile_dir"]) / f"{guard_name}_{suffix}.prof"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+    except OSError as e:
+        logger.warning(f"Could not write profile {path}: {e}")
+        return None
+    logger.info(f"{guard_name} profile written to {path}")
+    return str(path)
+
+
+def _run_lane(lane: list[tuple[str, GuardJob]], context: dict[str, Any]) -> list[dict[str, Any]]:
+    """Run a lane's guards in order, skipping stateful guards behind an abandoned check."""
+    stateful = context.get("stateful", ())
+    entries: list[dict[str, Any]] = []
+    blocker = None
+    for guard_name, job in lane:
+        if blocker is not None and guard_name in stateful:
+            message = f"{guard_name} not run: {blocker} is still running after its time budget"
+            logger.warning(message)
+            entries.append(
+                {
+                    "guard": guard_name,
+                    "status": SKIPPED,
+                    "error": GuardTimeoutException(message, guard_name=guard_name),
+                    "elapsed": 0.0,
+                    "cpu": 0.0,
+                }
+            )
+            continue
+        entry = _run_job(guard_name, job, context)
+        if entry.pop("abandoned", False):
+            blocker = guard_name
+        entries.append(entry)
+    return entries
+
+
+def _run_phase(
+    guard_classes: list[type[BaseGuard]],
+    jobs: dict[type[BaseGuard], GuardJob],
+    rank: dict[type[BaseGuard], int],
+    max_workers: int | None,
+    context: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Run a set of guards as concurrent lanes, lanes and their guards in rank order."""
+    lanes = sorted(
+        (sorted(lane, key=rank.__getitem__) for lane in plan_lanes(guard_classes)),
+        key=lambda lane: rank[lane[0]],
+    )
+    lane_jobs = [[(cls.__name__, jobs[cls]) for cls in lane] for lane in lanes]
+
+    parallel = timeouts_enforced()
+    if parallel:
+        context = {
+            **context,
+            "timeouts": {cls.__name__: guard_timeout(cls) for cls in guard_classes},
+            "stateful": {cls.__name__ for cls in guard_classes if not getattr(cls, "pure", True)},
+        }
+
+    if parallel and len(lanes) > 1:
+        workers = max_workers or int(os.getenv("GUARD_WORKERS", "0")) or len(lanes)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="guard") as pool:
+            lane_entries = list(pool.map(_run_lane, lane_jobs, [context] * len(lane_jobs)))
+    else:
+        lane_entries = [_run_lane(lane, context) for lane in lane_jobs]
+
+    return [entry for entries in lane_entries for entry in entries]
+
+
+def execute_guards(
+    jobs: dict[type[BaseGuard], GuardJob],
+    max_workers: int | None = None,
+    *,
+    fail_fast: bool | None = None,
+    stats: GuardStats | None = None,
+    episode: int | None = None,
+    input_sizes: dict[type[BaseGuard], int] | None = None,
+    profile_dir: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Run guard jobs, concurrently across lanes and sequentially within them.
+
+    Parameters
+    ----------
+    jobs : Dict[Type[BaseGuard], GuardJob]
+        Guard class → zero-argument callable running that guard's check,
+        in registry order
+    max_workers : int, optional
+        Thread pool size; defaults to GUARD_WORKERS or the number of lanes
+    fail_fast : bool, optional
+        Skip expensive guards once a cheaper guard has failed; defaults to
+        GUARD_FAIL_FAST (on unless set to "0")
+    stats : GuardStats, optional
+        Recorded statistics used for ordering and updated with this run;
+        in-memory statistics (declared costs only) when omitted
+    episode : int, optional
+        Episode being validated, recorded in every entry and profile name
+    input_sizes : Dict[Type[BaseGuard], int], optional
+        Guard class → size of its input in characters
+    profile_dir : Path, optional
+        Directory for the cProfile output of the guard named by GUARD_PROFILE;
+        profiling is disabled when None
+
+    Returns
+    -------
+    Dict[str, Any]
+        Report with "passed" (bool), "results" (guard name → entry with
+        "status", "result"/"error", "elapsed" and "cpu" seconds, "episode",
+        "input_size" and "cached", in registry order),
+        "failures" (guard name → RetryException), "skipped" (guard names,
+        including stateful guards behind a still-running timed-out check)
+        and "timeouts" (guard names), "timeouts_enforced" (False with
+        GUARD_PARALLEL=0, where checks run without a time budget),
+        "order" (guard names in fail-fast priority order), "lanes" (guard
+        names per lane) and total "elapsed" seconds
+    """
+    started = time.perf_counter()
+    if fail_fast is None:
+        fail_fast = os.getenv("GUARD_FAIL_FAST", "1") != "0"
+    if stats is None:
+        stats = GuardStats()
+
+    guard_classes = list(jobs)
+    ordered = stats.order(guard_classes)
+    rank = {cls: i for i, cls in enumerate(ordered)}
+
+    if fail_fast:
+        # Stateful guards always run so persistent state keeps advancing
+        expensive = [
+            cls
+            for cls in ordered
+            if getattr(cls, "pure", True) and stats.expected_cost(cls) >= EXPENSIVE_COST
+        ]
+        cheap = [cls for cls in ordered if cls not in expensive]
+    else:
+        cheap, expensive = ordered, []
+
+    context = {
+        "episode": episode,
+        "input_sizes": {cls.__name__: size for cls, size in (input_sizes or {}).items()},
+        "profile_dir": profile_dir,
+    }
+
+    entries = _run_phase(cheap, jobs, rank, max_workers, context)
+    for guard_class in expensive:
+        if any(entry["status"] == FAILED for entry in entries):
+            entries.append(
+                {"guard": guard_class.__name__, "status": SKIPPED, "elapsed": 0.0, "cpu": 0.0}
+            )
+            logger.info(f"{guard_class.__name__} skipped - draft already failed (fail-fast)")
+            continue
+        entries.extend(_run_phase([guard_class], jobs, rank, max_workers, context))
+
+    for entry in entries:
+        if entry.get("cached"):
+            # Replayed outcomes are neither a run's cost nor a new failure
+            continue
+        if entry["status"] in (PASSED, FAILED):
+            stats.record(
+                entry["guard"],
+                entry["status"] == PASSED,
+                entry["elapsed"],
+                cpu=entry["cpu"],
+                input_size=entry["input_size"],
+            )
+        elif entry["status"] == TIMEOUT:
+            # A timeout costs the whole budget and counts as a failure
+            stats.record(
+                entry["guard"],
+                False,
+                entry["error"].timeout,
+                input_size=entry["input_size"],
+            )
+
+    by_name = {entry["guard"]: entry for entry in entries}
+    results = {cls.__name__: by_name[cls.__name__] for cls in guard_classes}
+    failures = {
+        name: entry["error"] for name, entry in results.items() if entry["status"] == FAILED
+    }
+
+    return {
+        "passed": all(entry["status"] == PASSED for entry in results.values()),
+        "results": results,
+        "failures": failures,
+        "skipped": [name for name, entry in results.items() if entry["status"] == SKIPPED],
+        "timeouts": [name for name, entry in results.items() if entry["status"] == TIMEOUT],
+        "timeouts_enforced": timeouts_enforced(),
+        "order": [cls.__name__ for cls in ordered],
+        "lanes": [[cls.__name__ for cls in lane] for lane in plan_lanes(guard_classes)],
+        "elapsed": time.perf_counter() - started,
+    }
@@ -5,23 +5,81 @@ Guard Registry System for Final Engine - automatic guard registration and orderi
 
 Provides decorator-based registration system for guards to enable automatic
 discovery and execution without manual sequence management.
+
+Guards may also declare whether they are pure (read-only, safe to run
+concurrently), which resources they touch and their estimated cost; the
+guard executor uses this to run independent guards in parallel, serialize
+stateful ones and run cheap guards first.
+
+Guard modules are discovered from the built-in manifest
+(``src.plugins.GUARD_MANIFEST``) and the "final_engine.guards" entry-point
+group, and are imported lazily by ``load_guards`` only for the guards a
+project enables in data/guard_config.json.
+
+Pipelines build each guard's check() arguments with ``BaseGuard.job_args``,
+so no guard name is hard-coded outside its plugin.
+
+Profilers and metrics collectors can observe every guard invocation through
+pre/post hooks (``add_guard_hook``).
 """
 
+import importlib
+import json
 import logging
+import sys
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from importlib.metadata import entry_points
 from typing import Any
 
+from src.exceptions import RetryException
+from src.utils.path_helper import data_path
+
 logger = logging.getLogger(__name__)
 
+# Entry-point group third-party packages use to provide guards:
+#   [project.entry-points."final_engine.guards"]
+#   MyGuard = "my_package.my_guard"
+ENTRY_POINT_GROUP = "final_engine.guards"
+
+# Hook called as hook(guard_name, entry) around every guard invocation
+GuardHook = Callable[[str, dict[str, Any]], None]
+
 
 class BaseGuard(ABC):
     """
     Base class for all guards in the Final Engine.
 
     Provides common interface that all guards must implement.
+
+    Attributes
+    ----------
+    pure : bool
+        True if check() only reads its inputs and configuration; False for
+        guards that persist state (snapshots, logs) between episodes
+    resources : frozenset of str
+        Names of shared resources (data files, endpoints) the guard touches;
+        guards sharing a resource never run at the same time
+    cost : float
+        Estimated milliseconds per check, used for fail-fast ordering until
+        timings have been recorded
+    version : str
+        Version of the check logic; bump it to invalidate cached results
+    cacheable : bool
+        False to always run check(), even for a pure guard (e.g. guards
+        whose outcome depends on something other than inputs and config)
+    timeout : float or None
+        Seconds a check may take before the executor reports a timeout;
+        None uses GUARD_TIMEOUT, 0 disables the limit
     """
 
+    pure: bool = True
+    resources: frozenset[str] = frozenset()
+    cost: float = 1.0
+    version: str = "1"
+    cacheable: bool = True
+    timeout: float | None = None
+
     # BaseGuard does not require custom initialization - concrete implementations can add their own __init__ if needed
 
     @abstractmethod
@@ -43,6 +101,118 @@ class BaseGuard(ABC):
         """
         pass
 
+    def config_paths(self) -> list[Any]:
+        """
+        Get the configuration files loaded by the constructor.
+
+        Guard sessions rebuild a cached guard when one of these files changes.
+
+        Returns
+        -------
+        List[Path]
+            Paths read at construction time (none by default)
+        """
+        return []
+
+    @classmethod
+    def job_args(
+        cls, draft: str, analysis: Any, episode_num: int, session: Any
+    ) -> tuple[Any, ...] | None:
+        """
+        Build the check() arguments for a pipeline draft.
+
+        Pipelines call this for every enabled guard, so a guard (built-in or
+        from an entry point) plugs in by overriding it rather than by
+        editing the pipeline. It is a classmethod so the guard instance is
+        still built lazily by the job.
+
+        Parameters
+        ----------
+        draft : str
+            Draft content to validate
+        analysis : DocumentAnalysis
+            Shared analysis of the draft
+        episode_num : int
+            Episode number
+        session : GuardSession
+            Session of the project (``project``, cached ``read_json``)
+
+        Returns
+        -------
+        tuple or None
+            Positional check() arguments (the draft text by default), or
+            None to skip the guard for this draft
+        """
+        return (draft,)
+
+    def cache_params(self) -> dict[str, Any]:
+        """
+        Get the instance settings that affect check() results.
+
+        The guard result cache includes them in its key, alongside the
+        guard version, config file hashes and check arguments.
+
+        Returns
+        -------
+        Dict[str, Any]
+            JSON-compatible settings (none by default)
+        """
+        return {}
+
+    def check_many(self, batch: list[Any]) -> list[dict[str, Any]]:
+        """
+        Check many inputs in one call.
+
+        The default implementation calls check() once per item. Guards with
+        a vectorized implementation override it to tokenize the whole batch
+        once and compute their metrics over all items together.
+
+        Parameters
+        ----------
+        batch : List[Any]
+            One entry per check: a tuple of check() arguments, or the single
+            argument of one-argument guards
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            One result per item, in order: check()'s result for passing
+            items; for failing items the result with "passed" False, its
+            "flags" and the "message" check() would have raised
+        """
+        results = []
+        for item in batch:
+            args = item if isinstance(item, tuple) else (item,)
+            try:
+                results.append(self.check(*args))
+            except RetryException as e:
+                results.append(failure_result({}, e))
+        return results
+
+
+def failure_result(results: dict[str, Any], error: RetryException) -> dict[str, Any]:
+    """
+    Describe a failed check as a batch result.
+
+    Parameters
+    ----------
+    results : Dict[str, Any]
+        Metrics computed before the failure (may be empty)
+    error : RetryException
+        Failure raised (or that would be raised) by check()
+
+    Returns
+    -------
+    Dict[str, Any]
+        ``results`` with "passed" False, the failure "flags" and "message"
+    """
+    return {
+        **results,
+        "passed": False,
+        "flags": error.flags,
+        "message": error.args[0] if error.args else "",
+    }
+
 
 class GuardRegistry:
     """
@@ -123,8 +293,18 @@ class GuardRegistry:
 # Global registry instance
 _registry = GuardRegistry()
 
+# Hooks run before ("pre") and after ("post") each guard invocation
+_hooks: dict[str, list[GuardHook]] = {"pre": [], "post": []}
 
-def register_guard(order: int) -> Callable[[type[BaseGuard]], type[BaseGuard]]:
+
+def register_guard(
+    order: int,
+    *,
+    pure: bool | None = None,
+    resources: tuple[str, ...] | None = None,
+    cost: float | None = None,
+    timeout: float | None = None,
+) -> Callable[[type[BaseGuard]], type[BaseGuard]]:
     """
     Decorator to register a guard class with the global registry.
 
@@ -132,6 +312,15 @@ def register_guard(order: int) -> Callable[[type[BaseGuard]], type[BaseGuard]]:
     ----------
     order : int
         Execution order for the guard (lower numbers execute first)
+    pure : bool, optional
+        Whether the guard is free of persistent side effects; keeps the
+        class attribute (default True) when omitted
+    resources : tuple of str, optional
+        Shared resources the guard touches; keeps the class attribute when omitted
+    cost : float, optional
+        Estimated milliseconds per check; keeps the class attribute when omitted
+    timeout : float, optional
+        Time budget per check in seconds; keeps the class attribute when omitted
 
     Returns
     -------
@@ -144,9 +333,22 @@ def register_guard(order: int) -> Callable[[type[BaseGuard]], type[BaseGuard]]:
     ... class MyGuard(BaseGuard):
     ...     def check(self, text):
     ...         return {"passed": True}
+
+    >>> @register_guard(order=2, pure=False, resources=("episode_dates.json",))
+    ... class MyStatefulGuard(BaseGuard):
+    ...     def check(self, text):
+    ...         return {"passed": True}
     """
 
     def decorator(guard_class: type[BaseGuard]) -> type[BaseGuard]:
+        if pure is not None:
+            guard_class.pure = pure
+        if resources is not None:
+            guard_class.resources = frozenset(resources)
+        if cost is not None:
+            guard_class.cost = cost
+        if timeout is not None:
+            guard_class.timeout = timeout
         _registry.register(order, guard_class)
         return guard_class
 
@@ -182,32 +384,108 @@ def clear_registry() -> None:
     Clear all registered guards.
 
     Primarily used for testing to ensure clean state.
-    Also removes guard modules from sys.modules cache to ensure
+    Also removes discovered guard modules from sys.modules cache to ensure
     decorators are re-executed on subsequent imports.
     """
-    import sys
-
     # Clear the registry
     _registry.clear()
 
     # Remove guard modules from sys.modules cache to force re-import
     # This ensures decorators are re-executed when modules are imported again
-    guard_module_names = [
-        "src.plugins.lexi_guard",
-        "src.plugins.emotion_guard",
-        "src.plugins.schedule_guard",
-        "src.plugins.immutable_guard",
-        "src.plugins.date_guard",
-        "src.plugins.anchor_guard",
-        "src.plugins.rule_guard",
-        "src.plugins.relation_guard",
-        "src.plugins.pacing_guard",
-        "src.plugins.critique_guard",
-    ]
-
-    for module_name in guard_module_names:
-        if module_name in sys.modules:
-            sys.modules.pop(module_name)
+    for module_name in set(discover_guards().values()):
+        sys.modules.pop(module_name, None)
+
+
+def discover_guards() -> dict[str, str]:
+    """
+    Discover the available guards without importing them.
+
+    Returns
+    -------
+    Dict[str, str]
+        Guard class name → module registering it; built-in guards from the
+        plugin manifest first, then guards from the "final_engine.guards"
+        entry-point group (which cannot replace built-in names)
+    """
+    from src.plugins import GUARD_MANIFEST
+
+    modules = dict(GUARD_MANIFEST)
+    try:
+        discovered = entry_points(group=ENTRY_POINT_GROUP)
+    except Exception as e:
+        logger.warning(f"Could not read {ENTRY_POINT_GROUP} entry points: {e}")
+        discovered = []
+
+    for entry_point in discovered:
+        if entry_point.name in modules:
+            logger.warning(f"Ignoring entry point {entry_point.name}: name already taken")
+            continue
+        modules[entry_point.name] = entry_point.module
+    return modules
+
+
+def enabled_guards(project: str = "default") -> list[str] | None:
+    """
+    Get the guards enabled for a project.
+
+    Reads the "enabled" list of data/guard_config.json, e.g.
+    ``{"enabled": ["LexiGuard", "RuleGuard"]}``.
+
+    Parameters
+    ----------
+    project : str, optional
+        Project ID for path resolution, defaults to "default"
+
+    Returns
+    -------
+    List[str] or None
+        Enabled guard class names, or None (all guards) when the project has
+        no guard configuration
+    """
+    config_path = data_path("guard_config.json", project)
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            enabled = json.load(f).get("enabled")
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, OSError, AttributeError) as e:
+        logger.warning(f"Ignoring invalid guard config {config_path}: {e}")
+        return None
+    return list(enabled) if enabled is not None else None
+
+
+def load_guards(enabled: Iterable[str] | None = None) -> list[type[BaseGuard]]:
+    """
+    Import the modules of the enabled guards and return them in execution order.
+
+    Parameters
+    ----------
+    enabled : Iterable[str], optional
+        Guard class names to load; every discovered guard when None
+
+    Returns
+    -------
+    List[Type[BaseGuard]]
+        Registered guards sorted by order; restricted to ``enabled`` when given
+    """
+    modules = discover_guards()
+    names = list(modules) if enabled is None else list(enabled)
+
+    for name in names:
+        module_name = modules.get(name)
+        if module_name is None:
+            if not any(cls.__name__ == name for cls in get_sorted_guards()):
+                logger.warning(f"Unknown guard {name} - not in manifest or entry points")
+            continue
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            logger.warning(f"Could not load guard {name} from {module_name}: {e}")
+
+    guards = get_sorted_guards()
+    if enabled is None:
+        return guards
+    return [cls for cls in guards if cls.__name__ in names]
 
 
 def get_registered_orders() -> list[int]:
@@ -220,3 +498,61 @@ def get_registered_orders() -> list[int]:
         List of registered orders sorted ascending
     """
     return _registry.get_registered_orders()
+
+
+def add_guard_hook(stage: str, hook: GuardHook) -> None:
+    """
+    Register a hook run around every guard invocation.
+
+    Parameters
+    ----------
+    stage : str
+        "pre" (before check(), entry holds guard, episode and input_size) or
+        "post" (after check(), entry also holds status, result/error,
+        elapsed and cpu seconds)
+    hook : GuardHook
+        Callable taking (guard_name, entry); may run on guard worker threads
+
+    Raises
+    ------
+    ValueError
+        If stage is not "pre" or "post"
+    """
+    if stage not in _hooks:
+        raise ValueError(f"Unknown hook stage {stage!r}; expected 'pre' or 'post'")
+    _hooks[stage].append(hook)
+
+
+def remove_guard_hook(stage: str, hook: GuardHook) -> None:
+    """
+    Unregister a hook added with add_guard_hook (no-op if not registered).
+
+    Parameters
+    ----------
+    stage : str
+        "pre" or "post"
+    hook : GuardHook
+        Previously registered hook
+    """
+    if hook in _hooks.get(stage, []):
+        _hooks[stage].remove(hook)
+
+
+def run_guard_hooks(stage: str, guard_name: str, entry: dict[str, Any]) -> None:
+    """
+    Run the hooks of a stage; hook errors are logged and never fail the guard.
+
+    Parameters
+    ----------
+    stage : str
+        "pre" or "post"
+    guard_name : str
+        Guard class name
+    entry : Dict[str, Any]
+        Invocation record passed to each hook
+    """
+    for hook in list(_hooks[stage]):
+        try:
+            hook(guard_name, entry)
+        except Exception as e:
+            logger.warning(f"Guard {stage}-hook {hook!r} failed for {guard_name}: {e}")
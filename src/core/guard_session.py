@@ -0,0 +1,173 @@
+"""
+guard_session.py
+
+Guard Session for Final Engine - long-lived guard instances per project.
+
+Guards load their configuration (rules.json, anchors.json, relation_matrix.json,
+pacing_config.json) in their constructors. Building every guard again for every
+episode re-reads and re-parses those files thousands of times over a season.
+A GuardSession builds each guard once per project and keeps it for the whole
+run; a guard is only rebuilt when one of its ``config_paths()`` changes on
+disk (modification time or size). JSON inputs read outside the guards, such
+as characters.json, are cached the same way through ``read_json``.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from src.core.guard_registry import BaseGuard
+
+logger = logging.getLogger(__name__)
+
+# (path, mtime_ns, size) per file; None values for missing files
+FileSignature = tuple[str, int | None, int | None]
+
+
+def file_signature(path: str | Path) -> FileSignature:
+    """
+    Get a cheap change signature for a file.
+
+    Parameters
+    ----------
+    path : str or Path
+        File path
+
+    Returns
+    -------
+    FileSignature
+        (path, mtime in ns, size), with None for a missing file
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+class GuardSession:
+    """
+    Cache of guard instances and JSON files for one project.
+
+    Parameters
+    ----------
+    project : str, optional
+        Project ID passed to every guard constructor, defaults to "default"
+    """
+
+    def __init__(self, project: str = "default"):
+        self.project = project
+        self._lock = threading.Lock()
+        self._guards: dict[type[BaseGuard], tuple[BaseGuard, tuple[FileSignature, ...]]] = {}
+        self._json: dict[str, tuple[FileSignature, Any]] = {}
+        self.builds = 0
+
+    def get(self, guard_class: type[BaseGuard]) -> BaseGuard:
+        """
+        Get the session's instance of a guard, rebuilding it if its config changed.
+
+        Parameters
+        ----------
+        guard_class : Type[BaseGuard]
+            Registered guard class
+
+        Returns
+        -------
+        BaseGuard
+            Guard instance constructed with the session's project
+        """
+        with self._lock:
+            cached = self._guards.get(guard_class)
+            if cached is not None:
+                guard, signature = cached
+                if tuple(file_signature(p) for p, *_ in signature) == signature:
+                    return guard
+                logger.info(f"{guard_class.__name__} configuration changed - reloading")
+
+            guard = guard_class(project=self.project)
+            signature = tuple(file_signature(p) for p in guard.config_paths())
+            self._guards[guard_class] = (guard, signature)
+            self.builds += 1
+            return guard
+
+    def read_json(self, path: str | Path, default: Any = None) -> Any:
+        """
+        Read a JSON file, re-parsing it only when it changed on disk.
+
+        The returned object is shared between callers and must not be mutated.
+
+        Parameters
+        ----------
+        path : str or Path
+            JSON file path
+        default : Any, optional
+            Value returned when the file is missing or invalid
+
+        Returns
+        -------
+        Any
+            Parsed JSON content, or ``default``
+        """
+        signature = file_signature(path)
+        with self._lock:
+            cached = self._json.get(str(path))
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+        if signature[1] is None:
+            return default
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return default
+
+        with self._lock:
+            self._json[str(path)] = (signature, data)
+        return data
+
+    def clear(self) -> None:
+        """Drop all cached guards and files."""
+        with self._lock:
+            self._guards.clear()
+            self._json.clear()
+
+
+# Sessions shared per project for the lifetime of the process
+_sessions: dict[str, GuardSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_guard_session(project: str = "default") -> GuardSession:
+    """
+    Get the shared guard session of a project.
+
+    Parameters
+    ----------
+    project : str, optional
+        Project ID, defaults to "default"
+
+    Returns
+    -------
+    GuardSession
+        Session reused by every episode of the project in this run
+    """
+    with _sessions_lock:
+        session = _sessions.get(project)
+        if session is None:
+            session = GuardSession(project)
+            _sessions[project] = session
+        return session
+
+
+def reset_guard_sessions() -> None:
+    """
+    Drop all shared guard sessions.
+
+    Primarily used for testing to ensure clean state.
+    """
+    with _sessions_lock:
+        _sessions.clear()
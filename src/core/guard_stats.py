@@ -0,0 +1,203 @@
+"""
+guard_stats.py
+
+Guard Statistics for Final Engine - recorded pass rates and timings per guard.
+
+The guard executor records the outcome and wall time of every guard run.
+The statistics drive fail-fast ordering: guards are run cheapest and
+most-often-failing first, ranked by expected cost / failure probability, so
+a draft that is going to be retried fails as early and as cheaply as
+possible. Until a guard has a few recorded runs its declared ``cost`` is used
+instead of measured timings.
+
+Statistics are persisted per project in data/guard_stats.json.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any
+
+from src.core.guard_registry import BaseGuard
+from src.utils.path_helper import data_path
+
+logger = logging.getLogger(__name__)
+
+# Runs needed before measured timings replace the declared cost
+MIN_SAMPLES = 3
+
+
+class GuardStats:
+    """
+    Per-guard run counts, failure counts and cumulative wall time.
+
+    Parameters
+    ----------
+    path : Path, optional
+        JSON file used by save(); statistics stay in memory when None
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats: dict[str, dict[str, float]] = {}
+
+    @classmethod
+    def load(cls, project: str = "default") -> "GuardStats":
+        """
+        Load the statistics stored for a project.
+
+        Parameters
+        ----------
+        project : str, optional
+            Project ID for path resolution, defaults to "default"
+
+        Returns
+        -------
+        GuardStats
+            Loaded statistics (empty if the file is missing or unreadable)
+        """
+        guard_stats = cls(data_path("guard_stats.json", project))
+        try:
+            with open(guard_stats.path, encoding="utf-8") as f:
+                guard_stats.stats = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable guard stats {guard_stats.path}: {e}")
+        return guard_stats
+
+    def save(self) -> None:
+        """Write the statistics to their JSON file (no-op for in-memory stats)."""
+        if self.path is None:
+            return
+        with self._lock:
+            snapshot = json.dumps(self.stats, indent=2, sort_keys=True)
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            Path(self.path).write_text(snapshot, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not save guard stats {self.path}: {e}")
+
+    def record(
+        self,
+        guard_name: str,
+        passed: bool,
+        elapsed: float,
+        cpu: float = 0.0,
+        input_size: int = 0,
+    ) -> None:
+        """
+        Record one guard run.
+
+        Parameters
+        ----------
+        guard_name : str
+            Guard class name
+        passed : bool
+            False if the guard raised RetryException
+        elapsed : float
+            Wall time of the run in seconds
+        cpu : float, optional
+            CPU time of the run in seconds
+        input_size : int, optional
+            Size of the checked input in characters
+        """
+        with self._lock:
+            entry = self.stats.setdefault(guard_name, {"runs": 0, "failures": 0, "seconds": 0.0})
+            entry["runs"] += 1
+            entry["failures"] += 0 if passed else 1
+            entry["seconds"] += elapsed
+            entry["cpu_seconds"] = entry.get("cpu_seconds", 0.0) + cpu
+            entry["chars"] = entry.get("chars", 0) + input_size
+
+    def failure_rate(self, guard_name: str) -> float:
+        """
+        Get the smoothed failure probability of a guard.
+
+        Uses Laplace smoothing, so an unseen guard has a rate of 0.5.
+
+        Parameters
+        ----------
+        guard_name : str
+            Guard class name
+
+        Returns
+        -------
+        float
+            (failures + 1) / (runs + 2)
+        """
+        entry = self.stats.get(guard_name, {})
+        return (entry.get("failures", 0) + 1) / (entry.get("runs", 0) + 2)
+
+    def expected_cost(self, guard_class: type[BaseGuard]) -> float:
+        """
+        Get the expected cost of one run in milliseconds.
+
+        Parameters
+        ----------
+        guard_class : Type[BaseGuard]
+            Guard class
+
+        Returns
+        -------
+        float
+            Mean measured wall time once MIN_SAMPLES runs are recorded,
+            otherwise the guard's declared ``cost``
+        """
+        entry = self.stats.get(guard_class.__name__, {})
+        if entry.get("runs", 0) >= MIN_SAMPLES:
+            return entry["seconds"] / entry["runs"] * 1000
+        return float(getattr(guard_class, "cost", 1.0))
+
+    def order(self, guard_classes: list[type[BaseGuard]]) -> list[type[BaseGuard]]:
+        """
+        Sort guards for fail-fast execution.
+
+        Parameters
+        ----------
+        guard_classes : List[Type[BaseGuard]]
+            Guard classes in registry order
+
+        Returns
+        -------
+        List[Type[BaseGuard]]
+            Guards by ascending expected cost / failure probability (stable)
+        """
+        return sorted(
+            guard_classes,
+            key=lambda cls: self.expected_cost(cls) / self.failure_rate(cls.__name__),
+        )
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Get a snapshot of the statistics.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Guard name → runs, failures, failure rate, mean wall and CPU
+            milliseconds, and wall milliseconds per 1,000 input characters
+            (to tell slow inputs from slow guards)
+        """
+        with self._lock:
+            return {
+                name: {
+                    "runs": entry["runs"],
+                    "failures": entry["failures"],
+                    "failure_rate": self.failure_rate(name),
+                    "mean_ms": entry["seconds"] / entry["runs"] * 1000 if entry["runs"] else 0.0,
+                    "mean_cpu_ms": (
+                        entry.get("cpu_seconds", 0.0) / entry["runs"] * 1000
+                        if entry["runs"]
+                        else 0.0
+                    ),
+                    "ms_per_kchar": (
+                        entry["seconds"] * 1000 / (entry["chars"] / 1000)
+                        if entry.get("chars")
+                        else None
+                    ),
+                }
+                for name, entry in self.stats.items()
+            }
@@ -0,0 +1,519 @@
+"""
+ngram_index.py
+
+Season N-gram Index for Final Engine - cross-episode phrase repetition.
+
+LexiGuard only sees one draft at a time, so stock phrases repeated across a
+240-episode season were never caught. The season index keeps, per project,
+how many episodes contain each word 3-, 4- and 5-gram:
+
+- n-grams are hashed to 64 bits (BLAKE2b per distinct token, then a
+  multiplicative hash over the n token hashes and a splitmix64 finalizer)
+- counts live in an open-addressing hash table of two NumPy arrays (keys,
+  episode counts) memory-mapped from ``data/ngram_index/``, so an update only
+  touches the slots of the new draft's n-grams
+- an optional Bloom filter in front answers most lookups of unseen n-grams
+  without probing the table; meta.json records the index revision the filter
+  was last updated at, and a filter left behind by runs with
+  SEASON_INDEX_BLOOM=0 is rebuilt instead of being trusted
+- the distinct hashes of every indexed episode are kept in
+  ``episodes/episode_<n>.npy`` so re-indexing an episode first removes its
+  previous contribution
+
+Indexing and scoring an episode cost O(draft length); earlier outputs are
+never rescanned. SEASON_INDEX=off disables the index.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.text import lower_tokens, token_spans
+from src.utils.path_helper import data_path
+
+logger = logging.getLogger(__name__)
+
+# Word n-gram lengths tracked across the season
+NGRAM_SIZES = (3, 4, 5)
+
+# Table slots start at this power of two and double above MAX_LOAD
+INITIAL_CAPACITY = 1 << 16
+MAX_LOAD = 0.5
+
+# Bloom filter: bits per table slot and hash functions per key
+BLOOM_BITS_PER_SLOT = 8
+BLOOM_HASHES = 4
+
+# Repeated phrases reported by score()
+TOP_PHRASES = 5
+
+_MULTIPLIER = np.uint64(0x100000001B3)
+_SEED = 0x9E3779B97F4A7C15
+
+
+def _splitmix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, spreading hash bits over all 64 bits."""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _token_hashes(tokens: tuple[str, ...]) -> np.ndarray:
+    """Stable 64-bit hash per token, computing one digest per distinct token."""
+    vocab: dict[str, int] = {}
+    ids = np.fromiter(
+        (vocab.setdefault(token, len(vocab)) for token in tokens), dtype=np.int64, count=len(tokens)
+    )
+    digests = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            for token in vocab
+        ),
+        dtype=np.uint64,
+        count=len(vocab),
+    )
+    return digests[ids]
+
+
+def ngram_hashes(text: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hash every word n-gram of a text (lengths in NGRAM_SIZES).
+
+    Parameters
+    ----------
+    text : str
+        Text to hash; tokens are lowercased words
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Non-zero uint64 hash, first token position and length of every
+        n-gram, in order of length then position
+    """
+    hashes = _token_hashes(lower_tokens(text))
+    parts, starts, sizes = [], [], []
+    for size in NGRAM_SIZES:
+        count = len(hashes) - size + 1
+        if count <= 0:
+            continue
+        combined = np.full(count, (_SEED * size) & 0xFFFFFFFFFFFFFFFF, dtype=np.uint64)
+        for offset in range(size):
+            combined = (combined ^ hashes[offset : offset + count]) * _MULTIPLIER
+        combined = _splitmix(combined)
+        combined[combined == 0] = 1  # 0 marks empty table slots
+        parts.append(combined)
+        starts.append(np.arange(count, dtype=np.int64))
+        sizes.append(np.full(count, size, dtype=np.int64))
+
+    if not parts:
+        empty = np.zeros(0, dtype=np.int64)
+        return np.zeros(0, dtype=np.uint64), empty, empty
+    return np.concatenate(parts), np.concatenate(starts), np.concatenate(sizes)
+
+
+class SeasonNgramIndex:
+    """
+    Persistent count of episodes containing each hashed n-gram.
+
+    Parameters
+    ----------
+    directory : Path, optional
+        Directory of the memory-mapped table; kept in memory only when None
+    bloom : bool, optional
+        Keep a Bloom filter in front of the table, defaults to True
+    """
+
+    def __init__(self, directory: Path | None = None, bloom: bool = True):
+        self.directory = Path(directory) if directory is not None else None
+        self.use_bloom = bloom
+        self._lock = threading.Lock()
+        self._episodes: dict[int, np.ndarray] = {}
+        self.size = 0
+        # Bumped on every change; the Bloom filter is valid only at its own revision
+        self.revision = 0
+        self._bloom_revision = 0
+
+        meta = self._read_meta()
+        keys = self._open("keys.npy") if meta is not None else None
+        counts = self._open("counts.npy") if meta is not None else None
+        if keys is None or counts is None or len(keys) != len(counts):
+            self._allocate(INITIAL_CAPACITY)
+            return
+
+        self.keys, self.counts, self.size = keys, counts, meta["size"]
+        self.revision = meta.get("revision", 0)
+        self._bloom_revision = meta.get("bloom_revision")
+        self.bloom = None
+        if bloom and self._bloom_revision == self.revision:
+            self.bloom = self._open("bloom.npy")
+        if bloom and self.bloom is None:
+            # Missing, or stale after updates made without the filter
+            self.bloom = self._build_bloom(self.keys[self.counts > 0], len(self.keys))
+            self._bloom_revision = self.revision
+
+    # ----- storage -------------------------------------------------------
+
+    def _read_meta(self) -> dict[str, Any] | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self.directory / "meta.json", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+
+    def _open(self, name: str) -> np.ndarray | None:
+        try:
+            return np.load(self.directory / name, mmap_mode="r+")
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+    def _array(self, name: str, values: np.ndarray) -> np.ndarray:
+        """Store an array in the index directory and map it back, or keep it in memory."""
+        if self.directory is None:
+            return values
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp = self.directory / f"{name}.tmp.npy"
+        np.save(temp, values)
+        os.replace(temp, self.directory / name)
+        return np.load(self.directory / name, mmap_mode="r+")
+
+    def _allocate(self, capacity: int) -> None:
+        self.keys = self._array("keys.npy", np.zeros(capacity, dtype=np.uint64))
+        self.counts = self._array("counts.npy", np.zeros(capacity, dtype=np.uint32))
+        self.bloom = (
+            self._array("bloom.npy", self._empty_bloom(capacity)) if self.use_bloom else None
+        )
+        self.size = 0
+
+    def _flush(self) -> None:
+        if self.directory is None:
+            return
+        for array in (self.keys, self.counts, self.bloom):
+            if isinstance(array, np.memmap):
+                array.flush()
+        if self.bloom is not None:
+            self._bloom_revision = self.revision
+        meta = {
+            "capacity": len(self.keys),
+            "size": self.size,
+            "sizes": list(NGRAM_SIZES),
+            "revision": self.revision,
+            "bloom_revision": self._bloom_revision,
+        }
+        (self.directory / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    def _episode_path(self, episode: int) -> Path:
+        return self.directory / "episodes" / f"episode_{episode}.npy"
+
+    def _episode_hashes(self, episode: int) -> np.ndarray | None:
+        if episode in self._episodes or self.directory is None:
+            return self._episodes.get(episode)
+        try:
+            hashes = np.load(self._episode_path(episode))
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        self._episodes[episode] = hashes
+        return hashes
+
+    # ----- Bloom filter -----------------------------------------------------
+
+    @staticmethod
+    def _empty_bloom(capacity: int) -> np.ndarray:
+        return np.zeros(capacity * BLOOM_BITS_PER_SLOT // 64, dtype=np.uint64)
+
+    @staticmethod
+    def _bloom_bits(bloom: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        """Bit positions of every key, shape (BLOOM_HASHES, len(hashes))."""
+        bit_count = np.uint64(len(bloom) * 64)
+        first = hashes & np.uint64(0xFFFFFFFF)
+        step = (hashes >> np.uint64(32)) | np.uint64(1)
+        rounds = np.arange(BLOOM_HASHES, dtype=np.uint64)[:, None]
+        return (first + rounds * step) % bit_count
+
+    def _bloom_add(self, bloom: np.ndarray, hashes: np.ndarray) -> None:
+        bits = self._bloom_bits(bloom, hashes).ravel()
+        np.bitwise_or.at(bloom, bits >> np.uint64(6), np.uint64(1) << (bits & np.uint64(63)))
+
+    def _build_bloom(self, hashes: np.ndarray, capacity: int) -> np.ndarray:
+        bloom = self._empty_bloom(capacity)
+        self._bloom_add(bloom, hashes)
+        return self._array("bloom.npy", bloom)
+
+    def _maybe_present(self, hashes: np.ndarray) -> np.ndarray:
+        if self.bloom is None:
+            return np.ones(len(hashes), dtype=bool)
+        bits = self._bloom_bits(self.bloom, hashes)
+        words = self.bloom[bits >> np.uint64(6)]
+        return ((words >> (bits & np.uint64(63))) & np.uint64(1)).astype(bool).all(axis=0)
+
+    # ----- hash table -------------------------------------------------------
+
+    def _slots(self, hashes: np.ndarray, insert: bool = False) -> np.ndarray:
+        """
+        Find (or claim) the table slot of every key by vectorized linear probing.
+
+        Keys must be distinct when ``insert`` is True. Returns -1 for absent keys.
+        """
+        mask = len(self.keys) - 1
+        slots = (hashes & np.uint64(mask)).astype(np.int64)
+        found = np.full(len(hashes), -1, dtype=np.int64)
+        pending = np.arange(len(hashes), dtype=np.int64)
+
+        while pending.size:
+            current = slots[pending]
+            stored = self.keys[current]
+            hit = stored == hashes[pending]
+            empty = stored == 0
+            found[pending[hit]] = current[hit]
+
+            retry = np.zeros(0, dtype=np.int64)
+            if insert and empty.any():
+                # Several keys may reach the same empty slot: the first claims
+                # it, the others re-check it next round and move on
+                claimants, claimed = pending[empty], current[empty]
+                _, first = np.unique(claimed, return_index=True)
+                self.keys[claimed[first]] = hashes[claimants[first]]
+                found[claimants[first]] = claimed[first]
+                self.size += len(first)
+                lost = np.ones(len(claimants), dtype=bool)
+                lost[first] = False
+                retry = claimants[lost]
+
+            advance = pending[~hit & ~empty]
+            slots[advance] = (slots[advance] + 1) & mask
+            pending = np.concatenate((advance, retry))
+        return found
+
+    def _grow(self, incoming: int) -> None:
+        """Rehash into a larger table, dropping keys no episode contains any more."""
+        live = self.counts > 0
+        keys, counts = np.asarray(self.keys[live]), np.asarray(self.counts[live])
+        capacity = len(self.keys)
+        while (len(keys) + incoming) > capacity * MAX_LOAD:
+            capacity *= 2
+        logger.info(f"Growing season n-gram index to {capacity} slots")
+
+        self._allocate(capacity)
+        self.counts[self._slots(keys, insert=True)] = counts
+        if self.bloom is not None:
+            self._bloom_add(self.bloom, keys)
+
+    def _lookup(self, hashes: np.ndarray) -> np.ndarray:
+        """Episode count of every key (0 for unseen keys)."""
+        counts = np.zeros(len(hashes), dtype=np.int64)
+        candidates = np.flatnonzero(self._maybe_present(hashes))
+        slots = self._slots(hashes[candidates])
+        known = slots >= 0
+        counts[candidates[known]] = self.counts[slots[known]]
+        return counts
+
+    # ----- public API ---------------------------------------------------------
+
+    def episode_counts(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Get the number of indexed episodes containing each n-gram hash.
+
+        Parameters
+        ----------
+        hashes : np.ndarray
+            uint64 n-gram hashes (see ngram_hashes)
+
+        Returns
+        -------
+        np.ndarray
+            int64 episode count per hash
+        """
+        with self._lock:
+            return self._lookup(np.asarray(hashes, dtype=np.uint64))
+
+    def add_episode(
+        self,
+        episode: int,
+        text: str,
+        hashed: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+    ) -> int:
+        """
+        Index the n-grams of an episode, replacing any earlier version of it.
+
+        Parameters
+        ----------
+        episode : int
+            Episode number
+        text : str
+            Final episode text
+        hashed : Tuple[np.ndarray, np.ndarray, np.ndarray], optional
+            ``ngram_hashes(text)``, when already computed (e.g. for score())
+
+        Returns
+        -------
+        int
+            Number of distinct n-grams indexed for the episode
+        """
+        hashes = np.unique((hashed if hashed is not None else ngram_hashes(text))[0])
+        with self._lock:
+            self.revision += 1
+            self._remove(episode)
+            if self.size + len(hashes) > len(self.keys) * MAX_LOAD:
+                self._grow(len(hashes))
+            slots = self._slots(hashes, insert=True)
+            self.counts[slots] += 1
+            if self.bloom is not None:
+                self._bloom_add(self.bloom, hashes)
+
+            self._episodes[episode] = hashes
+            if self.directory is not None:
+                self._episode_path(episode).parent.mkdir(parents=True, exist_ok=True)
+                np.save(self._episode_path(episode), hashes)
+            self._flush()
+        return len(hashes)
+
+    def remove_episode(self, episode: int) -> bool:
+        """
+        Remove an episode's n-grams from the index.
+
+        Parameters
+        ----------
+        episode : int
+            Episode number
+
+        Returns
+        -------
+        bool
+            True if the episode was indexed
+        """
+        with self._lock:
+            removed = self._remove(episode)
+            if removed:
+                self.revision += 1
+                self._flush()
+            return removed
+
+    def _remove(self, episode: int) -> bool:
+        hashes = self._episode_hashes(episode)
+        if hashes is None:
+            return False
+        slots = self._slots(hashes)
+        slots = slots[slots >= 0]
+        self.counts[slots] = self.counts[slots] - (self.counts[slots] > 0)
+        self._episodes.pop(episode, None)
+        if self.directory is not None:
+            self._episode_path(episode).unlink(missing_ok=True)
+        return True
+
+    def score(
+        self,
+        text: str,
+        exclude_episode: int | None = None,
+        min_episodes: int = 1,
+        hashed: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Score a draft against the season's history in one pass.
+
+        Parameters
+        ----------
+        text : str
+            Draft to score
+        exclude_episode : int, optional
+            Episode whose own earlier version must not count as history
+        min_episodes : int, optional
+            Episodes an n-gram must appear in to count as repeated
+        hashed : Tuple[np.ndarray, np.ndarray, np.ndarray], optional
+            ``ngram_hashes(text)``, when already computed (e.g. for add_episode())
+
+        Returns
+        -------
+        Dict[str, Any]
+            "ngrams" (n-grams in the draft), "repeated" (those found in at
+            least ``min_episodes`` other episodes), "rate" (repeated share)
+            and "phrases": up to TOP_PHRASES {"text", "episodes", "span"}
+            entries, most widespread and longest first
+        """
+        hashes, starts, sizes = hashed if hashed is not None else ngram_hashes(text)
+        counts = self.episode_counts(hashes)
+        if exclude_episode is not None:
+            with self._lock:
+                own = self._episode_hashes(exclude_episode)
+            if own is not None:
+                counts -= np.isin(hashes, own)
+
+        repeated = counts >= min_episodes
+        result = {
+            "ngrams": len(hashes),
+            "repeated": int(repeated.sum()),
+            "rate": float(repeated.mean()) if len(hashes) else 0.0,
+            "phrases": [],
+        }
+
+        tokens = lower_tokens(text)
+        lower = text.lower()
+        offsets = token_spans(lower) if len(lower) == len(text) else None
+        # Skip repeats of a reported phrase and n-grams inside a reported one
+        seen: set[str] = set()
+        reported: list[tuple[int, int]] = []
+        order = np.flatnonzero(repeated)
+        order = order[np.lexsort((starts[order], -sizes[order], -counts[order]))]
+        for index in order.tolist():
+            start, size = int(starts[index]), int(sizes[index])
+            phrase = " ".join(tokens[start : start + size])
+            if phrase in seen or any(a <= start and start + size <= b for a, b in reported):
+                continue
+            seen.add(phrase)
+            reported.append((start, start + size))
+            span = None
+            if offsets is not None:
+                span = [offsets[start][0], offsets[start + size - 1][1]]
+            result["phrases"].append({"text": phrase, "episodes": int(counts[index]), "span": span})
+            if len(result["phrases"]) >= TOP_PHRASES:
+                break
+        return result
+
+
+# Indexes shared per project for the lifetime of the process
+_indexes: dict[str, SeasonNgramIndex | None] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_ngram_index(project: str = "default") -> SeasonNgramIndex | None:
+    """
+    Get the shared season n-gram index of a project.
+
+    Parameters
+    ----------
+    project : str, optional
+        Project ID, defaults to "default"
+
+    Returns
+    -------
+    SeasonNgramIndex or None
+        Index stored in the project's data/ngram_index directory, or None
+        when SEASON_INDEX is "off"
+    """
+    with _indexes_lock:
+        if project not in _indexes:
+            mode = os.getenv("SEASON_INDEX", "on").lower()
+            if mode in ("off", "0", "false"):
+                _indexes[project] = None
+            else:
+                bloom = os.getenv("SEASON_INDEX_BLOOM", "1") != "0"
+                _indexes[project] = SeasonNgramIndex(data_path("ngram_index", project), bloom)
+        return _indexes[project]
+
+
+def reset_ngram_indexes() -> None:
+    """
+    Drop all shared season indexes.
+
+    Primarily used for testing to ensure clean state.
+    """
+    with _indexes_lock:
+        _indexes.clear()
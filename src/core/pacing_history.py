@@ -0,0 +1,285 @@
+"""
+pacing_history.py
+
+Pacing History for Final Engine - rolling action/dialog/monolog baselines.
+
+PacingGuard compares an episode's action/dialog/monolog ratios with the
+average of the previous ``window`` episodes. The history keeps, per project,
+the ratios of every finished episode in one NumPy array file
+(``data/pacing_history.npy``, shape (capacity, 3), indexed by episode number,
+NaN for unknown episodes). The file is memory-mapped and its capacity doubles
+when an episode does not fit, so recording an episode writes one row in
+place (amortized O(1)) instead of rewriting the array. The last ``window``
+recorded episodes are also held in a ring buffer with running sums, so
+reading the rolling average is O(1). Averages before an earlier episode
+(e.g. when an episode is regenerated) are computed from the array instead.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.path_helper import data_path
+
+logger = logging.getLogger(__name__)
+
+# Ratios stored per episode, in array order (see pacing_guard.CONTENT_TYPES)
+CONTENT_TYPES = ("action", "dialog", "monolog")
+
+# Episodes in the rolling window unless configured otherwise
+DEFAULT_WINDOW = 10
+
+# Rows allocated for a new history
+INITIAL_CAPACITY = 64
+
+
+def _as_row(ratios: dict[str, float] | Iterable[float]) -> np.ndarray:
+    """Convert a ratios dict or vector to a CONTENT_TYPES-ordered row."""
+    if isinstance(ratios, dict):
+        ratios = [ratios.get(key, 0.0) for key in CONTENT_TYPES]
+    row = np.asarray(ratios, dtype=float).reshape(-1)
+    if row.shape != (len(CONTENT_TYPES),):
+        raise ValueError(f"Expected {len(CONTENT_TYPES)} pacing ratios, got {row.shape[0]}")
+    return row
+
+
+class PacingHistory:
+    """
+    Action/dialog/monolog ratios of every finished episode of a project.
+
+    Parameters
+    ----------
+    path : Path, optional
+        .npy file of the history; kept in memory only when None
+    window : int, optional
+        Episodes in the rolling average, defaults to DEFAULT_WINDOW
+    """
+
+    def __init__(self, path: Path | None = None, window: int = DEFAULT_WINDOW):
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._ratios = self._load()
+        self._revision: str | None = None
+        self._window = max(1, int(window))
+        self._rebuild()
+
+    def _load(self) -> np.ndarray:
+        empty = np.full((0, len(CONTENT_TYPES)), np.nan)
+        if self.path is None or not self.path.exists():
+            return empty
+        try:
+            # Mapped read-write, so recorded rows are written in place
+            ratios = np.load(self.path, mmap_mode="r+")
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not read pacing history {self.path}: {e}")
+            return empty
+        if ratios.ndim != 2 or ratios.shape[1] != len(CONTENT_TYPES) or ratios.dtype != float:
+            logger.warning(f"Ignoring pacing history {self.path} with shape {ratios.shape}")
+            return empty
+        return ratios
+
+    def _rebuild(self) -> None:
+        """Refill the ring buffer with the last ``window`` known episodes."""
+        known = np.flatnonzero(~np.isnan(self._ratios[:, 0]))[-self._window :]
+        self._ring = np.zeros((self._window, len(CONTENT_TYPES)))
+        self._ring[: len(known)] = self._ratios[known]
+        self._sums = self._ring.sum(axis=0)
+        self._size = len(known)
+        self._head = len(known) % self._window
+        self._last = int(known[-1]) if len(known) else -1
+
+    @property
+    def window(self) -> int:
+        """Episodes in the rolling average."""
+        return self._window
+
+    @window.setter
+    def window(self, window: int) -> None:
+        with self._lock:
+            window = max(1, int(window))
+            if window != self._window:
+                self._window = window
+                self._rebuild()
+
+    @property
+    def revision(self) -> str:
+        """Digest of the stored ratios and window; changes whenever averages may change."""
+        with self._lock:
+            if self._revision is None:
+                digest = hashlib.blake2b(self._ratios.tobytes(), digest_size=8)
+                digest.update(str(self._window).encode())
+                self._revision = digest.hexdigest()
+            return self._revision
+
+    def __len__(self) -> int:
+        """Number of episodes with stored ratios."""
+        with self._lock:
+            return int((~np.isnan(self._ratios[:, 0])).sum())
+
+    def _grow(self, size: int) -> None:
+        """Make room for ``size`` rows, doubling the capacity (and file) if needed."""
+        if size <= len(self._ratios):
+            return
+        capacity = max(size, 2 * len(self._ratios), INITIAL_CAPACITY)
+        if self.path is None:
+            grown = np.full((capacity, len(CONTENT_TYPES)), np.nan)
+            grown[: len(self._ratios)] = self._ratios
+            self._ratios = grown
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.path.with_name(f"{self.path.stem}.tmp.npy")
+            grown = np.lib.format.open_memmap(
+                temp, mode="w+", dtype=float, shape=(capacity, len(CONTENT_TYPES))
+            )
+            grown[:] = np.nan
+            grown[: len(self._ratios)] = self._ratios
+            grown.flush()
+            del grown
+            os.replace(temp, self.path)
+            self._ratios = np.load(self.path, mmap_mode="r+")
+        except OSError as e:
+            logger.warning(f"Could not save pacing history {self.path}: {e}")
+            grown = np.full((capacity, len(CONTENT_TYPES)), np.nan)
+            grown[: len(self._ratios)] = self._ratios
+            self._ratios = grown
+
+    def record(self, episode: int, ratios: dict[str, float] | Iterable[float]) -> None:
+        """
+        Store the ratios of a finished episode.
+
+        The episode's row is written in place, and recording an episode after
+        the latest one updates the ring buffer in O(1); re-recording an
+        earlier episode refills it.
+
+        Parameters
+        ----------
+        episode : int
+            Episode number
+        ratios : Dict[str, float] or Iterable[float]
+            Action, dialog and monolog ratios
+        """
+        row = _as_row(ratios)
+        with self._lock:
+            self._grow(episode + 1)
+            self._ratios[episode] = row
+            self._revision = None
+            if episode > self._last:
+                # Drop the oldest episode once the window is full
+                if self._size == self._window:
+                    self._sums -= self._ring[self._head]
+                else:
+                    self._size += 1
+                self._ring[self._head] = row
+                self._sums += row
+                self._head = (self._head + 1) % self._window
+                self._last = episode
+            else:
+                self._rebuild()
+            self._save()
+
+    def extend(self, episodes: Iterable[int], ratios: np.ndarray) -> None:
+        """
+        Store the ratios of many episodes at once.
+
+        Parameters
+        ----------
+        episodes : Iterable[int]
+            Episode numbers
+        ratios : np.ndarray
+            Ratios of shape (len(episodes), 3) in CONTENT_TYPES order
+        """
+        episodes = np.fromiter(episodes, dtype=np.int64)
+        ratios = np.asarray(ratios, dtype=float).reshape(len(episodes), len(CONTENT_TYPES))
+        if not len(episodes):
+            return
+        with self._lock:
+            self._grow(int(episodes.max()) + 1)
+            self._ratios[episodes] = ratios
+            self._revision = None
+            self._rebuild()
+            self._save()
+
+    def average(self, before: int | None = None) -> dict[str, float] | None:
+        """
+        Get the average ratios of the last ``window`` recorded episodes.
+
+        Parameters
+        ----------
+        before : int, optional
+            Only use episodes before this one (the episode being checked)
+
+        Returns
+        -------
+        Dict[str, float] or None
+            Average action, dialog and monolog ratios, or None if no episode
+            qualifies
+        """
+        with self._lock:
+            if before is None or before > self._last:
+                if not self._size:
+                    return None
+                mean = self._sums / self._size
+            else:
+                earlier = self._ratios[: max(before, 0)]
+                known = np.flatnonzero(~np.isnan(earlier[:, 0]))[-self._window :]
+                if not len(known):
+                    return None
+                mean = earlier[known].mean(axis=0)
+        return dict(zip(CONTENT_TYPES, mean.tolist(), strict=True))
+
+    def _save(self) -> None:
+        """Flush the rows written to a memory-mapped history."""
+        if isinstance(self._ratios, np.memmap):
+            try:
+                self._ratios.flush()
+            except OSError as e:
+                logger.warning(f"Could not save pacing history {self.path}: {e}")
+
+
+# Histories shared per project for the lifetime of the process
+_histories: dict[str, PacingHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def get_pacing_history(project: str = "default", window: int | None = None) -> PacingHistory:
+    """
+    Get the shared pacing history of a project.
+
+    Parameters
+    ----------
+    project : str, optional
+        Project ID, defaults to "default"
+    window : int, optional
+        Episodes in the rolling average; keeps the current window when None
+
+    Returns
+    -------
+    PacingHistory
+        History backed by the project's data/pacing_history.npy
+    """
+    with _histories_lock:
+        history = _histories.get(project)
+        if history is None:
+            history = PacingHistory(
+                data_path("pacing_history.npy", project), window or DEFAULT_WINDOW
+            )
+            _histories[project] = history
+    if window is not None:
+        history.window = window
+    return history
+
+
+def reset_pacing_histories() -> None:
+    """
+    Drop all shared pacing histories.
+
+    Primarily used for testing to ensure clean state.
+    """
+    with _histories_lock:
+        _histories.clear()
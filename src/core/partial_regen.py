@@ -0,0 +1,304 @@
+"""
+partial_regen.py
+
+Targeted partial regeneration for Final Engine - repairs only the failing part of a text.
+
+When a guard raises RetryException the whole unit used to be regenerated. This
+module reads the exception's ``flags`` to locate the failing segments and
+stitches regenerated replacements back into the original text:
+
+- rule violations        → the sentences containing the matched texts (every
+                           violation RuleGuard lists, else the first match)
+- repeated passages      → sentences holding later copies of repeated 3-grams
+                           (LexiGuard reports them as spans; located here otherwise)
+- missing anchor events  → an insertion at the end of the text
+- any flag with "span"/"spans" → that character span (e.g. a scene span)
+
+Segments are plain dicts: {"start": int, "end": int, "kind": "replace" | "insert", "reason": str}.
+Flags that carry no location (e.g. a global TTR score) yield no segments, in
+which case the caller should regenerate the whole unit as before.
+"""
+
+import logging
+import re
+from collections.abc import Callable
+from typing import Any
+
+from src.text import token_spans
+
+logger = logging.getLogger(__name__)
+
+# Characters that end a sentence (Korean drafts also use line breaks as boundaries)
+_SENTENCE_END = re.compile(r"[.!?。！？\n]")
+
+# Regenerating more than this share of a text is no cheaper than a full retry
+MAX_PARTIAL_FRACTION = 0.5
+
+# Maximum repeated-passage segments taken from one duplicate_phrases flag
+MAX_REPEAT_SEGMENTS = 3
+
+
+def expand_to_sentence(text: str, start: int, end: int) -> tuple[int, int]:
+    """
+    Expand a character span to the full sentence(s) containing it.
+
+    Parameters
+    ----------
+    text : str
+        Full text
+    start : int
+        Span start offset
+    end : int
+        Span end offset
+
+    Returns
+    -------
+    Tuple[int, int]
+        Sentence-aligned (start, end) offsets, end exclusive and including
+        the terminating punctuation
+    """
+    start = max(0, min(start, len(text)))
+    end = max(start, min(end, len(text)))
+
+    sentence_start = start
+    while sentence_start > 0 and not _SENTENCE_END.match(text, sentence_start - 1):
+        sentence_start -= 1
+    while sentence_start < start and text[sentence_start].isspace():
+        sentence_start += 1
+
+    match = _SENTENCE_END.search(text, max(end - 1, sentence_start))
+    sentence_end = match.end() if match else len(text)
+    return sentence_start, sentence_end
+
+
+def _repeated_passage_spans(
+    text: str, max_spans: int = MAX_REPEAT_SEGMENTS
+) -> list[tuple[int, int]]:
+    """Locate later occurrences of repeated word 3-grams, keeping the first copy."""
+    lower = text.lower()
+    offsets = token_spans(lower)
+    words = [lower[start:end] for start, end in offsets]
+    seen: set[tuple[str, str, str]] = set()
+    spans: list[tuple[int, int]] = []
+
+    for i in range(len(words) - 2):
+        trigram = (words[i], words[i + 1], words[i + 2])
+        if trigram in seen:
+            spans.append((offsets[i][0], offsets[i + 2][1]))
+            if len(spans) >= max_spans:
+                break
+        else:
+            seen.add(trigram)
+
+    return spans
+
+
+def _span_segments(flag_data: dict[str, Any], reason: str, text: str) -> list[dict[str, Any]]:
+    """Segments from explicit "span" / "spans" entries in a flag."""
+    spans = []
+    if "span" in flag_data:
+        spans.append(flag_data["span"])
+    spans.extend(flag_data.get("spans", []))
+
+    segments = []
+    for span in spans:
+        start, end = int(span[0]), int(span[1])
+        start, end = expand_to_sentence(text, start, end)
+        segments.append({"start": start, "end": end, "kind": "replace", "reason": reason})
+    return segments
+
+
+def find_failing_segments(text: str, error: Exception) -> list[dict[str, Any]]:
+    """
+    Locate the text segments responsible for a guard failure.
+
+    Parameters
+    ----------
+    text : str
+        Text that failed the guard
+    error : Exception
+        RetryException (or anything with a ``flags`` dict) raised by the guard
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Segments to regenerate; empty if the failure cannot be localised
+    """
+    flags = getattr(error, "flags", None) or {}
+    segments: list[dict[str, Any]] = []
+
+    for flag_name, flag_data in flags.items():
+        if not isinstance(flag_data, dict):
+            continue
+        reason = flag_data.get("message") or f"{flag_name}: {error}"
+
+        if "span" in flag_data or "spans" in flag_data:
+            segments.extend(_span_segments(flag_data, reason, text))
+
+        elif flag_name == "rule_violation" and flag_data.get("violations"):
+            for violation in flag_data["violations"]:
+                start, end = expand_to_sentence(text, *violation["span"])
+                segments.append(
+                    {
+                        "start": start,
+                        "end": end,
+                        "kind": "replace",
+                        "reason": f"Remove forbidden content: {violation['message']}",
+                    }
+                )
+
+        elif flag_name == "rule_violation":
+            matched_text = flag_data.get("matched_text", "")
+            position = flag_data.get("match_position")
+            if position is None and matched_text:
+                position = text.find(matched_text)
+            if position is None or position < 0:
+                continue
+            start, end = expand_to_sentence(text, position, position + len(matched_text))
+            segments.append(
+                {
+                    "start": start,
+                    "end": end,
+                    "kind": "replace",
+                    "reason": f"Remove forbidden content: {flag_data.get('message', matched_text)}",
+                }
+            )
+
+        elif flag_name == "duplicate_phrases":
+            for span_start, span_end in _repeated_passage_spans(text):
+                start, end = expand_to_sentence(text, span_start, span_end)
+                segments.append(
+                    {
+                        "start": start,
+                        "end": end,
+                        "kind": "replace",
+                        "reason": "Rephrase this passage - it repeats wording used earlier",
+                    }
+                )
+
+        elif flag_name == "anchor_compliance":
+            for anchor in flag_data.get("missing_anchors", []):
+                segments.append(
+                    {
+                        "start": len(text),
+                        "end": len(text),
+                        "kind": "insert",
+                        "reason": f"Include the required story event: {anchor.get('goal', '')}",
+                    }
+                )
+
+    return merge_segments(segments)
+
+
+def merge_segments(segments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Merge overlapping replace segments and order all segments by position.
+
+    Parameters
+    ----------
+    segments : List[Dict[str, Any]]
+        Segments possibly overlapping
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Non-overlapping segments sorted by start offset
+    """
+    ordered = sorted(segments, key=lambda s: (s["start"], s["kind"] == "insert", s["end"]))
+    merged: list[dict[str, Any]] = []
+
+    for segment in ordered:
+        previous = merged[-1] if merged else None
+        if (
+            previous is not None
+            and segment["kind"] == "replace"
+            and previous["kind"] == "replace"
+            and segment["start"] < previous["end"]
+        ):
+            previous["end"] = max(previous["end"], segment["end"])
+            if segment["reason"] not in previous["reason"]:
+                previous["reason"] = f"{previous['reason']}; {segment['reason']}"
+        elif (
+            previous is not None
+            and segment["kind"] == "insert"
+            and previous["kind"] == "insert"
+            and segment["start"] == previous["start"]
+        ):
+            previous["reason"] = f"{previous['reason']}; {segment['reason']}"
+        else:
+            merged.append(dict(segment))
+
+    return merged
+
+
+def coverage(text: str, segments: list[dict[str, Any]]) -> float:
+    """
+    Get the share of the text covered by replace segments.
+
+    Parameters
+    ----------
+    text : str
+        Full text
+    segments : List[Dict[str, Any]]
+        Non-overlapping segments
+
+    Returns
+    -------
+    float
+        Covered characters / total characters (0 for empty text)
+    """
+    if not text:
+        return 0.0
+    covered = sum(s["end"] - s["start"] for s in segments if s["kind"] == "replace")
+    return covered / len(text)
+
+
+def regenerate_segments(
+    text: str,
+    segments: list[dict[str, Any]],
+    regenerate_fn: Callable[[str, str, str, str], str],
+    context_chars: int = 300,
+) -> str:
+    """
+    Regenerate segments and stitch the results back into the text.
+
+    Parameters
+    ----------
+    text : str
+        Original text
+    segments : List[Dict[str, Any]]
+        Non-overlapping segments (see merge_segments)
+    regenerate_fn : callable
+        ``regenerate_fn(segment_text, reason, before, after) -> str`` producing
+        the replacement; ``segment_text`` is empty for insertions
+    context_chars : int, optional
+        Characters of surrounding text passed as before/after context
+
+    Returns
+    -------
+    str
+        Text with every segment replaced
+    """
+    pieces = []
+    cursor = 0
+
+    for segment in segments:
+        start, end = segment["start"], segment["end"]
+        before = text[max(0, start - context_chars) : start]
+        after = text[end : end + context_chars]
+        replacement = regenerate_fn(text[start:end], segment["reason"], before, after)
+
+        if segment["kind"] == "insert":
+            replacement = replacement.strip()
+            if start > 0 and not text[start - 1].isspace():
+                replacement = "\n\n" + replacement
+        elif text[start:end].endswith(("\n", " ")) and not replacement.endswith(("\n", " ")):
+            replacement += text[start:end][-1]
+
+        pieces.append(text[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+
+    pieces.append(text[cursor:])
+    logger.info(f"Partial regeneration: {len(segments)} segment(s) replaced")
+    return "".join(pieces)
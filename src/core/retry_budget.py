@@ -0,0 +1,250 @@
+"""
+retry_budget.py
+
+Retry Budget for Final Engine - bounds total generation effort per episode.
+
+Nested retry loops (scene_maker's MAX_LOOP around run_with_retry, six beat
+sequences each retried independently, critique validation inside every
+attempt) multiply into unbounded worst cases. A RetryBudget is created once
+per episode and passed through the pipeline; every LLM attempt spends from
+it, capping total attempts, estimated LLM tokens and wall time.
+
+Spending is prioritised by stage: lower-priority stages may only spend
+while enough of the budget remains, so a noisy critique or scene loop can
+never starve the final draft.
+
+Limits can be tuned with the RETRY_BUDGET_ATTEMPTS, RETRY_BUDGET_TOKENS and
+RETRY_BUDGET_SECONDS environment variables.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.exceptions import BudgetExhaustedException
+
+logger = logging.getLogger(__name__)
+
+# Stage priorities (lower number = more important)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+STAGE_PRIORITIES = {
+    "draft": PRIORITY_HIGH,
+    "beat": PRIORITY_NORMAL,
+    "scene": PRIORITY_NORMAL,
+    "critique": PRIORITY_LOW,
+}
+
+# Fraction of every limit held back from each priority level
+DEFAULT_RESERVES = {
+    PRIORITY_HIGH: 0.0,
+    PRIORITY_NORMAL: 0.15,
+    PRIORITY_LOW: 0.35,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the LLM token count of a text.
+
+    Uses ~3 characters per token, a middle ground between English prose
+    (~4) and Korean (~1-2), which is accurate enough for budgeting.
+
+    Parameters
+    ----------
+    text : str
+        Prompt or completion text
+
+    Returns
+    -------
+    int
+        Estimated token count
+    """
+    if not text:
+        return 0
+    return len(text) // 3 + 1
+
+
+class RetryBudget:
+    """
+    Per-episode budget of LLM attempts, tokens and wall time.
+
+    Parameters
+    ----------
+    max_attempts : int, optional
+        Maximum LLM attempts across all stages
+    max_tokens : int, optional
+        Maximum estimated prompt + completion tokens across all stages
+    max_seconds : float, optional
+        Maximum wall time since the budget was created
+    reserves : dict, optional
+        Priority → fraction of each limit that stage priority may not touch
+    clock : callable, optional
+        Monotonic time source, injectable for tests
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 60,
+        max_tokens: int = 1_500_000,
+        max_seconds: float = 1800.0,
+        reserves: dict[int, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_attempts = max_attempts
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.reserves = reserves if reserves is not None else dict(DEFAULT_RESERVES)
+        self._clock = clock
+        self._started_at = clock()
+
+        self._lock = threading.Lock()
+        self.attempts_used = 0
+        self.tokens_used = 0
+        self.stage_attempts: dict[str, int] = {}
+        self.stage_tokens: dict[str, int] = {}
+        self.denied: dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "RetryBudget":
+        """
+        Create a budget using limits from environment variables.
+
+        Returns
+        -------
+        RetryBudget
+            Budget configured from RETRY_BUDGET_* variables (or defaults)
+        """
+        return cls(
+            max_attempts=int(os.getenv("RETRY_BUDGET_ATTEMPTS", "60")),
+            max_tokens=int(os.getenv("RETRY_BUDGET_TOKENS", "1500000")),
+            max_seconds=float(os.getenv("RETRY_BUDGET_SECONDS", "1800")),
+        )
+
+    def elapsed(self) -> float:
+        """Seconds since the budget was created."""
+        return self._clock() - self._started_at
+
+    def remaining_fraction(self) -> float:
+        """
+        Get the smallest remaining fraction across attempts, tokens and time.
+
+        Returns
+        -------
+        float
+            Value between 0 (exhausted) and 1 (untouched)
+        """
+        with self._lock:
+            return self._remaining_fraction()
+
+    def _remaining_fraction(self) -> float:
+        fractions = [
+            1 - self.attempts_used / self.max_attempts,
+            1 - self.tokens_used / self.max_tokens,
+            1 - self.elapsed() / self.max_seconds,
+        ]
+        return max(0.0, min(fractions))
+
+    def _priority(self, stage: str) -> int:
+        return STAGE_PRIORITIES.get(stage, PRIORITY_NORMAL)
+
+    def can_spend(self, stage: str) -> bool:
+        """
+        Check whether a stage may start another attempt.
+
+        Parameters
+        ----------
+        stage : str
+            Pipeline stage ("draft", "beat", "scene", "critique", ...)
+
+        Returns
+        -------
+        bool
+            True if the remaining budget is above the stage's reserve
+        """
+        with self._lock:
+            return self._can_spend(stage)
+
+    def _can_spend(self, stage: str) -> bool:
+        # A stage may use everything except its priority's reserve
+        share = 1 - self.reserves.get(self._priority(stage), 0.0)
+        attempt_allowance = math.floor(self.max_attempts * share + 1e-9)
+        return (
+            self.attempts_used < attempt_allowance
+            and self.tokens_used < self.max_tokens * share
+            and self.elapsed() < self.max_seconds * share
+        )
+
+    def spend_attempt(self, stage: str) -> None:
+        """
+        Spend one attempt for a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Pipeline stage making the attempt
+
+        Raises
+        ------
+        BudgetExhaustedException
+            If the stage may not spend any more of the budget
+        """
+        with self._lock:
+            if not self._can_spend(stage):
+                self.denied[stage] = self.denied.get(stage, 0) + 1
+                message = (
+                    f"Retry budget exhausted for stage '{stage}' "
+                    f"({self.attempts_used}/{self.max_attempts} attempts, "
+                    f"{self.tokens_used}/{self.max_tokens} tokens, "
+                    f"{self.elapsed():.1f}/{self.max_seconds:.0f}s)"
+                )
+                logger.warning(message)
+                raise BudgetExhaustedException(message, stage=stage)
+            self.attempts_used += 1
+            self.stage_attempts[stage] = self.stage_attempts.get(stage, 0) + 1
+
+    def charge_tokens(self, stage: str, tokens: int) -> None:
+        """
+        Record LLM tokens used by a stage.
+
+        Tokens are charged after the call, so the final call may overshoot
+        the limit; the next attempt is then refused.
+
+        Parameters
+        ----------
+        stage : str
+            Pipeline stage that made the call
+        tokens : int
+            Token count (see estimate_tokens)
+        """
+        with self._lock:
+            self.tokens_used += tokens
+            self.stage_tokens[stage] = self.stage_tokens.get(stage, 0) + tokens
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Get a snapshot of budget usage.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Totals, per-stage usage and denied attempt counts
+        """
+        with self._lock:
+            return {
+                "attempts_used": self.attempts_used,
+                "max_attempts": self.max_attempts,
+                "tokens_used": self.tokens_used,
+                "max_tokens": self.max_tokens,
+                "elapsed": self.elapsed(),
+                "max_seconds": self.max_seconds,
+                "stage_attempts": dict(self.stage_attempts),
+                "stage_tokens": dict(self.stage_tokens),
+                "denied": dict(self.denied),
+            }
@@ -4,9 +4,12 @@ retry_controller.py
 Retry Controller for Final Engine - handles automatic retry of failed guards.
 
 Provides retry functionality for guards that raise RetryException, with
-exponential backoff and error message collection.
+exponential backoff and error message collection. ``run_with_retry`` wraps
+synchronous callables; ``arun_with_retry`` awaits coroutines and backs off
+with ``asyncio.sleep`` so concurrent generations don't hold a thread each.
 """
 
+import asyncio
 import logging
 import os
 import time
@@ -54,8 +57,6 @@ def run_with_retry(func, *args, max_retry=2, **kwargs) -> Any:
     ...     pass
     >>> result = run_with_retry(guard_function, "some text", max_retry=2)
     """
-    unit_test_mode = os.getenv("UNIT_TEST_MODE") == "1"
-
     messages = []
 
     func_name = getattr(func, "__name__", str(func))
@@ -72,30 +73,137 @@ def run_with_retry(func, *args, max_retry=2, **kwargs) -> Any:
 
             if attempt == max_retry:
                 # Final attempt failed - raise combined exception
-                guard_name = getattr(e, "guard_name", None) or func_name
-                # Check if we should use old format (for backward compatibility with tests)
-                if unit_test_mode:
-                    # Use old combined message format for tests
-                    combined_message = "; ".join(messages)
-                else:
-                    # Use new summary format for production
-                    combined_message = f"{guard_name} failed after {max_retry + 1} attempts"
-
-                logger.error(
-                    f"Retry Controller: {func_name} failed after {max_retry + 1} attempts: {'; '.join(messages)}"
-                )
-
-                raise RetryException(
-                    message=combined_message,
-                    flags=getattr(e, "flags", {}),
-                    guard_name=guard_name,
-                ) from e
+                raise _combine_failures(e, messages, func_name, max_retry) from e
 
             # Wait before next retry with exponential backoff
-            backoff = 0.5 * (attempt + 1)
+            backoff = _backoff_seconds(attempt)
             logger.info(f"Waiting {backoff}s before retry")
             time.sleep(backoff)
         except Exception as e:
             # Non-RetryException errors are not retried
             logger.error(f"Retry Controller: {func_name} failed with non-retry error: {e}")
             raise
+
+
+async def arun_with_retry(func, *args, max_retry=2, **kwargs) -> Any:
+    """
+    Await a coroutine function with automatic retry on RetryException.
+
+    Async counterpart of ``run_with_retry``: same attempt count, backoff
+    schedule and combined RetryException message (including the
+    UNIT_TEST_MODE format), but waits with ``asyncio.sleep`` so the event
+    loop keeps serving other generations while this one backs off.
+
+    Cancellation is never retried: ``asyncio.CancelledError`` raised while
+    awaiting ``func`` or while backing off propagates immediately.
+
+    Parameters
+    ----------
+    func : callable
+        Coroutine function (or any callable returning an awaitable)
+    *args : tuple
+        Positional arguments to pass to func
+    max_retry : int, optional
+        Maximum number of retries (default: 2, meaning total 3 attempts)
+    **kwargs : dict
+        Keyword arguments to pass to func
+
+    Returns
+    -------
+    Any
+        Result of the first successful await
+
+    Raises
+    ------
+    RetryException
+        Final exception with combined error messages if all attempts fail
+    asyncio.CancelledError
+        If the surrounding task is cancelled
+    Exception
+        Non-RetryException errors are propagated immediately without retry
+
+    Examples
+    --------
+    >>> async def generate(beat):
+    ...     ...
+    >>> scenes = await arun_with_retry(generate, beat, max_retry=2)
+    """
+    messages = []
+
+    func_name = getattr(func, "__name__", str(func))
+
+    for attempt in range(max_retry + 1):
+        try:
+            logger.info(
+                f"Retry Controller: Executing {func_name} (attempt {attempt + 1}/{max_retry + 1})"
+            )
+            return await func(*args, **kwargs)
+        except RetryException as e:
+            messages.append(str(e))
+            logger.info(f"Retry Controller: {func_name} retry {attempt + 1}/{max_retry + 1}: {e}")
+
+            if attempt == max_retry:
+                raise _combine_failures(e, messages, func_name, max_retry) from e
+
+            backoff = _backoff_seconds(attempt)
+            logger.info(f"Waiting {backoff}s before retry")
+            try:
+                await asyncio.sleep(backoff)
+            except asyncio.CancelledError:
+                logger.info(f"Retry Controller: {func_name} cancelled during backoff")
+                raise
+        except asyncio.CancelledError:
+            logger.info(f"Retry Controller: {func_name} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Retry Controller: {func_name} failed with non-retry error: {e}")
+            raise
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Return the linear backoff delay used after the given (0-based) attempt."""
+    return 0.5 * (attempt + 1)
+
+
+def _combine_failures(
+    last_error: RetryException, messages: list[str], func_name: str, max_retry: int
+) -> RetryException:
+    """
+    Build the final RetryException raised once all attempts are exhausted.
+
+    Parameters
+    ----------
+    last_error : RetryException
+        Exception raised by the final attempt
+    messages : list[str]
+        String form of every attempt's exception, in order
+    func_name : str
+        Name of the retried callable, used when the guard name is unknown
+    max_retry : int
+        Configured retry count
+
+    Returns
+    -------
+    RetryException
+        Exception carrying the combined message, last flags and guard name
+    """
+    unit_test_mode = os.getenv("UNIT_TEST_MODE") == "1"
+    guard_name = getattr(last_error, "guard_name", None) or func_name
+
+    # Check if we should use old format (for backward compatibility with tests)
+    if unit_test_mode:
+        # Use old combined message format for tests
+        combined_message = "; ".join(messages)
+    else:
+        # Use new summary format for production
+        combined_message = f"{guard_name} failed after {max_retry + 1} attempts"
+
+    logger.error(
+        f"Retry Controller: {func_name} failed after {max_retry + 1} attempts: {'; '.join(messages)}"
+    )
+
+    return RetryException(
+        message=combined_message,
+        flags=getattr(last_error, "flags", {}),
+        guard_name=guard_name,
+    )
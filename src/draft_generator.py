@@ -14,7 +14,16 @@ import typer
 from dotenv import load_dotenv
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 
-from src.exceptions import RetryException
+from src.core.circuit_breaker import get_circuit_breaker, guarded_critique, llm_endpoint
+from src.core.partial_regen import (
+    MAX_PARTIAL_FRACTION,
+    coverage,
+    find_failing_segments,
+    merge_segments,
+    regenerate_segments,
+)
+from src.core.retry_budget import RetryBudget, estimate_tokens
+from src.exceptions import BudgetExhaustedException, CircuitOpenException, RetryException
 from src.plugins.critique_guard import critique_guard
 
 # ─────────────────────── 기본 설정 ───────────────────────
@@ -63,6 +72,34 @@ def build_prompt(
         return f"Generate an episode draft from: {context}"
 
 
+def build_segment_prompt(
+    segment: str,
+    reason: str,
+    before: str = "",
+    after: str = "",
+    episode_number: int = 1,
+) -> str:
+    try:
+        tpl_dir = Path(__file__).resolve().parent.parent / "templates"
+        env = Environment(loader=FileSystemLoader(tpl_dir), autoescape=False)
+        tpl = env.get_template("segment_prompt.j2")
+        return tpl.render(
+            episode_number=episode_number,
+            segment=segment,
+            reason=reason,
+            before=before,
+            after=after,
+        )
+    except TemplateNotFound:
+        return (
+            f"[Fallback Prompt] Rewrite this segment of episode {episode_number}.\n\n"
+            f"Reason: {reason}\n\nSegment:\n{segment}"
+        )
+    except Exception as e:
+        logger.error(f"build_segment_prompt error: {e}")
+        return f"Rewrite this segment ({reason}): {segment}"
+
+
 # ──────────────── LLM 호출 (stub/real) ────────────────
 def call_llm(prompt: str) -> str:
     # ① 유닛 테스트: 의도적 실패 → RetryException
@@ -77,11 +114,14 @@ def call_llm(prompt: str) -> str:
     from src.llm.gemini_client import GeminiClient
 
     temperature = float(os.getenv("TEMP_DRAFT", "0.7"))
-    client = GeminiClient(temperature=temperature)
 
     logger.info(f"Gemini draft… temp={temperature}")
-    result = client.generate(prompt)
-    return result
+    # complete()는 실패 시 예외 → 회로 차단기가 장애로 집계
+    try:
+        return GeminiClient(temperature=temperature).complete(prompt)
+    except Exception as e:
+        logger.error(f"LLM call failed: {e}")
+        raise RetryException(f"LLM generation failed: {str(e)}", guard_name="llm_call") from e
 
 
 # ───────────────────── 후처리 ─────────────────────
@@ -102,6 +142,7 @@ def generate_draft(
     prev_summary: str = "",
     anchor_goals: str = "",
     style: dict[str, Any] | None = None,
+    budget: RetryBudget | None = None,
 ) -> str:
     # FAST 모드 즉시 반환
     if os.getenv("FAST_MODE") == "1":
@@ -123,8 +164,13 @@ def generate_draft(
     )
 
     try:
-        raw = call_llm(prompt)
-    except RetryException as e:
+        # budget: draft 단계는 최우선 순위 (다른 단계가 남긴 예약분 사용)
+        if budget is not None:
+            budget.spend_attempt("draft")
+        raw = get_circuit_breaker(llm_endpoint(), "draft").call(call_llm, prompt)
+        if budget is not None:
+            budget.charge_tokens("draft", estimate_tokens(prompt) + estimate_tokens(raw))
+    except (RetryException, CircuitOpenException, BudgetExhaustedException) as e:
         logger.warning(f"LLM unavailable: {e}, using fallback draft.")
         raw = _DUMMY_TEXT
 
@@ -134,15 +180,91 @@ def generate_draft(
 
     draft_body = _post_edit(raw)
 
-    # critique guard (실패해도 경고만)
+    # critique guard (실패해도 경고만) – critique 단계는 최저 순위, 예산·회로 차단기 적용
     try:
-        critique_guard(draft_body)
+        guarded_critique("draft_critique", draft_body, budget, critique_guard)
+    except (CircuitOpenException, BudgetExhaustedException) as e:
+        logger.warning(f"Draft critique skipped: {e}")
     except RetryException as e:
         logger.warning(f"Guard failed: {e}")
 
     return f"Episode {episode_number}\n\n[PLACEHOLDER DRAFT CONTENT]\n\n{draft_body}"
 
 
+# ──────────────── 부분 재생성 ────────────────
+# 구간 교체문 최대 길이: 원문 구간(삽입은 최소 길이)의 몇 배까지 허용
+MAX_SEGMENT_GROWTH = 3
+MIN_SEGMENT_CHARS = 200
+
+# 전체 에피소드 형태의 대체 초안 (generate_draft / GeminiClient.generate 폴백)
+_FALLBACK_HEADER = re.compile(r"^Episode \d+\s*\n")
+
+
+def _usable_replacement(segment: str, replacement: str) -> bool:
+    """Reject empty, whole-episode fallback or runaway replacements for a segment."""
+    if not replacement or _FALLBACK_HEADER.match(replacement):
+        return False
+    if "[PLACEHOLDER DRAFT CONTENT]" in replacement:
+        return False
+    return len(replacement) <= MAX_SEGMENT_GROWTH * max(len(segment), MIN_SEGMENT_CHARS)
+
+
+def repair_draft(
+    draft: str,
+    errors: list[Exception],
+    episode_number: int = 1,
+    budget: RetryBudget | None = None,
+) -> str | None:
+    """
+    Regenerate only the draft segments flagged by failed guards.
+
+    Parameters
+    ----------
+    draft : str
+        Draft that failed one or more guards
+    errors : List[Exception]
+        RetryExceptions raised by the guards
+    episode_number : int, optional
+        Episode number used in the segment prompt
+    budget : RetryBudget, optional
+        Episode retry budget; each segment spends one "draft" attempt
+
+    Returns
+    -------
+    str or None
+        Repaired draft, or None when the failures cannot be localised (or
+        cover too much of the draft) and a full regeneration is needed
+    """
+    segments = merge_segments([seg for err in errors for seg in find_failing_segments(draft, err)])
+    if not segments:
+        return None
+    if coverage(draft, segments) > MAX_PARTIAL_FRACTION:
+        logger.info("Flagged segments cover most of the draft - full regeneration needed")
+        return None
+
+    breaker = get_circuit_breaker(llm_endpoint(), "draft")
+
+    def _regenerate(segment: str, reason: str, before: str, after: str) -> str:
+        prompt = build_segment_prompt(segment, reason, before, after, episode_number)
+        try:
+            if budget is not None:
+                budget.spend_attempt("draft")
+            raw = breaker.call(call_llm, prompt)
+            if budget is not None:
+                budget.charge_tokens("draft", estimate_tokens(prompt) + estimate_tokens(raw))
+        except Exception as e:
+            # 어떤 실패든 재생성 포기 → 원문 구간 유지 (파이프라인 중단 금지)
+            logger.warning(f"Segment regeneration failed: {e}, keeping original segment.")
+            return segment
+        replacement = _post_edit(raw)
+        if not _usable_replacement(segment, replacement):
+            logger.warning("Unusable segment replacement, keeping original segment.")
+            return segment
+        return replacement
+
+    return regenerate_segments(draft, segments, _regenerate)
+
+
 # ───────────────────── Fallback ─────────────────────
 def generate_fallback_draft(context: str, episode_number: int) -> str:
     body = (
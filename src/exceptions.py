@@ -48,3 +48,91 @@ class RetryException(Exception):
             flag_info = ", ".join(f"{k}={v}" for k, v in self.flags.items())
             base_msg += f" (flags: {flag_info})"
         return base_msg
+
+
+class CircuitOpenException(Exception):
+    """
+    Exception raised when a call is rejected because its circuit is open.
+
+    Deliberately not a RetryException: retrying a short-circuited call
+    cannot succeed, so callers should go straight to their fallback.
+
+    Attributes
+    ----------
+    circuit_name : str
+        Name of the circuit breaker that rejected the call
+    """
+
+    def __init__(self, message: str, circuit_name: str = None):
+        """
+        Initialize CircuitOpenException.
+
+        Parameters
+        ----------
+        message : str
+            Human-readable error message
+        circuit_name : str, optional
+            Name of the circuit breaker that rejected the call
+        """
+        super().__init__(message)
+        self.circuit_name = circuit_name
+
+
+class BudgetExhaustedException(Exception):
+    """
+    Exception raised when a stage may not spend more of its retry budget.
+
+    Like CircuitOpenException this is not retried; callers fall back.
+
+    Attributes
+    ----------
+    stage : str
+        Pipeline stage whose attempt was refused
+    """
+
+    def __init__(self, message: str, stage: str = None):
+        """
+        Initialize BudgetExhaustedException.
+
+        Parameters
+        ----------
+        message : str
+            Human-readable error message
+        stage : str, optional
+            Pipeline stage whose attempt was refused
+        """
+        super().__init__(message)
+        self.stage = stage
+
+
+class GuardTimeoutException(Exception):
+    """
+    Exception raised when a guard exceeds its time budget.
+
+    Neither a pass nor a failure: the guard's verdict is unknown, so the
+    executor reports it with its own "timeout" outcome.
+
+    Attributes
+    ----------
+    guard_name : str
+        Name of the guard that timed out
+    timeout : float
+        Time budget in seconds that was exceeded
+    """
+
+    def __init__(self, message: str, guard_name: str = None, timeout: float = None):
+        """
+        Initialize GuardTimeoutException.
+
+        Parameters
+        ----------
+        message : str
+            Human-readable error message
+        guard_name : str, optional
+            Name of the guard that timed out
+        timeout : float, optional
+            Time budget in seconds that was exceeded
+        """
+        super().__init__(message)
+        self.guard_name = guard_name
+        self.timeout = timeout
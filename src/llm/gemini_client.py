@@ -3,6 +3,7 @@ GeminiClient
 ────────────
 * UNIT_TEST_MODE=1  →  더미 응답(빠른 테스트)
 * GOOGLE_API_KEY 가 있으면 → google-generativeai 실 호출
+* complete() 는 실패 시 예외를 던지고, generate() 는 더미 초안으로 대체
 """
 
 import os
@@ -15,6 +16,9 @@ if os.getenv("UNIT_TEST_MODE") == "1":
     class GeminiClient:  # type: ignore
         def __init__(self, *_, **__): ...
 
+        def complete(self, prompt: str) -> str:
+            return self.generate(prompt)
+
         def generate(self, prompt: str, *_, **__) -> str:
             # Guard 통과용(≥600자·action·대사 포함)
             return (
@@ -57,39 +61,44 @@ else:
             self.temperature = temperature
 
         # ────────────────────────────────────────
-        # 초안 생성
+        # 원본 호출 (실패 시 예외)
         # ────────────────────────────────────────
-        def generate(self, prompt: str, episode_number: int = 0) -> str:
-            try:
-                # 1) 스트리밍 호출
-                stream = self.model.generate_content(
-                    prompt,
-                    stream=True,
-                    generation_config={
-                        "max_output_tokens": self.max_tokens,
-                        "temperature": self.temperature,
-                    },
-                    # 가장 자주 막히는 두 카테고리만 해제
-                    safety_settings=[
-                        {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                        {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-                    ],
-                )
+        def complete(self, prompt: str) -> str:
+            # 1) 스트리밍 호출
+            stream = self.model.generate_content(
+                prompt,
+                stream=True,
+                generation_config={
+                    "max_output_tokens": self.max_tokens,
+                    "temperature": self.temperature,
+                },
+                # 가장 자주 막히는 두 카테고리만 해제
+                safety_settings=[
+                    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+                    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+                ],
+            )
 
-                # 2) chunk를 모아 완성
-                chunks: list[str] = []
-                for chunk in stream:
-                    if chunk.candidates and chunk.candidates[0].content.parts:
-                        # 모든 parts를 처리 (한 chunk에 여러 part가 있을 수 있음)
-                        for part in chunk.candidates[0].content.parts:
-                            if getattr(part, "text", None):
-                                chunks.append(part.text)
+            # 2) chunk를 모아 완성
+            chunks: list[str] = []
+            for chunk in stream:
+                if chunk.candidates and chunk.candidates[0].content.parts:
+                    # 모든 parts를 처리 (한 chunk에 여러 part가 있을 수 있음)
+                    for part in chunk.candidates[0].content.parts:
+                        if getattr(part, "text", None):
+                            chunks.append(part.text)
 
-                full_text = "".join(chunks).strip()
-                if not full_text:
-                    raise ValueError("Empty response from Gemini")
-                return full_text
+            full_text = "".join(chunks).strip()
+            if not full_text:
+                raise ValueError("Empty response from Gemini")
+            return full_text
 
+        # ────────────────────────────────────────
+        # 초안 생성
+        # ────────────────────────────────────────
+        def generate(self, prompt: str, episode_number: int = 0) -> str:
+            try:
+                return self.complete(prompt)
             except Exception as e:
                 # 3) 어떤 이유로든 실패 시 더미 초안으로 대체
                 print(f"⚠️  Gemini blocked or errored: {e} – using fallback draft")
@@ -5,14 +5,28 @@ Day 07 Integration Pipeline
 Connects Arc Outliner → Beat Planner → Scene Maker → Context Builder → Draft Generator
 """
 
+import logging
+from collections.abc import Callable
+from typing import Any
+
 import typer
 
 from .beat_planner import plan_beats
 from .context_builder import make_context
-from .core.guard_registry import get_sorted_guards
-from .exceptions import RetryException
+from .core.circuit_breaker import get_circuit_breaker, llm_endpoint
+from .core.document_analysis import DocumentAnalysis
+from .core.emotion_profiles import get_emotion_store
+from .core.guard_cache import get_result_cache
+from .core.guard_executor import execute_guards
+from .core.guard_registry import enabled_guards, load_guards
+from .core.guard_session import GuardSession, get_guard_session
+from .core.guard_stats import GuardStats
+from .core.ngram_index import get_ngram_index, ngram_hashes
+from .core.retry_budget import RetryBudget, estimate_tokens
 from .scene_maker import make_scenes
-from .utils.path_helper import data_path, ensure_project_dirs, out_path
+from .utils.path_helper import ensure_project_dirs, out_path
+
+logger = logging.getLogger(__name__)
 
 
 def create_arc_outline(episode_num: int) -> dict:
@@ -36,7 +50,12 @@ def create_arc_outline(episode_num: int) -> dict:
     }
 
 
-def run_guards_auto_registry(draft: str, episode_num: int, project: str = "default") -> None:
+def run_guards_auto_registry(
+    draft: str,
+    episode_num: int,
+    project: str = "default",
+    session: GuardSession | None = None,
+) -> dict[str, Any]:
     """
     Run all guards using auto-registry system.
 
@@ -48,78 +67,113 @@ def run_guards_auto_registry(draft: str, episode_num: int, project: str = "defau
         Episode number
     project : str, optional
         Project ID for path resolution, defaults to "default"
+    session : GuardSession, optional
+        Session providing cached guard instances; the project's shared
+        session when None
+
+    Returns
+    -------
+    Dict[str, Any]
+        Guard executor report; "failures" maps guard class name →
+        RetryException and "results" holds each guard's status
     """
-    # Import all guards to trigger registration
-    import src.plugins.anchor_guard  # noqa: F401
-    import src.plugins.critique_guard  # noqa: F401
-    import src.plugins.date_guard  # noqa: F401
-    import src.plugins.emotion_guard  # noqa: F401
-    import src.plugins.immutable_guard  # noqa: F401
-    import src.plugins.lexi_guard  # noqa: F401
-    import src.plugins.pacing_guard  # noqa: F401
-    import src.plugins.relation_guard  # noqa: F401
-    import src.plugins.rule_guard  # noqa: F401
-    import src.plugins.schedule_guard  # noqa: F401
-
-    # Get registered guards in order
-    guard_classes = get_sorted_guards()
+    # Import only the guards enabled for the project (all when unconfigured)
+    guard_classes = load_guards(enabled_guards(project))
 
-    for guard_class in guard_classes:
-        guard_name = guard_class.__name__
-        try:
-            # Create guard instance
-            guard = guard_class(project=project)
-
-            # Prepare appropriate arguments based on guard type
-            if guard_name == "LexiGuard":
-                guard.check(draft)
-            elif guard_name == "EmotionGuard":
-                # Simple implementation - compare with neutral text
-                prev_text = "This is neutral content from previous episode."
-                guard.check(prev_text, draft)
-            elif guard_name == "ScheduleGuard":
-                guard.check(episode_num)
-            elif guard_name == "ImmutableGuard":
-                # Load character data if available
-                import json
-
-                try:
-                    characters_path = data_path("characters.json", project)
-                    with open(characters_path, encoding="utf-8") as f:
-                        characters = json.load(f)
-                    guard.check(characters)
-                except FileNotFoundError:
-                    print(f"WARNING {guard_name}: No characters.json found, skipping")
-                    continue
-            elif guard_name == "DateGuard":
-                date_context = {"current_date": f"2024-{episode_num:02d}-01"}
-                guard.check(date_context, episode_num)
-            elif guard_name == "AnchorGuard":
-                guard.check(draft, episode_num)
-            elif guard_name == "RuleGuard":
-                guard.check(draft)
-            elif guard_name == "RelationGuard":
-                guard.check(episode_num)
-            elif guard_name == "PacingGuard":
-                # Simple scene segmentation for pacing analysis
-                scene_texts = [
-                    draft[: len(draft) // 3],
-                    draft[len(draft) // 3 : 2 * len(draft) // 3],
-                    draft[2 * len(draft) // 3 :],
-                ]
-                guard.check(scene_texts, episode_num)
-            elif guard_name == "CritiqueGuard":
-                guard.check(draft)
-            else:
-                print(f"WARNING Unknown guard: {guard_name}")
-                continue
+    # Tokenize the draft once; text guards share the cached analysis
+    analysis = DocumentAnalysis(draft)
 
+    # Guards are built once per project and reused until their config files change
+    if session is None:
+        session = get_guard_session(project)
+
+    jobs = {}
+    for guard_class in guard_classes:
+        job = _guard_job(guard_class, draft, analysis, episode_num, session)
+        if job is not None:
+            jobs[guard_class] = job
+
+    # Pure guards run concurrently, stateful guards are serialized and expensive
+    # guards are skipped once a cheaper guard has failed (fail-fast); every run
+    # is timed, and GUARD_PROFILE=<GuardName> writes outputs/profiles/*.prof
+    stats = GuardStats.load(project)
+    report = execute_guards(
+        jobs,
+        stats=stats,
+        episode=episode_num,
+        input_sizes={guard_class: len(draft) for guard_class in jobs},
+        profile_dir=out_path("profiles", project),
+    )
+    stats.save()
+
+    for guard_name, entry in report["results"].items():
+        logger.info(
+            f"{guard_name} episode {episode_num}: {entry['status']} in "
+            f"{entry['elapsed'] * 1000:.1f} ms wall / {entry['cpu'] * 1000:.1f} ms CPU "
+            f"({len(draft)} chars)"
+        )
+        if entry["status"] == "passed":
             print(f"PASS {guard_name}: PASSED")
-        except RetryException as e:
+        elif entry["status"] == "skipped":
+            print(f"SKIP {guard_name}: skipped (draft already failed)")
+        elif entry["status"] == "timeout":
+            print(f"TIMEOUT {guard_name}: {entry['error']}")
+        elif entry["status"] == "failed":
             # In main pipeline, we show warnings but don't halt execution
-            print(f"WARNING {guard_name} Warning: {e}")
-        except Exception as e:
-            print(f"WARNING {guard_name} Error: {e}")
+            print(f"WARNING {guard_name} Warning: {entry['error']}")
+        else:
+            print(f"WARNING {guard_name} Error: {entry['error']}")
+
+    return report
+
+
+def _guard_job(
+    guard_class: type,
+    draft: str,
+    analysis: DocumentAnalysis,
+    episode_num: int,
+    session: GuardSession,
+) -> Callable[[], dict] | None:
+    """
+    Build the zero-argument job that runs one guard against the draft.
+
+    Parameters
+    ----------
+    guard_class : type
+        Registered guard class
+    draft : str
+        Draft content to validate
+    analysis : DocumentAnalysis
+        Shared analysis of the draft
+    episode_num : int
+        Episode number
+    session : GuardSession
+        Session providing the guard instance and cached JSON files
+
+    Returns
+    -------
+    Callable or None
+        Job calling the session guard's check, or None to skip the guard
+    """
+    # Each guard builds its own check() arguments (BaseGuard.job_args)
+    try:
+        args = guard_class.job_args(draft, analysis, episode_num, session)
+    except Exception as error:
+        # Unusable inputs (e.g. invalid data files) are reported as the guard's error
+
+        def job(error: Exception = error):
+            raise error
+
+        return job
+    if args is None:
+        print(f"SKIP {guard_class.__name__}: no input for episode {episode_num}")
+        return None
+
+    # Pure guards replay cached outcomes for unchanged inputs and configuration
+    cache = get_result_cache(session.project)
+    if cache is None:
+        return lambda: session.get(guard_class).check(*args)
+    return lambda: cache.call(session.get(guard_class), *args)
 
 
 def run_pipeline(episode_num: int, project: str = "default") -> str:
@@ -144,11 +198,14 @@ def run_pipeline(episode_num: int, project: str = "default") -> str:
     if os.getenv("UNIT_TEST_MODE") == "1":
         os.environ.setdefault("FAST_MODE", "1")
 
+    # One retry budget for the whole episode bounds attempts/tokens/time across stages
+    budget = RetryBudget.from_env()
+
     # Step 1: Arc Outliner - create basic arc info
     create_arc_outline(episode_num)
 
     # Step 2: Beat Planner - generate beats (take first 3 for simplified version)
-    all_beats = plan_beats(episode_num, [], return_flat=True)  # Get flat list
+    all_beats = plan_beats(episode_num, [], return_flat=True, budget=budget)  # Get flat list
     beats = all_beats[:3]  # Take first 3 beats
 
     # Step 3: Scene Maker - generate scenes for each beat (aim for ~10 total scenes)
@@ -156,7 +213,7 @@ def run_pipeline(episode_num: int, project: str = "default") -> str:
     scenes_per_beat = [4, 3, 3]  # 4 + 3 + 3 = 10 scenes total
 
     for i, beat in enumerate(beats):
-        beat_scenes = make_scenes(beat)
+        beat_scenes = make_scenes(beat, budget=budget)
         # Take the specified number of scenes for this beat
         selected_scenes = beat_scenes[: scenes_per_beat[i]]
         all_scenes.extend(selected_scenes)
@@ -168,7 +225,12 @@ def run_pipeline(episode_num: int, project: str = "default") -> str:
     # Step 5: Draft Generator - generate final draft
     import os
 
-    from src.draft_generator import build_prompt, generate_draft  # 기존 placeholder 함수
+    from src.draft_generator import (  # 기존 placeholder 함수
+        build_prompt,
+        generate_draft,
+        generate_fallback_draft,
+        repair_draft,
+    )
     from src.llm.gemini_client import GeminiClient
 
     prompt = build_prompt(
@@ -181,9 +243,18 @@ def run_pipeline(episode_num: int, project: str = "default") -> str:
     )
 
     if os.getenv("UNIT_TEST_MODE") == "1" or os.getenv("GOOGLE_API_KEY") is None:
-        draft = generate_draft(context, episode_num)  # 빠른 더미
+        draft = generate_draft(context, episode_num, budget=budget)  # 빠른 더미
     else:
-        draft = GeminiClient().generate(prompt)  # 실제 초안
+        try:
+            budget.spend_attempt("draft")
+            # complete() raises on API errors so outages count against the circuit
+            draft = get_circuit_breaker(llm_endpoint(), "draft").call(
+                lambda: GeminiClient().complete(prompt)  # 실제 초안
+            )
+            budget.charge_tokens("draft", estimate_tokens(prompt) + estimate_tokens(draft))
+        except Exception as e:
+            print(f"WARNING {e}")
+            draft = generate_fallback_draft(context, episode_num)
 
     # Step 5.5: Vector Store - save scene embeddings
     try:
@@ -210,7 +281,62 @@ def run_pipeline(episode_num: int, project: str = "default") -> str:
 
     # Step 6: Guard Chain - Quality checks using auto-registry
     print("RUNNING Guard Chain (Auto-Registry)...")
-    run_guards_auto_registry(draft, episode_num, project)
+    report = run_guards_auto_registry(draft, episode_num, project)
+    failures = report["failures"]
+
+    # Step 6.5: Partial regeneration - rewrite only the flagged segments, then re-check
+    if failures:
+        repaired = repair_draft(draft, list(failures.values()), episode_num, budget=budget)
+        if repaired is not None and repaired != draft:
+            print(f"REPAIRING {len(failures)} guard failure(s) with partial regeneration...")
+            # A rewrite can break guards that passed before, so the whole chain
+            # runs again; cached results keep the unchanged pure guards cheap
+            repaired_failures = run_guards_auto_registry(repaired, episode_num, project)["failures"]
+            # Guards skipped or timed out on the first pass never checked the
+            # original draft, so only a passed → failed change counts as broken
+            passed = {
+                name for name, entry in report["results"].items() if entry["status"] == "passed"
+            }
+            broken = passed & set(repaired_failures)
+            if broken:
+                print(
+                    f"WARNING Repair broke {', '.join(sorted(broken))}; keeping the original draft"
+                )
+            else:
+                draft, failures = repaired, repaired_failures
+                print(f"REPAIRED draft: {len(failures)} guard failure(s) remaining")
+
+    # Step 6.6: Season repetition - score against earlier episodes, then index this one
+    season_index = get_ngram_index(project)
+    if season_index is not None:
+        # Hash the draft once for scoring and indexing
+        hashed = ngram_hashes(draft)
+        repetition = season_index.score(draft, exclude_episode=episode_num, hashed=hashed)
+        print(
+            f"SEASON {repetition['repeated']}/{repetition['ngrams']} n-grams "
+            f"({repetition['rate']:.1%}) already used in earlier episodes"
+        )
+        for phrase in repetition["phrases"]:
+            logger.info(f"Repeated phrase ({phrase['episodes']} episodes): {phrase['text']}")
+        season_index.add_episode(episode_num, draft, hashed=hashed)
+
+    # Per-episode state is only kept for the guards the project enables
+    enabled = enabled_guards(project)
+
+    # Step 6.7: Emotion profile - store this episode's vectors for the next transition check
+    if enabled is None or "EmotionGuard" in enabled:
+        get_emotion_store(project).put(episode_num, draft)
+
+    # Step 6.8: Pacing history - record this episode's ratios for the rolling baseline
+    if enabled is None or "PacingGuard" in enabled:
+        for guard_class in load_guards(["PacingGuard"]):
+            get_guard_session(project).get(guard_class).record_history(draft, episode_num)
+
+    usage = budget.summary()
+    print(
+        f"BUDGET {usage['attempts_used']}/{usage['max_attempts']} attempts, "
+        f"{usage['tokens_used']}/{usage['max_tokens']} tokens, {usage['elapsed']:.1f}s"
+    )
 
     # Add context information to the result with episode number
     context_summary = f"Generated from {len(scene_descriptions)} scenes across {len(beats)} beats ({len(draft)} characters)"
@@ -2,4 +2,24 @@
 plugins package
 
 Quality guard plugins for the Final Engine.
+
+GUARD_MANIFEST maps each built-in guard to the module registering it. Guard
+modules are imported lazily by ``load_guards`` only when their guard is
+enabled, so this package must not import them itself. Third-party guards are
+discovered through the "final_engine.guards" entry-point group instead of
+being added here.
 """
+
+# Guard class name → module registering it, in registry order
+GUARD_MANIFEST: dict[str, str] = {
+    "DateGuard": "src.plugins.date_guard",
+    "AnchorGuard": "src.plugins.anchor_guard",
+    "RuleGuard": "src.plugins.rule_guard",
+    "LexiGuard": "src.plugins.lexi_guard",
+    "ScheduleGuard": "src.plugins.schedule_guard",
+    "EmotionGuard": "src.plugins.emotion_guard",
+    "ImmutableGuard": "src.plugins.immutable_guard",
+    "RelationGuard": "src.plugins.relation_guard",
+    "PacingGuard": "src.plugins.pacing_guard",
+    "CritiqueGuard": "src.plugins.critique_guard",
+}
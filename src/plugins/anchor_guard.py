@@ -6,17 +6,162 @@ Anchor Guard for Final Engine - validates anchor events appear within expected e
 Monitors anchors.json for core story events and ensures they appear within
 the specified episode range (anchor_ep ± 1). Raises RetryException if
 anchor events are missing from expected episodes.
+
+Anchors are compiled once when loaded into an AnchorIndex. The index maps
+each episode to the anchors active in it, with their keywords already
+extracted. On first use, the keywords of an episode's active anchors are
+compiled into one keyword automaton: a prefix-trie regex finds candidate
+positions and a dict trie lists every keyword starting there. A check
+therefore costs O(active anchors + text length) however many anchors the
+season has.
 """
 
 import json
+import math
 import re
 from pathlib import Path
 from typing import Any
 
+from src.core.document_analysis import DocumentAnalysis, as_analysis
 from src.core.guard_registry import BaseGuard, register_guard
 from src.exceptions import RetryException
+from src.text import content_words, trie_pattern
 from src.utils.path_helper import data_path
 
+# Episodes before and after anchor_ep in which an anchor may appear
+ANCHOR_WINDOW = 1
+
+
+def goal_keywords(goal: str) -> list[str]:
+    """
+    Extract meaningful keywords from an anchor goal for searching.
+
+    Parameters
+    ----------
+    goal : str
+        Anchor goal description
+
+    Returns
+    -------
+    List[str]
+        Root words of the goal with particles and stop words removed, or
+        the whole goal if it has none
+    """
+    return list(content_words(goal)) or [goal]
+
+
+class AnchorIndex:
+    """
+    Anchors compiled for lookup by episode and a single keyword scan.
+
+    Parameters
+    ----------
+    anchors : List[Dict[str, Any]]
+        Anchor dictionaries with id, goal and anchor_ep fields; anchors
+        without a goal or numeric anchor_ep are ignored
+    """
+
+    def __init__(self, anchors: list[dict[str, Any]]):
+        self.anchors = anchors
+        self.entries: list[dict[str, Any]] = []
+        self._by_episode: dict[int, list[int]] = {}
+        self._automata: dict[int, tuple[re.Pattern, dict, int]] = {}
+        for anchor in anchors:
+            goal = anchor.get("goal", "")
+            anchor_ep = anchor.get("anchor_ep")
+            # Skip anchors with missing required fields
+            if not goal or not isinstance(anchor_ep, int | float):
+                continue
+
+            keywords = goal_keywords(goal)
+            for episode in range(
+                math.ceil(anchor_ep - ANCHOR_WINDOW), math.floor(anchor_ep + ANCHOR_WINDOW) + 1
+            ):
+                self._by_episode.setdefault(episode, []).append(len(self.entries))
+            self.entries.append(
+                {
+                    "id": anchor.get("id", "unknown"),
+                    "goal": goal,
+                    "anchor_ep": anchor_ep,
+                    "keywords": keywords,
+                }
+            )
+
+    def active(self, episode_num: int) -> list[dict[str, Any]]:
+        """
+        Get the anchors expected around an episode.
+
+        Parameters
+        ----------
+        episode_num : int
+            Current episode number
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            Anchors (id, goal, anchor_ep, keywords) with episode_num within
+            anchor_ep ± ANCHOR_WINDOW, in file order
+        """
+        return [self.entries[i] for i in self._by_episode.get(episode_num, [])]
+
+    def _automaton(self, episode_num: int) -> tuple[re.Pattern, dict, int]:
+        """Keyword automaton of an episode's active anchors, built on first use."""
+        automaton = self._automata.get(episode_num)
+        if automaton is None:
+            keywords = {
+                keyword.lower()
+                for entry in self.active(episode_num)
+                for keyword in entry["keywords"]
+            }
+            trie: dict = {}
+            for keyword in keywords:
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node[""] = keyword
+            automaton = (
+                re.compile(trie_pattern(keywords)),
+                trie,
+                max(map(len, keywords), default=0),
+            )
+            self._automata[episode_num] = automaton
+        return automaton
+
+    def found_keywords(self, text_lower: str, episode_num: int) -> set[str]:
+        """
+        Find the keywords of an episode's active anchors in a text.
+
+        Parameters
+        ----------
+        text_lower : str
+            Lowercased text
+        episode_num : int
+            Current episode number
+
+        Returns
+        -------
+        Set[str]
+            Lowercased keywords occurring in the text, overlapping
+            occurrences included
+        """
+        prefilter, trie, longest = self._automaton(episode_num)
+        found: set[str] = set()
+        position = 0
+        while True:
+            candidate = prefilter.search(text_lower, position)
+            if candidate is None:
+                return found
+            start = candidate.start()
+            # All keywords starting here, e.g. both "주인" and "주인공"
+            node = trie
+            for char in text_lower[start : start + longest]:
+                node = node.get(char)
+                if node is None:
+                    break
+                if "" in node:
+                    found.add(node[""])
+            position = start + 1
+
 
 @register_guard(order=2)
 class AnchorGuard(BaseGuard):
@@ -52,6 +197,19 @@ class AnchorGuard(BaseGuard):
         else:
             self.anchors_path = Path(anchors_path)
         self.anchors = self._load_anchors()
+        self._index = AnchorIndex(self.anchors)
+
+    def config_paths(self) -> list[Path]:
+        """Configuration files loaded at construction time."""
+        return [Path(self.anchors_path)]
+
+    @property
+    def index(self) -> AnchorIndex:
+        """Compiled index of the current anchors."""
+        # Anchors replaced after construction are compiled again
+        if self._index.anchors is not self.anchors:
+            self._index = AnchorIndex(self.anchors)
+        return self._index
 
     def _load_anchors(self) -> list[dict[str, Any]]:
         """
@@ -95,7 +253,7 @@ class AnchorGuard(BaseGuard):
         bool
             True if episode is within anchor_ep ± 1 range
         """
-        return abs(episode_num - anchor_ep) <= 1
+        return abs(episode_num - anchor_ep) <= ANCHOR_WINDOW
 
     def _extract_keywords_from_goal(self, goal: str) -> list[str]:
         """
@@ -111,50 +269,17 @@ class AnchorGuard(BaseGuard):
         List[str]
             List of keywords to search for
         """
-        # Remove common stop words and extract meaningful terms
-        stop_words = {
-            "이",
-            "가",
-            "를",
-            "을",
-            "의",
-            "에",
-            "와",
-            "과",
-            "로",
-            "으로",
-            "는",
-            "은",
-            "한다",
-            "다",
-            "고",
-            "도",
-        }
-
-        # Split goal into words and filter out stop words and short words
-        words = re.findall(r"\b\w+\b", goal)
-
-        # Remove Korean particles and suffixes to extract root words
-        cleaned_words = []
-        for word in words:
-            # Remove common Korean particles/suffixes
-            cleaned_word = re.sub(r"(이|가|를|을|의|에|와|과|로|으로|는|은|다)$", "", word)
-            if len(cleaned_word) >= 2 and cleaned_word not in stop_words:
-                cleaned_words.append(cleaned_word)
-
-        # If no meaningful keywords found, use the whole goal
-        if not cleaned_words:
-            cleaned_words = [goal]
+        return goal_keywords(goal)
 
-        return cleaned_words
-
-    def _search_keywords_in_content(self, content: str, keywords: list[str]) -> bool:
+    def _search_keywords_in_content(
+        self, content: str | DocumentAnalysis, keywords: list[str]
+    ) -> bool:
         """
         Search for keywords in episode content.
 
         Parameters
         ----------
-        content : str
+        content : str or DocumentAnalysis
             Episode content to search in
         keywords : List[str]
             Keywords to search for
@@ -164,10 +289,12 @@ class AnchorGuard(BaseGuard):
         bool
             True if any keyword is found in content
         """
-        if not content:
+        analysis = as_analysis(content)
+        if not analysis.text:
             return False
 
-        content_lower = content.lower()
+        # Lowercased once per analysis, shared by every anchor
+        content_lower = analysis.lower_text
 
         # Check if any keyword appears in the content
         for keyword in keywords:
@@ -176,13 +303,18 @@ class AnchorGuard(BaseGuard):
 
         return False
 
-    def check(self, episode_content: str, episode_num: int) -> dict[str, Any]:
+    @classmethod
+    def job_args(cls, draft, analysis, episode_num, session):
+        """Check the shared analysis against the anchors of the episode."""
+        return (analysis, episode_num)
+
+    def check(self, episode_content: str | DocumentAnalysis, episode_num: int) -> dict[str, Any]:
         """
         Check anchor compliance for the given episode.
 
         Parameters
         ----------
-        episode_content : str
+        episode_content : str or DocumentAnalysis
             Content of the current episode
         episode_num : int
             Current episode number
@@ -204,34 +336,25 @@ class AnchorGuard(BaseGuard):
             "missing_anchors": [],
         }
 
-        # Check each anchor
-        for anchor in self.anchors:
-            anchor_id = anchor.get("id", "unknown")
-            goal = anchor.get("goal", "")
-            anchor_ep = anchor.get("anchor_ep")
-
-            # Skip anchors with missing required fields
-            if anchor_ep is None or not goal:
-                continue
-
-            # Only check anchors that should appear in this episode range
-            if self._is_episode_in_range(episode_num, anchor_ep):
-                keywords = self._extract_keywords_from_goal(goal)
-                found = self._search_keywords_in_content(episode_content, keywords)
+        # Only anchors expected in this episode range, from the precompiled index
+        active = self.index.active(episode_num)
+        if active:
+            analysis = as_analysis(episode_content)
+            found_keywords = (
+                self.index.found_keywords(analysis.lower_text, episode_num)
+                if analysis.text
+                else set()
+            )
 
-                anchor_check = {
-                    "id": anchor_id,
-                    "goal": goal,
-                    "anchor_ep": anchor_ep,
-                    "keywords": keywords,
-                    "found": found,
-                }
+        for anchor in active:
+            found = any(keyword.lower() in found_keywords for keyword in anchor["keywords"])
+            anchor_check = {**anchor, "keywords": list(anchor["keywords"]), "found": found}
 
-                results["anchors_checked"].append(anchor_check)
+            results["anchors_checked"].append(anchor_check)
 
-                if not found:
-                    results["missing_anchors"].append(anchor_check)
-                    results["passed"] = False
+            if not found:
+                results["missing_anchors"].append(anchor_check)
+                results["passed"] = False
 
         # If any anchors are missing, raise RetryException
         if not results["passed"]:
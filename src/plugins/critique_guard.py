@@ -15,7 +15,7 @@ def _get_min_score(override: float | None = None) -> float:
 
 
 # ---------- 메인 Guard ----------
-@register_guard(order=10)
+@register_guard(order=10, resources=("llm",), cost=2000.0)
 class CritiqueGuard(BaseGuard):
     def __init__(
         self,
@@ -26,6 +26,15 @@ class CritiqueGuard(BaseGuard):
         self.min_score = min_score
         self.project = project
 
+    def cache_params(self) -> dict[str, Any]:
+        """Threshold and critique backend (stub/fallback results must not be reused)."""
+        return {
+            "min_score": self.min_score,
+            "unit_test_mode": os.getenv("UNIT_TEST_MODE") == "1",
+            "fast_mode": os.getenv("FAST_MODE") == "1",
+            "api_key": bool(os.getenv("GOOGLE_API_KEY")),
+        }
+
     # 실제 LLM 호출은 생략/모킹
     def _call_gemini_critique(self, text: str) -> dict[str, Any]:
         """
@@ -17,7 +17,7 @@ from src.exceptions import RetryException
 from src.utils.path_helper import data_path
 
 
-@register_guard(order=1)
+@register_guard(order=1, pure=False, resources=("episode_dates.json",))
 class DateGuard(BaseGuard):
     """
     Guard that monitors chronological date progression.
@@ -147,6 +147,11 @@ class DateGuard(BaseGuard):
 
         return None
 
+    @classmethod
+    def job_args(cls, draft, analysis, episode_num, session):
+        """Check the episode against its scheduled date."""
+        return ({"current_date": f"2024-{episode_num:02d}-01"}, episode_num)
+
     def check(self, context: dict[str, Any], episode_num: int) -> dict[str, Any]:
         """
         Check for date progression violations.
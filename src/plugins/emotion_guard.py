@@ -7,14 +7,34 @@ Monitors emotion changes between text segments using 7-dimensional emotion vecto
 and cosine distance. Raises RetryException when emotional delta > 0.7.
 
 Emotion categories: joy, sadness, anger, fear, surprise, disgust, neutral
-"""
 
-import re
+Keywords are indexed once into a word → emotion-id lexicon (CSR arrays,
+since a word such as "startled" may belong to several emotions), so a text is
+classified in one pass over its tokens with ``np.bincount``. Classifications
+are memoized per text hash, so the same text is never classified twice.
+
+Texts may be given as raw strings or as a shared DocumentAnalysis. Batches
+of text pairs are classified and compared with NumPy in one pass
+(``classify_emotions_batch``, ``emotion_deltas``, ``EmotionGuard.check_many``).
+Trajectory mode (``emotion_trajectory``, ``EmotionGuard.check_trajectory``)
+checks every consecutive transition of a sequence, such as the scenes of an
+episode or the episodes of a season, from one (N×7) emotion matrix.
+"""
 
 import numpy as np
 
-from src.core.guard_registry import BaseGuard, register_guard
+from src.core.document_analysis import DocumentAnalysis, as_analysis, encode_batch
+from src.core.emotion_profiles import get_emotion_store
+from src.core.guard_registry import BaseGuard, failure_result, register_guard
 from src.exceptions import RetryException
+from src.text import lower_tokens
+from src.text.tokenizer import memoize_text
+
+# Emotion vector ordering
+EMOTION_ORDER = ["joy", "sadness", "anger", "fear", "surprise", "disgust", "neutral"]
+
+# Emotion delta above which a transition is a jump
+EMOTION_DELTA_THRESHOLD = 0.7
 
 # Emotion keyword mapping for simple classification
 EMOTION_KEYWORDS = {
@@ -241,13 +261,124 @@ EMOTION_KEYWORDS = {
 }
 
 
-def classify_emotions(text: str) -> dict[str, float]:
+def _build_lexicon() -> tuple[dict[str, int], np.ndarray, np.ndarray]:
+    """
+    Index the emotion keywords.
+
+    Returns
+    -------
+    Tuple[Dict[str, int], np.ndarray, np.ndarray]
+        Keyword → lexicon row, and CSR ``indptr`` / ``indices`` arrays listing
+        the emotion ids (EMOTION_ORDER positions) of each row once
+    """
+    emotions_of: dict[str, list[int]] = {}
+    for column, emotion in enumerate(EMOTION_ORDER):
+        for keyword in EMOTION_KEYWORDS[emotion]:
+            columns = emotions_of.setdefault(keyword, [])
+            if column not in columns:
+                columns.append(column)
+
+    rows = {keyword: row for row, keyword in enumerate(emotions_of)}
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(columns) for columns in emotions_of.values()])
+    indices = np.array([c for columns in emotions_of.values() for c in columns], dtype=np.int64)
+    return rows, indptr, indices
+
+
+_LEXICON, _LEXICON_INDPTR, _LEXICON_INDICES = _build_lexicon()
+
+
+def _emotion_counts(rows: np.ndarray, groups: np.ndarray, group_count: int) -> np.ndarray:
+    """
+    Count emotion keywords per group of tokens.
+
+    Parameters
+    ----------
+    rows : np.ndarray
+        Lexicon row of every keyword token
+    groups : np.ndarray
+        Group (text) index of every keyword token
+    group_count : int
+        Number of groups
+
+    Returns
+    -------
+    np.ndarray
+        Keyword counts of shape (group_count, 7) in EMOTION_ORDER
+    """
+    columns = len(EMOTION_ORDER)
+    widths = _LEXICON_INDPTR[rows + 1] - _LEXICON_INDPTR[rows]
+    # Expand every token to the emotion ids of its lexicon row
+    offsets = np.arange(widths.sum()) - np.repeat(np.cumsum(widths) - widths, widths)
+    emotions = _LEXICON_INDICES[np.repeat(_LEXICON_INDPTR[rows], widths) + offsets]
+    cells = np.repeat(groups, widths) * columns + emotions
+    counts = np.bincount(cells, minlength=group_count * columns)
+    return counts.reshape(group_count, columns).astype(float)
+
+
+def _emotion_scores(counts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Turn keyword counts into emotion vectors.
+
+    Parameters
+    ----------
+    counts : np.ndarray
+        Keyword counts of shape (N, 7) in EMOTION_ORDER
+    lengths : np.ndarray
+        Token count of each text, shape (N,)
+
+    Returns
+    -------
+    np.ndarray
+        Emotion vectors of shape (N, 7); zero vectors for texts without words
+    """
+    # Frequency based scores capped at 0.8 to prevent extremes, and always a
+    # significant neutral component (0.3) so vectors are mixed emotional
+    # states, which keeps cosine distances well behaved
+    has_words = lengths > 0
+    totals = np.where(has_words, lengths, 1)[:, None]
+    scores = np.where(counts > 0, np.minimum(counts / totals * 5, 0.8), 0.0)
+    neutral = EMOTION_ORDER.index("neutral")
+    scores[:, neutral] = np.maximum(scores[:, neutral], 0.3)
+
+    # Cross-emotion influences (emotional complexity), from the unsmoothed scores
+    joy, sadness, anger, fear, surprise, disgust = range(6)
+    smoothed = scores.copy()
+    smoothed[:, surprise] += scores[:, joy] * 0.1
+    smoothed[:, fear] += scores[:, sadness] * 0.1
+    smoothed[:, fear] += scores[:, anger] * 0.05
+    smoothed[:, disgust] += scores[:, anger] * 0.05
+    smoothed[:, sadness] += scores[:, fear] * 0.1
+    smoothed = np.minimum(smoothed, 1.0)
+
+    # No emotional content → fully neutral; no words at all → zero vector
+    fully_neutral = scores[:, :neutral].sum(axis=1) == 0
+    smoothed[fully_neutral] = 0.0
+    smoothed[fully_neutral, neutral] = 1.0
+    smoothed[~has_words] = 0.0
+    return smoothed
+
+
+@memoize_text
+def _classify(text: str) -> tuple[float, ...]:
+    """Emotion vector of a text in EMOTION_ORDER, memoized per text hash."""
+    if not text.strip():
+        return (0.0,) * len(EMOTION_ORDER)
+
+    words = lower_tokens(text)
+    rows = np.fromiter((_LEXICON.get(word, -1) for word in words), dtype=np.int64, count=len(words))
+    rows = rows[rows >= 0]
+    counts = _emotion_counts(rows, np.zeros(len(rows), dtype=np.int64), 1)
+    return tuple(_emotion_scores(counts, np.array([len(words)]))[0].tolist())
+
+
+def classify_emotions(text: str | DocumentAnalysis) -> dict[str, float]:
     """
     Classify emotions in text using keyword-based approach.
 
     Parameters
     ----------
-    text : str
+    text : str or DocumentAnalysis
         Input text to analyze
 
     Returns
@@ -255,65 +386,7 @@ def classify_emotions(text: str) -> dict[str, float]:
     Dict[str, float]
         Dictionary mapping emotion names to scores (0-1)
     """
-    if not text.strip():
-        # Empty text is considered neutral
-        return dict.fromkeys(EMOTION_KEYWORDS.keys(), 0.0)
-
-    # Clean and tokenize text
-    words = re.findall(r"\b\w+\b", text.lower())
-    if not words:
-        return dict.fromkeys(EMOTION_KEYWORDS.keys(), 0.0)
-
-    # Count emotion keywords
-    emotion_counts = dict.fromkeys(EMOTION_KEYWORDS.keys(), 0)
-    total_words = len(words)
-
-    for word in words:
-        for emotion, keywords in EMOTION_KEYWORDS.items():
-            if word in keywords:
-                emotion_counts[emotion] += 1
-
-    # Calculate raw emotion scores
-    emotion_scores = {}
-    for emotion, count in emotion_counts.items():
-        if count > 0:
-            # Score based on frequency, but cap it to prevent extremes
-            score = min(count / total_words * 5, 0.8)  # Max score of 0.8
-            emotion_scores[emotion] = score
-        else:
-            emotion_scores[emotion] = 0.0
-
-    # Always add significant neutral component to create mixed emotional states
-    # This prevents pure single-emotion vectors which cause cosine distance issues
-    base_neutral = 0.3
-    emotion_scores["neutral"] = max(emotion_scores["neutral"], base_neutral)
-
-    # If no emotional content found, make it fully neutral
-    if sum(emotion_scores[e] for e in emotion_scores if e != "neutral") == 0:
-        emotion_scores = dict.fromkeys(EMOTION_KEYWORDS.keys(), 0.0)
-        emotion_scores["neutral"] = 1.0
-        return emotion_scores
-
-    # Smooth the scores to prevent extreme values
-    # Add small amounts of related emotions to create more realistic profiles
-    smoothed_scores = emotion_scores.copy()
-
-    # Add cross-emotion influences (emotional complexity)
-    if emotion_scores["joy"] > 0:
-        smoothed_scores["surprise"] += emotion_scores["joy"] * 0.1
-    if emotion_scores["sadness"] > 0:
-        smoothed_scores["fear"] += emotion_scores["sadness"] * 0.1
-    if emotion_scores["anger"] > 0:
-        smoothed_scores["fear"] += emotion_scores["anger"] * 0.05
-        smoothed_scores["disgust"] += emotion_scores["anger"] * 0.05
-    if emotion_scores["fear"] > 0:
-        smoothed_scores["sadness"] += emotion_scores["fear"] * 0.1
-
-    # Normalize to prevent values from going over 1.0
-    for emotion in smoothed_scores:
-        smoothed_scores[emotion] = min(smoothed_scores[emotion], 1.0)
-
-    return smoothed_scores
+    return dict(zip(EMOTION_ORDER, _classify(as_analysis(text).text), strict=True))
 
 
 def emotions_to_vector(emotion_scores: dict[str, float]) -> np.ndarray:
@@ -331,16 +404,7 @@ def emotions_to_vector(emotion_scores: dict[str, float]) -> np.ndarray:
         7-dimensional emotion vector
     """
     # Ensure consistent ordering
-    emotion_order = [
-        "joy",
-        "sadness",
-        "anger",
-        "fear",
-        "surprise",
-        "disgust",
-        "neutral",
-    ]
-    vector = np.array([emotion_scores.get(emotion, 0.0) for emotion in emotion_order])
+    vector = np.array([emotion_scores.get(emotion, 0.0) for emotion in EMOTION_ORDER])
     return vector
 
 
@@ -386,15 +450,17 @@ def cosine_delta(v1: np.ndarray, v2: np.ndarray) -> float:
     return cosine_delta_value
 
 
-def calculate_emotion_delta(prev_text: str, curr_text: str) -> float:
+def calculate_emotion_delta(
+    prev_text: str | DocumentAnalysis, curr_text: str | DocumentAnalysis
+) -> float:
     """
     Calculate emotion delta between two text segments.
 
     Parameters
     ----------
-    prev_text : str
+    prev_text : str or DocumentAnalysis
         Previous text segment
-    curr_text : str
+    curr_text : str or DocumentAnalysis
         Current text segment
 
     Returns
@@ -402,10 +468,27 @@ def calculate_emotion_delta(prev_text: str, curr_text: str) -> float:
     float
         Emotion delta value (0-2)
     """
-    # Classify emotions in both texts
-    prev_emotions = classify_emotions(prev_text)
-    curr_emotions = classify_emotions(curr_text)
+    return emotion_delta_from_scores(classify_emotions(prev_text), classify_emotions(curr_text))
+
+
+def emotion_delta_from_scores(
+    prev_emotions: dict[str, float], curr_emotions: dict[str, float]
+) -> float:
+    """
+    Calculate emotion delta between two already classified emotion profiles.
 
+    Parameters
+    ----------
+    prev_emotions : Dict[str, float]
+        Emotion scores of the previous segment (see classify_emotions)
+    curr_emotions : Dict[str, float]
+        Emotion scores of the current segment
+
+    Returns
+    -------
+    float
+        Emotion delta value (0-2)
+    """
     # Convert to vectors
     prev_vector = emotions_to_vector(prev_emotions)
     curr_vector = emotions_to_vector(curr_emotions)
@@ -435,16 +518,132 @@ def calculate_emotion_delta(prev_text: str, curr_text: str) -> float:
     return delta
 
 
-def check_emotion_guard(prev_text: str, curr_text: str) -> dict[str, any]:
+def classify_emotions_batch(texts: list[str | DocumentAnalysis]) -> np.ndarray:
+    """
+    Classify emotions of many texts at once.
+
+    Tokens of all texts are mapped onto one shared vocabulary, each
+    vocabulary word is looked up in the lexicon once, and the per-text
+    counts and scores are computed with NumPy. Rows equal
+    ``emotions_to_vector(classify_emotions(text))``.
+
+    Parameters
+    ----------
+    texts : List[str or DocumentAnalysis]
+        Texts to analyze
+
+    Returns
+    -------
+    np.ndarray
+        Matrix of shape (len(texts), 7) in EMOTION_ORDER
+    """
+    vocab, ids, doc, lengths = encode_batch(texts)
+    if not len(ids):
+        return np.zeros((len(lengths), len(EMOTION_ORDER)))
+
+    # Lexicon row per vocabulary word, then keyword counts per text
+    vocab_rows = np.array([_LEXICON.get(word, -1) for word in vocab], dtype=np.int64)
+    rows = vocab_rows[ids]
+    keyword = rows >= 0
+    counts = _emotion_counts(rows[keyword], doc[keyword], len(lengths))
+    return _emotion_scores(counts, lengths)
+
+
+def emotion_deltas(prev_vectors: np.ndarray, curr_vectors: np.ndarray) -> np.ndarray:
+    """
+    Calculate emotion deltas between matching rows of two emotion matrices.
+
+    Vectorized equivalent of emotion_delta_from_scores (up to floating
+    point rounding), including the amplification of neutral-to-emotion
+    transitions.
+
+    Parameters
+    ----------
+    prev_vectors : np.ndarray
+        Previous emotion vectors, shape (N, 7) in EMOTION_ORDER
+    curr_vectors : np.ndarray
+        Current emotion vectors, shape (N, 7)
+
+    Returns
+    -------
+    np.ndarray
+        Emotion delta values (0-2), shape (N,)
+    """
+    prev_vectors = np.atleast_2d(prev_vectors)
+    curr_vectors = np.atleast_2d(curr_vectors)
+
+    # Cosine delta; zero vectors have no delta
+    norms = np.linalg.norm(prev_vectors, axis=1) * np.linalg.norm(curr_vectors, axis=1)
+    dots = np.einsum("ij,ij->i", prev_vectors, curr_vectors)
+    nonzero = norms > 0
+    similarity = np.ones(len(norms))
+    similarity[nonzero] = np.clip(dots[nonzero] / norms[nonzero], -1.0, 1.0)
+    deltas = 1 - similarity
+
+    # Amplify neutral-to-emotion transitions (and back) with a large intensity change
+    neutral = EMOTION_ORDER.index("neutral")
+    prev_max = prev_vectors[:, :neutral].max(axis=1)
+    curr_max = curr_vectors[:, :neutral].max(axis=1)
+    transition = ((prev_vectors[:, neutral] > 0.8) & (curr_max > 0.6)) | (
+        (curr_vectors[:, neutral] > 0.8) & (prev_max > 0.6)
+    )
+    amplify = transition & (np.abs(prev_max - curr_max) > 0.5)
+    deltas[amplify] = np.minimum(deltas[amplify] * 1.2, 2.0)
+    return deltas
+
+
+def emotion_trajectory(
+    segments: list[str | DocumentAnalysis], threshold: float = EMOTION_DELTA_THRESHOLD
+) -> dict[str, np.ndarray]:
+    """
+    Classify a sequence of segments and find its emotion jumps.
+
+    All segments are classified in one batch into an (N×7) matrix, and the
+    N-1 consecutive deltas are computed in one NumPy operation.
+
+    Parameters
+    ----------
+    segments : List[str or DocumentAnalysis]
+        Segments in order, e.g. the scenes of an episode or the episodes of a season
+    threshold : float, optional
+        Delta above which a transition is a jump
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        "matrix" (N×7 emotion vectors in EMOTION_ORDER), "deltas" (N-1
+        deltas, entry i for segment i → i+1) and "jumps" (indices i of the
+        deltas above the threshold)
+    """
+    matrix = classify_emotions_batch(list(segments))
+    if len(matrix) < 2:
+        deltas = np.zeros(0)
+    else:
+        deltas = emotion_deltas(matrix[:-1], matrix[1:])
+    return {"matrix": matrix, "deltas": deltas, "jumps": np.flatnonzero(deltas > threshold)}
+
+
+def _as_emotions(segment: str | DocumentAnalysis | dict | list | tuple | np.ndarray) -> dict:
+    """Emotion scores of a text or analysis, or of an already classified vector."""
+    if isinstance(segment, dict):
+        return dict(segment)
+    if isinstance(segment, list | tuple | np.ndarray):
+        return dict(zip(EMOTION_ORDER, (float(value) for value in segment), strict=True))
+    return classify_emotions(segment)
+
+
+def check_emotion_guard(
+    prev_text: str | DocumentAnalysis | list[float], curr_text: str | DocumentAnalysis | list[float]
+) -> dict[str, any]:
     """
     Run emotion guard checks on text segments.
 
     Parameters
     ----------
-    prev_text : str
-        Previous text segment
-    curr_text : str
-        Current text segment
+    prev_text : str, DocumentAnalysis or List[float]
+        Previous text segment, or its stored emotion vector (EMOTION_ORDER)
+    curr_text : str, DocumentAnalysis or List[float]
+        Current text segment, or its emotion vector
 
     Returns
     -------
@@ -456,25 +655,49 @@ def check_emotion_guard(prev_text: str, curr_text: str) -> dict[str, any]:
     RetryException
         If emotion delta exceeds threshold
     """
+    # Classify each text once and derive the delta from the scores
+    prev_emotions = _as_emotions(prev_text)
+    curr_emotions = _as_emotions(curr_text)
+    delta = emotion_delta_from_scores(prev_emotions, curr_emotions)
+
+    results, error = _emotion_results(delta, prev_emotions, curr_emotions)
+    if error is not None:
+        raise error
+
+    return results
+
+
+def _emotion_results(
+    delta: float, prev_emotions: dict[str, float], curr_emotions: dict[str, float]
+) -> tuple[dict[str, any], RetryException | None]:
+    """
+    Build the emotion check results for a computed delta.
+
+    Parameters
+    ----------
+    delta : float
+        Emotion delta between the segments
+    prev_emotions : Dict[str, float]
+        Emotion scores of the previous segment
+    curr_emotions : Dict[str, float]
+        Emotion scores of the current segment
+
+    Returns
+    -------
+    Tuple[Dict[str, any], RetryException or None]
+        Results containing emotion delta and flags, and the exception to
+        raise if the transition fails (None if it passes)
+    """
     results = {
-        "emotion_delta": 0.0,
-        "prev_emotions": {},
-        "curr_emotions": {},
+        "emotion_delta": delta,
+        "prev_emotions": prev_emotions,
+        "curr_emotions": curr_emotions,
         "flags": {},
         "passed": True,
     }
 
-    # Calculate emotion delta
-    delta = calculate_emotion_delta(prev_text, curr_text)
-    prev_emotions = classify_emotions(prev_text)
-    curr_emotions = classify_emotions(curr_text)
-
-    results["emotion_delta"] = delta
-    results["prev_emotions"] = prev_emotions
-    results["curr_emotions"] = curr_emotions
-
     # Check threshold
-    threshold = 0.7
+    threshold = EMOTION_DELTA_THRESHOLD
     flags = {}
 
     if delta > threshold:
@@ -486,22 +709,22 @@ def check_emotion_guard(prev_text: str, curr_text: str) -> dict[str, any]:
 
     results["flags"] = flags
 
-    if flags:
-        results["passed"] = False
-        raise RetryException(message="Emotion jump", flags=flags, guard_name="emotion_guard")
+    if not flags:
+        return results, None
 
-    return results
+    results["passed"] = False
+    return results, RetryException(message="Emotion jump", flags=flags, guard_name="emotion_guard")
 
 
-def emotion_guard(prev_text: str, curr_text: str) -> bool:
+def emotion_guard(prev_text: str | DocumentAnalysis, curr_text: str | DocumentAnalysis) -> bool:
     """
     Main entry point for emotion guard check.
 
     Parameters
     ----------
-    prev_text : str
+    prev_text : str or DocumentAnalysis
         Previous text segment
-    curr_text : str
+    curr_text : str or DocumentAnalysis
         Current text segment
 
     Returns
@@ -522,7 +745,7 @@ def emotion_guard(prev_text: str, curr_text: str) -> bool:
         raise
 
 
-@register_guard(order=6)
+@register_guard(order=6, cost=2.0)
 class EmotionGuard(BaseGuard):
     """
     Emotion Guard class for emotional transition validation.
@@ -542,16 +765,34 @@ class EmotionGuard(BaseGuard):
         """
         self.project = project
 
-    def check(self, prev_text: str, curr_text: str) -> dict[str, any]:
+    @classmethod
+    def job_args(cls, draft, analysis, episode_num, session):
+        """
+        Compare the opening scene with the stored close of the previous episode.
+
+        Without a stored profile the draft is compared with neutral text.
+        """
+        previous = get_emotion_store(session.project).get(episode_num - 1)
+        if previous is None:
+            return ("This is neutral content from previous episode.", analysis)
+        opening = analysis.scenes[0] if analysis.scenes else analysis
+        return (tuple(previous["closing"]), opening)
+
+    def check(
+        self,
+        prev_text: str | DocumentAnalysis | list[float],
+        curr_text: str | DocumentAnalysis | list[float],
+    ) -> dict[str, any]:
         """
         Check for emotional transition violations.
 
         Parameters
         ----------
-        prev_text : str
-            Previous text segment
-        curr_text : str
-            Current text segment
+        prev_text : str, DocumentAnalysis or List[float]
+            Previous text segment, or its stored emotion vector (e.g. the
+            closing scene of the previous episode, see emotion_profiles)
+        curr_text : str, DocumentAnalysis or List[float]
+            Current text segment, or its emotion vector
 
         Returns
         -------
@@ -564,3 +805,115 @@ class EmotionGuard(BaseGuard):
             If emotional delta exceeds threshold
         """
         return check_emotion_guard(prev_text, curr_text)
+
+    def check_many(
+        self, batch: list[tuple[str | DocumentAnalysis, str | DocumentAnalysis]]
+    ) -> list[dict[str, any]]:
+        """
+        Check many transitions with one vectorized pass.
+
+        Each distinct text is classified once (see classify_emotions_batch),
+        so a shared previous text such as a season-wide baseline costs
+        nothing extra.
+
+        Parameters
+        ----------
+        batch : List[Tuple[str or DocumentAnalysis, str or DocumentAnalysis]]
+            (previous text, current text) pairs
+
+        Returns
+        -------
+        List[Dict[str, any]]
+            One result per pair; failing pairs have "passed" False, their
+            flags and the failure "message"
+        """
+        if not batch:
+            return []
+
+        # Classify every distinct text once
+        rows: dict[str, int] = {}
+        texts = []
+        for pair in batch:
+            for text in pair:
+                key = as_analysis(text).text
+                if key not in rows:
+                    rows[key] = len(texts)
+                    texts.append(text)
+        vectors = classify_emotions_batch(texts)
+
+        prev_rows = [rows[as_analysis(prev).text] for prev, _ in batch]
+        curr_rows = [rows[as_analysis(curr).text] for _, curr in batch]
+        deltas = emotion_deltas(vectors[prev_rows], vectors[curr_rows])
+
+        outcomes = []
+        for delta, prev_row, curr_row in zip(deltas.tolist(), prev_rows, curr_rows, strict=True):
+            results, error = _emotion_results(
+                delta,
+                dict(zip(EMOTION_ORDER, vectors[prev_row].tolist(), strict=True)),
+                dict(zip(EMOTION_ORDER, vectors[curr_row].tolist(), strict=True)),
+            )
+            outcomes.append(results if error is None else failure_result(results, error))
+        return outcomes
+
+    def check_trajectory(
+        self, segments: list[str | DocumentAnalysis] | DocumentAnalysis
+    ) -> dict[str, any]:
+        """
+        Check every consecutive transition of a sequence of segments.
+
+        Parameters
+        ----------
+        segments : List[str or DocumentAnalysis] or DocumentAnalysis
+            Segments in order (scenes, episodes); an analysis is split into
+            its scenes, and the spans of scenes entered by a jump are then
+            reported for partial regeneration
+
+        Returns
+        -------
+        Dict[str, any]
+            Check results with the per-segment emotions, consecutive deltas
+            and jump indices (i for segment i → i+1)
+
+        Raises
+        ------
+        RetryException
+            If any transition exceeds the threshold
+        """
+        spans = None
+        if isinstance(segments, DocumentAnalysis):
+            spans = segments.scene_spans
+            segments = segments.scenes
+
+        trajectory = emotion_trajectory(segments)
+        deltas = trajectory["deltas"].tolist()
+        jumps = trajectory["jumps"].tolist()
+        results = {
+            "emotions": [
+                dict(zip(EMOTION_ORDER, row, strict=True)) for row in trajectory["matrix"].tolist()
+            ],
+            "emotion_deltas": deltas,
+            "jumps": jumps,
+            "flags": {},
+            "passed": True,
+        }
+        if not jumps:
+            return results
+
+        threshold = EMOTION_DELTA_THRESHOLD
+        worst = max(deltas[i] for i in jumps)
+        flag = {
+            "value": worst,
+            "threshold": threshold,
+            "message": (
+                f"{len(jumps)} emotion jump(s) between segments, "
+                f"largest delta {worst:.3f} exceeds threshold {threshold}"
+            ),
+            "transitions": [[i, i + 1, deltas[i]] for i in jumps],
+        }
+        if spans is not None:
+            flag["spans"] = [list(spans[i + 1]) for i in jumps]
+        results["flags"] = {"emotion_jump": flag}
+        results["passed"] = False
+        raise RetryException(
+            message="Emotion jump", flags=results["flags"], guard_name="emotion_guard"
+        )
@@ -8,15 +8,19 @@ RetryException when violations are detected.
 """
 
 import json
+import logging
 import os
+from pathlib import Path
 from typing import Any
 
 from src.core.guard_registry import BaseGuard, register_guard
 from src.exceptions import RetryException
 from src.utils.path_helper import data_path
 
+logger = logging.getLogger(__name__)
 
-@register_guard(order=7)
+
+@register_guard(order=7, pure=False, resources=("immutable_snapshot.json",))
 class ImmutableGuard(BaseGuard):
     """
     Guard that monitors immutable character fields.
@@ -142,6 +146,25 @@ class ImmutableGuard(BaseGuard):
 
         return immutable_data
 
+    @classmethod
+    def job_args(cls, draft, analysis, episode_num, session):
+        """
+        Check the project's characters.json; skipped when the file is missing.
+
+        Raises
+        ------
+        ValueError
+            If characters.json is not valid JSON
+        """
+        characters_path = data_path("characters.json", session.project)
+        if not Path(characters_path).exists():
+            logger.warning("ImmutableGuard: no characters.json found, skipping")
+            return None
+        characters = session.read_json(characters_path)
+        if characters is None:
+            raise ValueError(f"Invalid character data in {characters_path}")
+        return (characters,)
+
     def check(self, current_chars: dict[str, Any]) -> dict[str, Any]:
         """
         Check for immutable field violations.
@@ -7,16 +7,40 @@ Monitors:
 - TTR (Type-Token Ratio) < 0.17 → "too_repetitive" flag
 - 3-gram duplication rate > 0.06 → "duplicate_phrases" flag
 
-Uses collections.Counter for efficient counting instead of textstat.
+Tokens are mapped to integer ids once (cached on the DocumentAnalysis);
+unique words and 3-grams (a base-V polynomial hash of three ids, V =
+vocabulary size) are counted with NumPy instead of Python sets of tuples.
+Texts flagged for duplicate phrases also get the most repeated 3-grams with
+the character spans of their later copies, which partial regeneration
+rewrites instead of the whole draft. The moving-average TTR over a sliding
+window (MATTR) and the least diverse window are computed on request.
+
+Accepts raw text or a shared DocumentAnalysis so the draft is tokenized once.
+Batches of texts are scored together over a shared vocabulary
+(``lexi_profiles`` / ``LexiGuard.check_many``).
 """
 
-import re
+import numpy as np
 
-from src.core.guard_registry import BaseGuard, register_guard
+from src.core.document_analysis import DocumentAnalysis, as_analysis, encode_batch
+from src.core.guard_registry import BaseGuard, failure_result, register_guard
 from src.exceptions import RetryException
+from src.text import token_spans
 
+# Tokens per sliding window for the moving-average TTR
+MATTR_WINDOW = 50
 
-def calculate_ttr(text: str) -> float:
+# Most repeated 3-grams reported in the duplicate_phrases flag
+TOP_TRIGRAMS = 3
+
+# Later copies of repeated 3-grams reported as spans for targeted regeneration
+MAX_REPEAT_SPANS = 5
+
+# 3-gram duplication rate above which the duplicate_phrases flag is raised
+DUP_RATE_THRESHOLD = 0.06
+
+
+def calculate_ttr(text: str | DocumentAnalysis) -> float:
     """
     Calculate Type-Token Ratio (TTR) for the given text.
 
@@ -24,30 +48,19 @@ def calculate_ttr(text: str) -> float:
 
     Parameters
     ----------
-    text : str
+    text : str or DocumentAnalysis
         Input text to analyze
 
     Returns
     -------
     float
-        TTR value between 0 and 1
+        TTR value between 0 and 1 (1.0 for empty text)
     """
-    if not text.strip():
-        return 1.0  # Empty text has perfect diversity
-
-    # Clean and tokenize text - split on whitespace and punctuation
-    words = re.findall(r"\b\w+\b", text.lower())
-
-    if not words:
-        return 1.0
+    ttr, _ = lexi_metrics_batch([text])
+    return float(ttr[0])
 
-    total_words = len(words)
-    unique_words = len(set(words))
 
-    return unique_words / total_words
-
-
-def calculate_3gram_duplication_rate(text: str) -> float:
+def calculate_3gram_duplication_rate(text: str | DocumentAnalysis) -> float:
     """
     Calculate 3-gram duplication rate for the given text.
 
@@ -55,68 +68,306 @@ def calculate_3gram_duplication_rate(text: str) -> float:
 
     Parameters
     ----------
-    text : str
+    text : str or DocumentAnalysis
         Input text to analyze
 
     Returns
     -------
     float
-        3-gram duplication rate between 0 and 1
+        3-gram duplication rate between 0 and 1 (0.0 below three words)
     """
-    if not text.strip():
-        return 0.0  # Empty text has no duplicates
+    _, dup_rate = lexi_metrics_batch([text])
+    return float(dup_rate[0])
 
-    # Clean and tokenize text
-    words = re.findall(r"\b\w+\b", text.lower())
 
-    if len(words) < 3:
-        return 0.0  # Need at least 3 words for 3-grams
+def _trigram_keys(ids: np.ndarray, starts: np.ndarray, vocab_size: int) -> np.ndarray:
+    """Integer key of the 3-gram at each start; equal keys mean equal 3-grams."""
+    first, second, third = ids[starts], ids[starts + 1], ids[starts + 2]
+    if vocab_size**3 < 2**63:
+        return (first * vocab_size + second) * vocab_size + third
+    # Huge vocabularies: hash in two steps (bigram id, then 3-gram key)
+    _, bigram_ids = np.unique(first * vocab_size + second, return_inverse=True)
+    return bigram_ids.astype(np.int64) * vocab_size + third
 
-    # Generate 3-grams
-    trigrams = []
-    for i in range(len(words) - 2):
-        trigram = tuple(words[i : i + 3])
-        trigrams.append(trigram)
 
-    if not trigrams:
-        return 0.0
+def _distinct_per_text(keys: np.ndarray, doc: np.ndarray, count: int) -> np.ndarray:
+    """Number of distinct keys of each text."""
+    if count == 1:
+        keys = np.sort(keys)
+        return np.array([1 + np.count_nonzero(keys[1:] != keys[:-1])])
+    order = np.lexsort((keys, doc))
+    keys, doc = keys[order], doc[order]
+    new = np.ones(len(keys), dtype=bool)
+    new[1:] = (keys[1:] != keys[:-1]) | (doc[1:] != doc[:-1])
+    return np.bincount(doc[new], minlength=count)
 
-    total_3grams = len(trigrams)
-    unique_3grams = len(set(trigrams))
 
-    # Duplication rate = proportion of duplicate 3-grams
-    duplication_rate = (total_3grams - unique_3grams) / total_3grams
+def _encode(texts: list[str | DocumentAnalysis]) -> dict[str, np.ndarray | int]:
+    """
+    Token ids, 3-gram keys and the TTR / duplication rates of many texts.
 
-    return duplication_rate
+    Parameters
+    ----------
+    texts : List[str or DocumentAnalysis]
+        Texts to analyze
 
+    Returns
+    -------
+    Dict[str, np.ndarray or int]
+        "ids", "doc" and "lengths" from encode_batch, "vocab_size",
+        "trigrams" (3-gram key per token position, -1 where no 3-gram starts
+        inside the text), "ttr" and "dup_rate"
+    """
+    vocab, ids, doc, lengths = encode_batch(texts)
+    count = len(lengths)
+    vocab_size = max(len(vocab), 1)
+    encoded = {
+        "ids": ids,
+        "doc": doc,
+        "lengths": lengths,
+        "vocab_size": vocab_size,
+        "trigrams": np.full(len(ids), -1, dtype=np.int64),
+        "ttr": np.ones(count),
+        "dup_rate": np.zeros(count),
+    }
+    if not len(ids):
+        return encoded
+
+    # Unique words per text (one text: its whole vocabulary)
+    if count == 1:
+        unique_words = np.array([len(vocab)])
+    else:
+        unique_words = _distinct_per_text(ids, doc, count)
+    has_words = lengths > 0
+    encoded["ttr"][has_words] = unique_words[has_words] / lengths[has_words]
+
+    # 3-grams that do not cross text boundaries
+    valid = np.zeros(len(ids), dtype=bool)
+    valid[:-2] = doc[:-2] == doc[2:]
+    if not valid.any():
+        return encoded
+    starts = np.flatnonzero(valid)
+    trigram_keys = _trigram_keys(ids, starts, vocab_size)
+    encoded["trigrams"][starts] = trigram_keys
+    trigram_doc = doc[starts]
+
+    total_trigrams = np.bincount(trigram_doc, minlength=count)
+    unique_trigrams = _distinct_per_text(trigram_keys, trigram_doc, count)
+    has_trigrams = total_trigrams > 0
+    encoded["dup_rate"][has_trigrams] = (
+        total_trigrams[has_trigrams] - unique_trigrams[has_trigrams]
+    ) / total_trigrams[has_trigrams]
+    return encoded
+
+
+def lexi_metrics_batch(texts: list[str | DocumentAnalysis]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate TTR and 3-gram duplication rates for many texts at once.
+
+    All texts are tokenized once and mapped onto a shared vocabulary of
+    integer ids; unique words and 3-grams per text are then counted with
+    NumPy instead of per-text Python sets.
 
-def check_lexi_guard(text: str) -> dict[str, any]:
+    Parameters
+    ----------
+    texts : List[str or DocumentAnalysis]
+        Texts to analyze
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        TTR values and 3-gram duplication rates, one per text
     """
-    Run lexical quality checks on the given text.
+    encoded = _encode(texts)
+    return encoded["ttr"], encoded["dup_rate"]
+
+
+def _window_diversity(encoded: dict, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Distinct words in every sliding window of ``window`` tokens.
+
+    A token is the first occurrence of its word in the windows starting
+    after the previous occurrence of that word, so each token adds one to a
+    contiguous range of window starts; the ranges are summed with a
+    difference array in O(tokens).
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Distinct words of the window starting at each token position, and a
+        mask of the positions that start a full window inside their text
+    """
+    ids, doc, lengths = encoded["ids"], encoded["doc"], encoded["lengths"]
+    total = len(ids)
+    positions = np.arange(total, dtype=np.int64)
+    text_start = (np.cumsum(lengths) - lengths)[doc]
+    last_start = text_start + lengths[doc] - window
+
+    # Previous position of the same word in the same text (-1 if none)
+    keys = doc * encoded["vocab_size"] + ids
+    order = np.argsort(keys, kind="stable")
+    repeated = keys[order[1:]] == keys[order[:-1]]
+    previous = np.full(total, -1, dtype=np.int64)
+    previous[order[1:][repeated]] = order[:-1][repeated]
+
+    low = np.maximum(np.maximum(previous + 1, positions - window + 1), text_start)
+    high = np.minimum(positions, last_start)
+    counted = low <= high
+    diff = np.bincount(low[counted], minlength=total + 1) - np.bincount(
+        high[counted] + 1, minlength=total + 1
+    )
+    return np.cumsum(diff)[:total], positions <= last_start
+
+
+def _repeated_trigrams(
+    text: str | DocumentAnalysis, trigrams: np.ndarray, words: list[str]
+) -> tuple[list[dict[str, any]], list[list[int]]]:
+    """
+    The most repeated 3-grams of one text and the spans of their later copies.
 
     Parameters
     ----------
-    text : str
-        Text to analyze
+    text : str or DocumentAnalysis
+        The text
+    trigrams : np.ndarray
+        3-gram key per token position of the text (-1 for the last two)
+    words : List[str]
+        Lowercased tokens of the text
 
     Returns
     -------
-    Dict[str, any]
-        Results containing TTR, 3-gram duplication rate, and flags
+    Tuple[List[Dict[str, any]], List[List[int]]]
+        Up to TOP_TRIGRAMS {"trigram", "count"} entries, most repeated first,
+        and up to MAX_REPEAT_SPANS [start, end] character spans of their
+        repeated occurrences (first copies kept), in text order
+    """
+    trigrams = trigrams[trigrams >= 0]
+    unique, first, inverse, counts = np.unique(
+        trigrams, return_index=True, return_inverse=True, return_counts=True
+    )
+    repeated = np.flatnonzero(counts > 1)
+    if not len(repeated):
+        return [], []
+    top = repeated[np.lexsort((first[repeated], -counts[repeated]))][:TOP_TRIGRAMS]
+
+    top_trigrams = [
+        {"trigram": " ".join(words[first[t] : first[t] + 3]), "count": int(counts[t])} for t in top
+    ]
+
+    # Character offsets of the lowercased tokens equal the original ones
+    # unless lowercasing changed the text length
+    analysis = as_analysis(text)
+    if len(analysis.lower_text) != len(analysis.text):
+        return top_trigrams, []
+    offsets = token_spans(analysis.lower_text)
+    later = np.isin(inverse, top) & (np.arange(len(trigrams)) != first[inverse])
+    spans = [
+        [offsets[position][0], offsets[position + 2][1]]
+        for position in np.flatnonzero(later)[:MAX_REPEAT_SPANS].tolist()
+    ]
+    return top_trigrams, spans
+
+
+def lexi_profiles(
+    texts: list[str | DocumentAnalysis], window: int = MATTR_WINDOW, mattr: bool = False
+) -> list[dict[str, any]]:
+    """
+    Calculate all lexical metrics of many texts in one vectorized pass.
 
-    Raises
-    ------
-    RetryException
-        If text fails lexical quality checks
+    Parameters
+    ----------
+    texts : List[str or DocumentAnalysis]
+        Texts to analyze
+    window : int, optional
+        Tokens per sliding window for MATTR
+    mattr : bool, optional
+        Also compute MATTR and the least diverse window
+
+    Returns
+    -------
+    List[Dict[str, any]]
+        Per text: "ttr", "trigram_dup_rate", "repeated_trigrams" and
+        "repeat_spans" (see _repeated_trigrams; empty unless the duplication
+        rate exceeds DUP_RATE_THRESHOLD), and with ``mattr`` also "mattr"
+        (mean TTR over all windows; the TTR for texts shorter than one
+        window) and "lowest_window" ({"ttr", "start", "end"} character
+        offsets of the least diverse window, or None)
     """
-    results = {"ttr": 0.0, "trigram_dup_rate": 0.0, "flags": {}, "passed": True}
+    encoded = _encode(texts)
+    count = len(texts)
+    ttr, dup_rate, doc = encoded["ttr"], encoded["dup_rate"], encoded["doc"]
+    text_start = np.cumsum(encoded["lengths"]) - encoded["lengths"]
+
+    moving_ttr = ttr.copy()
+    lowest: list[dict[str, any] | None] = [None] * count
+    if mattr and len(encoded["ids"]):
+        diversity, full = _window_diversity(encoded, window)
+        starts = np.flatnonzero(full)
+        windows = np.bincount(doc[starts], minlength=count)
+        totals = np.bincount(doc[starts], weights=diversity[starts], minlength=count)
+        has_windows = windows > 0
+        moving_ttr[has_windows] = totals[has_windows] / (windows[has_windows] * window)
+
+        # Least diverse window per text: first start after sorting by (text, diversity)
+        ranked = starts[np.lexsort((diversity[starts], doc[starts]))]
+        _, first_of_text = np.unique(doc[ranked], return_index=True)
+        for position in ranked[first_of_text].tolist():
+            index = int(doc[position])
+            analysis = as_analysis(texts[index])
+            if len(analysis.lower_text) != len(analysis.text):
+                continue
+            offsets = token_spans(analysis.lower_text)
+            local = position - int(text_start[index])
+            lowest[index] = {
+                "ttr": float(diversity[position]) / window,
+                "start": offsets[local][0],
+                "end": offsets[local + window - 1][1],
+            }
+
+    profiles = []
+    for index, text in enumerate(texts):
+        repeated, spans = [], []
+        if dup_rate[index] > DUP_RATE_THRESHOLD:
+            begin = int(text_start[index])
+            end = begin + int(encoded["lengths"][index])
+            words = as_analysis(text).lower_tokens
+            repeated, spans = _repeated_trigrams(text, encoded["trigrams"][begin:end], words)
+        profile = {
+            "ttr": float(ttr[index]),
+            "trigram_dup_rate": float(dup_rate[index]),
+            "repeated_trigrams": repeated,
+            "repeat_spans": spans,
+        }
+        if mattr:
+            profile["mattr"] = float(moving_ttr[index])
+            profile["lowest_window"] = lowest[index]
+        profiles.append(profile)
+    return profiles
 
-    # Calculate metrics
-    ttr = calculate_ttr(text)
-    trigram_dup_rate = calculate_3gram_duplication_rate(text)
 
-    results["ttr"] = ttr
-    results["trigram_dup_rate"] = trigram_dup_rate
+def _lexi_results(profile: dict[str, any]) -> tuple[dict[str, any], RetryException | None]:
+    """
+    Build the lexical check results for computed metrics.
+
+    Parameters
+    ----------
+    profile : Dict[str, any]
+        Metrics of the text from lexi_profiles
+
+    Returns
+    -------
+    Tuple[Dict[str, any], RetryException or None]
+        Results containing TTR, 3-gram duplication rate, flags and (if
+        computed) MATTR and the least diverse window, and the exception to
+        raise if the text fails (None if it passes)
+    """
+    ttr = profile["ttr"]
+    trigram_dup_rate = profile["trigram_dup_rate"]
+    results = {"ttr": ttr, "trigram_dup_rate": trigram_dup_rate}
+    if "mattr" in profile:
+        results["mattr"] = profile["mattr"]
+        results["lowest_window"] = profile["lowest_window"]
+    results.update({"flags": {}, "passed": True})
 
     # Check thresholds and set flags
     flags = {}
@@ -128,33 +379,69 @@ def check_lexi_guard(text: str) -> dict[str, any]:
             "message": f"TTR {ttr:.3f} below threshold 0.17",
         }
 
-    if trigram_dup_rate > 0.06:
+    if trigram_dup_rate > DUP_RATE_THRESHOLD:
         flags["duplicate_phrases"] = {
             "value": trigram_dup_rate,
-            "threshold": 0.06,
-            "message": f"3-gram duplication rate {trigram_dup_rate:.3f} above threshold 0.06",
+            "threshold": DUP_RATE_THRESHOLD,
+            "message": (
+                f"3-gram duplication rate {trigram_dup_rate:.3f} "
+                f"above threshold {DUP_RATE_THRESHOLD}"
+            ),
+            "repeated_trigrams": profile["repeated_trigrams"],
         }
+        # Later copies of the most repeated 3-grams, for partial regeneration
+        if profile["repeat_spans"]:
+            flags["duplicate_phrases"]["spans"] = profile["repeat_spans"]
 
     results["flags"] = flags
 
-    if flags:
-        results["passed"] = False
-        # Create error message
-        flag_messages = [flag_data["message"] for flag_data in flags.values()]
-        error_message = "Lexical quality issues detected: " + "; ".join(flag_messages)
+    if not flags:
+        return results, None
+
+    results["passed"] = False
+    # Create error message
+    flag_messages = [flag_data["message"] for flag_data in flags.values()]
+    error_message = "Lexical quality issues detected: " + "; ".join(flag_messages)
+    return results, RetryException(message=error_message, flags=flags, guard_name="lexi_guard")
+
+
+def check_lexi_guard(text: str | DocumentAnalysis, mattr: bool = False) -> dict[str, any]:
+    """
+    Run lexical quality checks on the given text.
 
-        raise RetryException(message=error_message, flags=flags, guard_name="lexi_guard")
+    Parameters
+    ----------
+    text : str or DocumentAnalysis
+        Text to analyze
+    mattr : bool, optional
+        Also report MATTR and the least diverse window
+
+    Returns
+    -------
+    Dict[str, any]
+        Results containing TTR, 3-gram duplication rate and flags (plus
+        "mattr" and "lowest_window" if requested)
+
+    Raises
+    ------
+    RetryException
+        If text fails lexical quality checks
+    """
+    # Calculate all metrics from a single tokenization
+    results, error = _lexi_results(lexi_profiles([text], mattr=mattr)[0])
+    if error is not None:
+        raise error
 
     return results
 
 
-def lexi_guard(text: str) -> bool:
+def lexi_guard(text: str | DocumentAnalysis) -> bool:
     """
     Main entry point for lexical guard check.
 
     Parameters
     ----------
-    text : str
+    text : str or DocumentAnalysis
         Text to check
 
     Returns
@@ -184,7 +471,7 @@ class LexiGuard(BaseGuard):
     TTR (Type-Token Ratio) and 3-gram duplication analysis.
     """
 
-    def __init__(self, project=None):
+    def __init__(self, project=None, mattr: bool = False):
         """
         Initialize LexiGuard.
 
@@ -192,16 +479,28 @@ class LexiGuard(BaseGuard):
         ----------
         project : str, optional
             Project identifier (optional, for compatibility)
+        mattr : bool, optional
+            Also report MATTR and the least diverse window
         """
         self.project = project
+        self.mattr = mattr
+
+    def cache_params(self) -> dict[str, any]:
+        """MATTR reporting changes the check results."""
+        return {"mattr": self.mattr}
 
-    def check(self, text: str) -> dict[str, any]:
+    @classmethod
+    def job_args(cls, draft, analysis, episode_num, session):
+        """Check the shared analysis of the draft."""
+        return (analysis,)
+
+    def check(self, text: str | DocumentAnalysis) -> dict[str, any]:
         """
         Check text for lexical quality issues.
 
         Parameters
         ----------
-        text : str
+        text : str or DocumentAnalysis
             Text to analyze for lexical quality
 
         Returns
@@ -214,4 +513,25 @@ class LexiGuard(BaseGuard):
         RetryException
             If text fails lexical quality thresholds
         """
-        return check_lexi_guard(text)
+        return check_lexi_guard(text, mattr=self.mattr)
+
+    def check_many(self, batch: list[str | DocumentAnalysis]) -> list[dict[str, any]]:
+        """
+        Check many texts with one vectorized pass (see lexi_profiles).
+
+        Parameters
+        ----------
+        batch : List[str or DocumentAnalysis]
+            Texts to analyze
+
+        Returns
+        -------
+        List[Dict[str, any]]
+            One result per text; failing texts have "passed" False, their
+            flags and the failure "message"
+        """
+        outcomes = []
+        for profile in lexi_profiles(batch, mattr=self.mattr):
+            results, error = _lexi_results(profile)
+            outcomes.append(results if error is None else failure_result(results, error))
+        return outcomes
@@ -5,18 +5,375 @@ Relation Guard for Final Engine - detects sudden relationship changes.
 
 Monitors relation_matrix.json for character relationship changes between episodes
 and raises RetryException if relationships flip too quickly (within tolerance_ep).
+
+The matrix is loaded once into a RelationTimeline: for every character pair
+(normalized to sorted order, so "B,A" is "A,B") the episodes that list it
+are kept sorted, and the latest relation before an episode is found with
+bisect. A check costs O(pairs in the episode × log episodes).
+
+Relations can also be stored as relation_matrix.jsonl, one episode per line.
+The file is then partitioned by episode: new episodes are appended without
+rewriting the season, and a reload parses only the lines added since the
+previous load.
+
+RelationGuard.audit() checks every episode at once. The timeline is encoded
+as an (episodes × characters × characters) array of integer relation codes,
+the episode each relation was last listed in is forward-filled along the
+episode axis, and opposing flips are found with array operations instead of
+one check() per episode. Like check(), the audit tests every entry an
+episode lists, including both orders of a pair listed as "C,D" and "D,C".
 """
 
+import hashlib
 import json
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
-from src.core.guard_registry import BaseGuard, register_guard
+import numpy as np
+
+from src.core.guard_registry import BaseGuard, failure_result, register_guard
+from src.core.guard_session import FileSignature, file_signature
 from src.exceptions import RetryException
 from src.utils.path_helper import data_path
 
+logger = logging.getLogger(__name__)
+
+# Episode-partitioned storage, preferred over relation_matrix.json when present
+JSONL_FILENAME = "relation_matrix.jsonl"
+
+
+@lru_cache(maxsize=65536)
+def normalize_pair(char_pair: str) -> str:
+    """Sort the characters of a pair so "B,A" and "A,B" share one key."""
+    return ",".join(sorted(char_pair.split(",")))
+
+
+class RelationTimeline:
+    """
+    Per-pair relationship timelines of a relation matrix.
+
+    Episodes with a non-numeric ``ep`` or non-dict ``relations`` are
+    ignored. When an episode is listed more than once, its first entry gives
+    the episode's relations and the first entry naming a pair gives that
+    pair's relation in the pair's history, as does the first ordering of a
+    pair listed as both "A,B" and "B,A". Every entry of an episode is still
+    checked against that history (see ``tensor``'s "current").
+
+    Parameters
+    ----------
+    records : List[Dict[str, Any]], optional
+        Episode dictionaries with ep and relations fields, in any order
+    """
+
+    def __init__(self, records: list[dict[str, Any]] | None = None):
+        self.records: list[dict[str, Any]] = []
+        self._episodes: dict[int | float, dict[str, str]] = {}
+        # Pair -> (episodes, relations)
+        self._timelines: dict[str, tuple[list[int | float], list[str]]] = {}
+        self._tensor: tuple[int, dict[str, Any]] | None = None
+        self.extend(records or [])
+
+    def extend(self, records: list[dict[str, Any]]) -> None:
+        """
+        Add episode records, e.g. lines appended to a JSONL matrix.
+
+        Records arriving in episode order are appended in O(1) per pair;
+        earlier episodes are inserted in place.
+
+        Parameters
+        ----------
+        records : List[Dict[str, Any]]
+            Episode dictionaries with ep and relations fields
+        """
+        for record in records:
+            self.records.append(record)
+            ep = record.get("ep") if isinstance(record, dict) else None
+            relations = record.get("relations", {}) if isinstance(record, dict) else None
+            if not isinstance(ep, int | float) or not isinstance(relations, dict):
+                continue
+            self._episodes.setdefault(ep, relations)
+
+            for char_pair, relation in relations.items():
+                if not relation:
+                    continue
+                episodes, values = self._timelines.setdefault(normalize_pair(char_pair), ([], []))
+                if not episodes or episodes[-1] < ep:
+                    episodes.append(ep)
+                    values.append(relation)
+                    continue
+                position = bisect_left(episodes, ep)
+                if episodes[position] != ep:
+                    episodes.insert(position, ep)
+                    values.insert(position, relation)
+
+    def relations_at(self, episode: int) -> dict[str, str]:
+        """Relations listed for an episode, empty if it has none."""
+        return self._episodes.get(episode, {})
+
+    def latest(
+        self, char_pair: str, episode: int, inclusive: bool = False
+    ) -> tuple[int, str] | None:
+        """
+        Find the latest relation of a pair before an episode.
+
+        Parameters
+        ----------
+        char_pair : str
+            Character pair in format "A,B" (either order)
+        episode : int
+            Episode number
+        inclusive : bool, optional
+            Also consider the episode itself, defaults to False
+
+        Returns
+        -------
+        Tuple[int, str] or None
+            (episode, relation) of the latest entry, or None if the pair has
+            no earlier relation
+        """
+        timeline = self._timelines.get(normalize_pair(char_pair))
+        if timeline is None:
+            return None
+        episodes, values = timeline
+        position = (bisect_right if inclusive else bisect_left)(episodes, episode)
+        if position == 0:
+            return None
+        return episodes[position - 1], values[position - 1]
+
+    def tensor(self) -> dict[str, Any]:
+        """
+        Encode the timeline as an integer relation tensor.
+
+        Only pairs of two different characters in whole, positive episodes
+        are encoded. The encoding is cached until records are added.
+
+        Returns
+        -------
+        Dict[str, Any]
+            "characters": sorted character names (axes 1 and 2);
+            "relations": relation names by code, code 0 meaning none;
+            "updates": array of shape (episodes + 1, C, C), indexed by
+            episode number, with the code of each pair's relation listed in
+            that episode (symmetric, 0 where none);
+            "current": (episodes, first, second, codes) arrays with one
+            row per entry each episode lists itself (both orderings of a
+            pair listed twice), first < second, in listing order;
+            "listed": the char_pair string of each "current" row
+        """
+        if self._tensor is not None and self._tensor[0] == len(self.records):
+            return self._tensor[1]
+
+        pairs = {}
+        for key in self._timelines:
+            characters = key.split(",")
+            if len(characters) == 2 and characters[0] != characters[1]:
+                pairs[key] = characters
+        characters = sorted({character for pair in pairs.values() for character in pair})
+        position = {character: i for i, character in enumerate(characters)}
+
+        timelines = [self._timelines[key] for key in pairs]
+        lengths = [len(episodes) for episodes, _ in timelines]
+        rows = np.fromiter(chain.from_iterable(t[0] for t in timelines), dtype=float)
+        keep = (rows >= 1) & (rows == np.floor(rows))
+        rows = rows[keep].astype(np.int64)
+        indices = np.array([[position[c] for c in pair] for pair in pairs.values()], dtype=np.int64)
+        firsts, seconds = np.repeat(indices.reshape(-1, 2), lengths, axis=0)[keep].T
+
+        # Every entry an episode lists itself, in listing order
+        listed = [
+            (int(ep), char_pair, relation, pairs[key])
+            for ep, relations in self._episodes.items()
+            if ep >= 1 and ep == int(ep)
+            for char_pair, relation in relations.items()
+            if relation and (key := normalize_pair(char_pair)) in pairs
+        ]
+
+        names = list(chain.from_iterable(t[1] for t in timelines))
+        relations = list(dict.fromkeys(chain(names, (entry[2] for entry in listed))))
+        code_of = {name: code for code, name in enumerate(relations, start=1)}
+        dtype = np.min_scalar_type(len(relations))
+        codes = np.fromiter(map(code_of.__getitem__, names), dtype=np.int64, count=len(names))
+        codes = codes[keep].astype(dtype)
+
+        updates = np.zeros((rows.max(initial=0) + 1, len(characters), len(characters)), dtype=dtype)
+        updates[rows, firsts, seconds] = codes
+        updates[rows, seconds, firsts] = codes
+
+        current = np.array(
+            [
+                (ep, position[pair[0]], position[pair[1]], code_of[relation])
+                for ep, _, relation, pair in listed
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 4)
+        encoded = {
+            "characters": characters,
+            "relations": ["", *relations],
+            "updates": updates,
+            "current": tuple(current.T),
+            "listed": [entry[1] for entry in listed],
+        }
+        self._tensor = (len(self.records), encoded)
+        return encoded
+
+
+def last_listed(updates: np.ndarray) -> np.ndarray:
+    """
+    Forward-fill the episode of the latest non-zero code along axis 0.
+
+    ``np.take_along_axis(updates, last_listed(updates), axis=0)`` is the
+    forward-filled code tensor.
+
+    Parameters
+    ----------
+    updates : np.ndarray
+        Codes listed per episode (0 where none), episodes on axis 0
+
+    Returns
+    -------
+    np.ndarray
+        Episode of the latest code at or before each episode (0 where
+        none), shaped like ``updates``
+    """
+    rows = np.arange(len(updates), dtype=np.min_scalar_type(len(updates)))
+    rows = rows.reshape(-1, *([1] * (updates.ndim - 1)))
+    return np.maximum.accumulate(np.where(updates != 0, rows, 0), axis=0)
+
+
+# Timelines shared per file for the lifetime of the process:
+# path -> (signature, timeline, parsed bytes, digest of the parsed bytes)
+_timelines: dict[str, tuple[FileSignature, RelationTimeline, int, str]] = {}
+_timelines_lock = threading.Lock()
+
+
+def load_relation_timeline(relation_path: str | Path) -> RelationTimeline:
+    """
+    Get the relation timeline of a relation matrix file.
+
+    The timeline is rebuilt only when the file's mtime or size changes. A
+    .jsonl file that only grew is not re-parsed: the lines appended since the
+    last load are added to the existing timeline.
+
+    Parameters
+    ----------
+    relation_path : str or Path
+        Path to relation_matrix.json or relation_matrix.jsonl
+
+    Returns
+    -------
+    RelationTimeline
+        Timeline of the file; empty for a missing or invalid file
+    """
+    path = Path(relation_path)
+    signature = file_signature(path)
+    with _timelines_lock:
+        cached = _timelines.get(str(path))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        if path.suffix != ".jsonl":
+            timeline = RelationTimeline(_read_relations(path))
+            _timelines[str(path)] = (signature, timeline, 0, "")
+            return timeline
+
+        try:
+            data = path.read_bytes()
+        except OSError:
+            data = b""
+        # Only complete lines; a line still being written is read next time
+        parsed = data.rfind(b"\n") + 1
+        digest = hashlib.blake2b(data[: cached[2]] if cached else b"", digest_size=16).hexdigest()
+        if cached is not None and parsed >= cached[2] and digest == cached[3]:
+            timeline, start = cached[1], cached[2]
+        else:
+            timeline, start = RelationTimeline(), 0
+        timeline.extend(_parse_jsonl(data[start:parsed], path))
+        digest = hashlib.blake2b(data[:parsed], digest_size=16).hexdigest()
+        _timelines[str(path)] = (signature, timeline, parsed, digest)
+        return timeline
+
+
+def reset_relation_timelines() -> None:
+    """
+    Drop all cached relation timelines.
+
+    Primarily used for testing to ensure clean state.
+    """
+    with _timelines_lock:
+        _timelines.clear()
+
+
+def append_episode_relations(
+    relation_path: str | Path, episode: int, relations: dict[str, str]
+) -> None:
+    """
+    Append one episode's relations to a relation_matrix.jsonl file.
+
+    Parameters
+    ----------
+    relation_path : str or Path
+        Path to relation_matrix.jsonl
+    episode : int
+        Episode number
+    relations : Dict[str, str]
+        Relations by character pair ("A,B": "친구")
+    """
+    path = Path(relation_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps({"ep": episode, "relations": relations}, ensure_ascii=False)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def _read_relations(relation_path: Path) -> list[dict[str, Any]]:
+    """
+    Load the episode list of a relation_matrix.json file.
+
+    Parameters
+    ----------
+    relation_path : Path
+        Path to relation_matrix.json
 
-@register_guard(order=8)
+    Returns
+    -------
+    List[Dict[str, Any]]
+        List of episode relation dictionaries with ep and relations fields;
+        empty if the file is missing or invalid
+    """
+    try:
+        with open(relation_path, encoding="utf-8") as f:
+            relations = json.load(f)
+            if not isinstance(relations, list):
+                # Return empty list on invalid structure (graceful handling)
+                return []
+            return relations
+    except (FileNotFoundError, OSError):
+        # Return empty list on file errors (graceful handling)
+        return []
+    except (json.JSONDecodeError, ValueError):
+        # Return empty list on JSON parsing errors (graceful handling)
+        return []
+
+
+def _parse_jsonl(data: bytes, relation_path: Path) -> list[dict[str, Any]]:
+    """Parse complete JSONL lines, skipping blank and invalid ones."""
+    records = []
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError as e:
+            logger.warning(f"Skipping invalid line in {relation_path}: {e}")
+    return records
+
+
+@register_guard(order=8, resources=("relation_matrix.json",))
 class RelationGuard(BaseGuard):
     """
     Relation Guard - validates character relationships don't change too abruptly.
@@ -32,50 +389,55 @@ class RelationGuard(BaseGuard):
         Parameters
         ----------
         relation_path : str, optional
-            Path to relation_matrix.json file containing episode relationships.
-            If None, uses default path for the project.
+            Path to relation_matrix.json (or episode-per-line .jsonl) file
+            containing episode relationships. If None, uses the project's
+            relation_matrix.jsonl if it exists, else relation_matrix.json.
         project : str, optional
             Project ID for path resolution, defaults to "default"
         tolerance_ep : int, optional
             Number of episodes tolerance for relationship changes, defaults to 3
         """
         if relation_path is None:
-            self.relation_path = data_path("relation_matrix.json", project)
+            self.relation_path = data_path(JSONL_FILENAME, project)
+            if not self.relation_path.exists():
+                self.relation_path = data_path("relation_matrix.json", project)
         else:
             self.relation_path = Path(relation_path)
         self.project = project
         self.tolerance_ep = tolerance_ep
-        self.relations = self._load_relations()
+        self._timeline = load_relation_timeline(self.relation_path)
+        # A copy, so edits never reach the timeline shared by every guard of the file
+        self.relations = list(self._timeline.records)
+        self._synced = (self.relations, len(self.relations))
+
+    def config_paths(self) -> list[Path]:
+        """Configuration files loaded at construction time."""
+        return [Path(self.relation_path)]
+
+    def cache_params(self) -> dict[str, Any]:
+        """Instance settings that affect check() results."""
+        return {"tolerance_ep": self.tolerance_ep}
+
+    @property
+    def timeline(self) -> RelationTimeline:
+        """Relation timeline, rebuilt once after ``relations`` is replaced or appended to."""
+        records, size = self._synced
+        if records is not self.relations or size != len(self.relations):
+            self._timeline = RelationTimeline(self.relations)
+            self._synced = (self.relations, len(self.relations))
+        return self._timeline
 
     def _load_relations(self) -> list[dict[str, Any]]:
         """
-        Load relations from JSON file.
+        Load relations from the relation matrix file.
 
         Returns
         -------
         List[Dict[str, Any]]
-            List of episode relation dictionaries with ep and relations fields
-
-        Raises
-        ------
-        FileNotFoundError
-            If relation matrix file doesn't exist
-        json.JSONDecodeError
-            If relation matrix file is invalid JSON
+            List of episode relation dictionaries with ep and relations
+            fields; empty if the file is missing or invalid
         """
-        try:
-            with open(self.relation_path, encoding="utf-8") as f:
-                relations = json.load(f)
-                if not isinstance(relations, list):
-                    # Return empty list on invalid structure (graceful handling)
-                    return []
-                return relations
-        except (FileNotFoundError, OSError):
-            # Return empty list on file errors (graceful handling)
-            return []
-        except (json.JSONDecodeError, ValueError):
-            # Return empty list on JSON parsing errors (graceful handling)
-            return []
+        return load_relation_timeline(self.relation_path).records
 
     def _is_opposing_relation(self, rel1: str, rel2: str) -> bool:
         """
@@ -115,36 +477,14 @@ class RelationGuard(BaseGuard):
         Optional[str]
             Relationship type if found, None otherwise
         """
-        # Sort the pair to handle both "A,B" and "B,A" formats
-        chars = sorted(char_pair.split(","))
-        normalized_pair = ",".join(chars)
-
-        # Find the most recent episode <= target episode with this relationship
-        best_episode = -1
-        best_relation = None
-
-        for ep_data in self.relations:
-            ep_num = ep_data.get("ep", 0)
-            if ep_num <= episode:
-                relations = ep_data.get("relations", {})
-                # Check both orderings of the character pair
-                if char_pair in relations:
-                    if ep_num > best_episode:
-                        best_episode = ep_num
-                        best_relation = relations[char_pair]
-                elif normalized_pair in relations:
-                    if ep_num > best_episode:
-                        best_episode = ep_num
-                        best_relation = relations[normalized_pair]
-                else:
-                    # Check reverse order
-                    reverse_pair = ",".join(reversed(chars))
-                    if reverse_pair in relations:
-                        if ep_num > best_episode:
-                            best_episode = ep_num
-                            best_relation = relations[reverse_pair]
-
-        return best_relation
+        # Most recent episode <= target episode, in either pair order
+        latest = self.timeline.latest(char_pair, episode, inclusive=True)
+        return latest[1] if latest else None
+
+    @classmethod
+    def job_args(cls, draft, analysis, episode_num, session):
+        """Check the relations recorded up to the episode."""
+        return (episode_num,)
 
     def check(self, episode_num: int) -> dict[str, Any]:
         """
@@ -172,12 +512,8 @@ class RelationGuard(BaseGuard):
             "tolerance_ep": self.tolerance_ep,
         }
 
-        # Find current episode relations
-        current_relations = {}
-        for ep_data in self.relations:
-            if ep_data.get("ep") == episode_num:
-                current_relations = ep_data.get("relations", {})
-                break
+        timeline = self.timeline
+        current_relations = timeline.relations_at(episode_num)
 
         if not current_relations:
             # No relations defined for this episode - pass
@@ -185,30 +521,9 @@ class RelationGuard(BaseGuard):
 
         # Check each relationship for rapid changes
         for char_pair, current_relation in current_relations.items():
-            # Find the most recent previous episode with data for this character pair
-            most_recent_ep = -1
-            most_recent_relation = None
-
-            for ep_data in self.relations:
-                ep_num = ep_data.get("ep", 0)
-                if ep_num < episode_num:  # Only consider previous episodes
-                    relations = ep_data.get("relations", {})
-                    # Check if this episode has data for our character pair (both orderings)
-                    chars = sorted(char_pair.split(","))
-                    normalized_pair = ",".join(chars)
-                    reverse_pair = ",".join(reversed(chars))
-
-                    found_relation = None
-                    if char_pair in relations:
-                        found_relation = relations[char_pair]
-                    elif normalized_pair in relations:
-                        found_relation = relations[normalized_pair]
-                    elif reverse_pair in relations:
-                        found_relation = relations[reverse_pair]
-
-                    if found_relation and ep_num > most_recent_ep:
-                        most_recent_ep = ep_num
-                        most_recent_relation = found_relation
+            # Most recent previous episode with data for this pair (both orderings)
+            latest = timeline.latest(char_pair, episode_num)
+            most_recent_ep, most_recent_relation = latest if latest else (-1, None)
 
             # Check if the most recent relationship is opposing and within tolerance
             if most_recent_relation and most_recent_ep > 0:
@@ -217,43 +532,166 @@ class RelationGuard(BaseGuard):
                     most_recent_relation, current_relation
                 ):
                     # Found opposing relationship beyond tolerance window
-                    violation = {
-                        "char_pair": char_pair,
-                        "previous_episode": most_recent_ep,
-                        "previous_relation": most_recent_relation,
-                        "current_episode": episode_num,
-                        "current_relation": current_relation,
-                        "episode_gap": episode_gap,
-                        "tolerance_ep": self.tolerance_ep,
-                        "message": f"Relationship {char_pair} changed from '{most_recent_relation}' to '{current_relation}' between episodes {most_recent_ep} and {episode_num} (gap: {episode_gap}, tolerance: {self.tolerance_ep})",
-                    }
+                    violation = self._violation(
+                        char_pair,
+                        most_recent_ep,
+                        most_recent_relation,
+                        episode_num,
+                        current_relation,
+                    )
 
                     results["passed"] = False
                     results["violations"].append(violation)
 
-                    # Create flags for RetryException
-                    flags = {
-                        "relation_violation": {
-                            "char_pair": char_pair,
-                            "previous_episode": most_recent_ep,
-                            "previous_relation": most_recent_relation,
-                            "current_episode": episode_num,
-                            "current_relation": current_relation,
-                            "episode_gap": episode_gap,
-                            "tolerance_ep": self.tolerance_ep,
-                        }
-                    }
-                    results["flags"] = flags
-
                     # Raise exception on first violation (as per spec)
-                    raise RetryException(
-                        message=violation["message"],
-                        flags=flags,
-                        guard_name="relation_guard",
-                    )
+                    error = self._violation_error(violation)
+                    results["flags"] = error.flags
+                    raise error
 
         return results
 
+    def audit(self) -> dict[str, Any]:
+        """
+        Check every episode of the relation matrix in one vectorized pass.
+
+        Finds the same violations as calling check() for each episode, but
+        reports all of them instead of raising on the first. Only pairs of
+        two characters in whole, positive episodes are audited.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Results dictionary with passed status, the number of "episodes"
+            audited, the "failed_episodes" and every violation in episode
+            order (within an episode, in the order check() meets them)
+        """
+        violations = self._audit_violations()
+        return {
+            "passed": not violations,
+            "episodes": len(self.timeline.tensor()["updates"]) - 1,
+            "failed_episodes": sorted(violations),
+            "violations": [v for episode in sorted(violations) for v in violations[episode]],
+            "tolerance_ep": self.tolerance_ep,
+        }
+
+    def check_many(self, batch: list[int | tuple[int]]) -> list[dict[str, Any]]:
+        """
+        Check many episodes with one audit of the relation matrix.
+
+        Parameters
+        ----------
+        batch : List[int]
+            Episode numbers to check
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            One result per episode; failing episodes have "passed" False and
+            the flags and "message" of the violation check() would raise
+        """
+        violations = self._audit_violations()
+        outcomes = []
+        for item in batch:
+            episode_num = item[0] if isinstance(item, tuple) else item
+            if not isinstance(episode_num, int):
+                # Episodes outside the tensor are checked one by one
+                outcomes.extend(super().check_many([item]))
+                continue
+            results = {
+                "passed": True,
+                "violations": [],
+                "episode": episode_num,
+                "tolerance_ep": self.tolerance_ep,
+            }
+            if episode_num in violations:
+                first = violations[episode_num][0]
+                results["violations"].append(first)
+                results = failure_result(results, self._violation_error(first))
+            outcomes.append(results)
+        return outcomes
+
+    def _audit_violations(self) -> dict[int, list[dict[str, Any]]]:
+        """
+        Find the opposing flips of every episode from the relation tensor.
+
+        Returns
+        -------
+        Dict[int, List[Dict[str, Any]]]
+            Violations by episode number, only for failing episodes
+        """
+        encoded = self.timeline.tensor()
+        updates = encoded["updates"]
+        relations = encoded["relations"]
+        episodes, firsts, seconds, current = encoded["current"]
+        if not len(episodes):
+            return {}
+
+        # Forward-fill only the cells some episode checks
+        cells = firsts * updates.shape[1] + seconds
+        columns, column = np.unique(cells, return_inverse=True)
+        updates = updates.reshape(len(updates), -1)[:, columns]
+        previous_ep = last_listed(updates)[episodes - 1, column].astype(np.int64)
+        previous = updates[previous_ep, column].astype(np.int64)
+
+        candidate = (previous_ep > 0) & (episodes - previous_ep > self.tolerance_ep)
+        # Opposition of each (previous, current) code pair that occurs
+        opposing = np.zeros((len(relations), len(relations)), dtype=bool)
+        for before, after in set(zip(previous[candidate], current[candidate], strict=True)):
+            opposing[before, after] = self._is_opposing_relation(
+                relations[before], relations[after]
+            )
+        hits = np.flatnonzero(candidate & opposing[previous, current])
+
+        # Rows follow each episode's listing order, the order check() meets them
+        violations: dict[int, list[dict[str, Any]]] = {}
+        for i in hits.tolist():
+            episode_num = int(episodes[i])
+            violations.setdefault(episode_num, []).append(
+                self._violation(
+                    encoded["listed"][i],
+                    int(previous_ep[i]),
+                    relations[previous[i]],
+                    episode_num,
+                    relations[current[i]],
+                )
+            )
+        return violations
+
+    def _violation(
+        self,
+        char_pair: str,
+        previous_episode: int,
+        previous_relation: str,
+        current_episode: int,
+        current_relation: str,
+    ) -> dict[str, Any]:
+        """Describe an opposing relationship change beyond the tolerance window."""
+        episode_gap = current_episode - previous_episode
+        return {
+            "char_pair": char_pair,
+            "previous_episode": previous_episode,
+            "previous_relation": previous_relation,
+            "current_episode": current_episode,
+            "current_relation": current_relation,
+            "episode_gap": episode_gap,
+            "tolerance_ep": self.tolerance_ep,
+            "message": f"Relationship {char_pair} changed from '{previous_relation}' to '{current_relation}' between episodes {previous_episode} and {current_episode} (gap: {episode_gap}, tolerance: {self.tolerance_ep})",
+        }
+
+    def _violation_error(self, violation: dict[str, Any]) -> RetryException:
+        """Build the RetryException reporting a violation."""
+        # Create flags for RetryException
+        flags = {
+            "relation_violation": {
+                key: value for key, value in violation.items() if key != "message"
+            }
+        }
+        return RetryException(
+            message=violation["message"],
+            flags=flags,
+            guard_name="relation_guard",
+        )
+
 
 def check_relation_guard(
     episode_num: int,
@@ -290,6 +728,33 @@ def check_relation_guard(
     return guard.check(episode_num)
 
 
+def audit_relation_guard(
+    relation_path: str = None,
+    project: str = "default",
+    tolerance_ep: int = 3,
+) -> dict[str, Any]:
+    """
+    Check every episode of a relation matrix at once.
+
+    Parameters
+    ----------
+    relation_path : str, optional
+        Path to relation_matrix.json (or .jsonl) file.
+        If None, uses default path for the project.
+    project : str, optional
+        Project ID for path resolution, defaults to "default"
+    tolerance_ep : int, optional
+        Number of episodes tolerance for relationship changes, defaults to 3
+
+    Returns
+    -------
+    Dict[str, Any]
+        Audit results with passed status and every violation of the season
+    """
+    guard = RelationGuard(relation_path, project, tolerance_ep)
+    return guard.audit()
+
+
 def relation_guard(
     episode_num: int,
     relation_path: str = None,
@@ -4,18 +4,370 @@ rule_guard.py
 Rule Guard for Final Engine - checks text against forbidden patterns.
 
 Monitors rules.json for pattern violations using regex search.
-Raises RetryException on first violation found.
+Raises RetryException reporting the first violation in rule order, with
+every violation listed in the flag so one retry can fix them all.
+
+Rules are compiled once per rules file (cached by path, mtime and size)
+into a rule pack, and a draft is scanned once however many rules there are.
+Match positions come from prefilters without capturing groups (literal rules
+factored into a prefix trie, other patterns in a plain alternation) so the
+regex engine can skip ahead quickly; only where one matches does an
+anchored alternation of named groups identify the rule. Patterns that cannot share an
+alternation (backreferences, their own named groups, inline flags) are kept
+as standalone patterns.
+
+Patterns are analysed at load time for nested variable-length quantifiers
+such as ``(\\w+\\s?)+``, which can backtrack catastrophically. The regex engine
+holds the GIL while matching, so no thread can interrupt it; flagged rules
+are therefore logged and matched in a subprocess that is killed after
+RULE_SCAN_TIMEOUT seconds (default 2), which fails the check with a
+GuardTimeoutException.
 """
 
 import json
+import logging
+import multiprocessing
+import os
 import re
+import threading
 from pathlib import Path
 from typing import Any
 
-from src.core.guard_registry import BaseGuard, register_guard
-from src.exceptions import RetryException
+from src.core.document_analysis import DocumentAnalysis, as_analysis
+from src.core.guard_registry import BaseGuard, failure_result, register_guard
+from src.core.guard_session import FileSignature, file_signature
+from src.exceptions import GuardTimeoutException, RetryException
+from src.text import trie_pattern
 from src.utils.path_helper import data_path
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older Python
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+# Pattern features that depend on group numbering, names or global flags
+STANDALONE_FEATURES = re.compile(r"\\[1-9]|\\g<|\(\?P[<=>]|\(\?\(|\(\?[aiLmsux-]+[:)]")
+
+# Patterns without regex syntax, matched as plain text
+LITERAL_PATTERN = re.compile(r"[^\\.^$*+?{}\[\]|()]+")
+
+
+# Seconds a subprocess may spend on flagged patterns (RULE_SCAN_TIMEOUT)
+SCAN_TIMEOUT = 2.0
+
+# Repeats that backtrack (possessive repeats and atomic groups never do)
+_REPEAT_OPS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+
+def _nested_repeat(items: Any, outer_variable: bool, outer_unbounded: bool) -> bool:
+    """Whether parsed items hold a variable repeat inside another, one of them unbounded."""
+    for op, av in items:
+        if op in _REPEAT_OPS:
+            low, high, body = av
+            variable = high > low
+            unbounded = high == sre_parse.MAXREPEAT
+            if variable and outer_variable and (unbounded or outer_unbounded):
+                return True
+            if _nested_repeat(body, outer_variable or variable, outer_unbounded or unbounded):
+                return True
+        elif op == sre_parse.SUBPATTERN:
+            if _nested_repeat(av[-1], outer_variable, outer_unbounded):
+                return True
+        elif op == sre_parse.BRANCH:
+            if any(_nested_repeat(b, outer_variable, outer_unbounded) for b in av[1]):
+                return True
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _nested_repeat(av[1], outer_variable, outer_unbounded):
+                return True
+        elif op == sre_parse.GROUPREF_EXISTS:
+            branches = [b for b in av[1:] if b is not None]
+            if any(_nested_repeat(b, outer_variable, outer_unbounded) for b in branches):
+                return True
+    return False
+
+
+def nested_quantifiers(pattern: str) -> bool:
+    """
+    Check a pattern for nested quantifiers that can backtrack catastrophically.
+
+    Parameters
+    ----------
+    pattern : str
+        Regular expression source
+
+    Returns
+    -------
+    bool
+        True if a variable-length repeat contains another one and at least
+        one of them is unbounded, e.g. ``(a+)+`` or ``(\\w+\\s?)*``; False for
+        safe or invalid patterns
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return False
+    return _nested_repeat(parsed, False, False)
+
+
+def _scan_patterns(patterns: list[tuple[int, str]], text: str, connection: Any) -> None:
+    """Subprocess entry point: send the (rule index, start, end) of every match."""
+    found = []
+    for index, pattern in patterns:
+        compiled = re.compile(pattern, re.IGNORECASE)
+        found.extend((index, *match.span()) for match in compiled.finditer(text))
+    connection.send(found)
+    connection.close()
+
+
+def scan_isolated(
+    patterns: list[tuple[int, str]], text: str, timeout: float | None = None
+) -> list[tuple[int, int, int]]:
+    """
+    Match patterns in a subprocess that is killed when it runs out of time.
+
+    Parameters
+    ----------
+    patterns : List[Tuple[int, str]]
+        (rule index, pattern) pairs
+    text : str
+        Text to scan
+    timeout : float, optional
+        Seconds before the subprocess is killed; RULE_SCAN_TIMEOUT when None
+
+    Returns
+    -------
+    List[Tuple[int, int, int]]
+        (rule index, start, end) of every match
+
+    Raises
+    ------
+    GuardTimeoutException
+        If matching did not finish in time
+    """
+    if timeout is None:
+        timeout = float(os.getenv("RULE_SCAN_TIMEOUT", str(SCAN_TIMEOUT)))
+    # A forked child only runs re on data it already holds, so it is safe
+    # (and fast) even in a threaded parent; spawn where fork is unavailable
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_scan_patterns, args=(patterns, text, sender), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        if receiver.poll(timeout):
+            return receiver.recv()
+    except EOFError:
+        raise RuntimeError(f"Rule scan subprocess exited with code {process.exitcode}") from None
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+    raise GuardTimeoutException(
+        f"Rule patterns with nested quantifiers exceeded {timeout:g}s and were killed",
+        guard_name="rule_guard",
+        timeout=timeout,
+    )
+
+
+def _group_name(index: int) -> str:
+    """Named group of a rule in the merged alternation."""
+    return f"rule_{index}"
+
+
+class RulePack:
+    """
+    Rules compiled for a single scan per text.
+
+    Parameters
+    ----------
+    rules : List[Dict[str, str]]
+        Valid rules (id, pattern, message) in rule order; rules with invalid
+        regular expressions are skipped, rules with nested quantifiers are
+        matched in a subprocess with a time limit
+    """
+
+    def __init__(self, rules: list[dict[str, str]]):
+        self.rules = rules
+        self.standalone: list[tuple[int, re.Pattern]] = []
+        self.isolated: list[tuple[int, str]] = []
+        self._group_rules: dict[str, int] = {}
+        merged: list[str] = []
+        literals: list[str] = []
+        expressions: list[str] = []
+        for index, rule in enumerate(rules):
+            try:
+                compiled = re.compile(rule["pattern"], re.IGNORECASE)
+            except re.error:
+                # Invalid regex pattern - skip this rule
+                continue
+            if nested_quantifiers(rule["pattern"]):
+                logger.warning(
+                    f"Rule {rule['id']} pattern {rule['pattern']!r} has nested quantifiers; "
+                    "matching it in a subprocess with a time limit"
+                )
+                self.isolated.append((index, rule["pattern"]))
+            elif STANDALONE_FEATURES.search(rule["pattern"]):
+                self.standalone.append((index, compiled))
+            else:
+                self._group_rules[_group_name(index)] = index
+                merged.append(f"(?:(?=(?P<{_group_name(index)}>{rule['pattern']})))?")
+                if LITERAL_PATTERN.fullmatch(rule["pattern"]):
+                    literals.append(rule["pattern"])
+                else:
+                    expressions.append(f"(?:{rule['pattern']})")
+
+        # Named groups defeat the engine's fast skipping, so positions come from
+        # group-free prefilters (kept apart, as mixing regex alternatives into
+        # the trie slows it down); the identifying pattern has one optional
+        # lookahead per rule, so one match at a position tries every rule
+        self.prefilters = [
+            re.compile(source, re.IGNORECASE)
+            for source in (trie_pattern(literals) if literals else "", "|".join(expressions))
+            if source
+        ]
+        self.combined = re.compile("".join(merged), re.IGNORECASE) if merged else None
+
+    @property
+    def pattern_count(self) -> int:
+        """Number of rules with a valid pattern."""
+        return len(self._group_rules) + len(self.standalone) + len(self.isolated)
+
+    def scan(self, text: str) -> list[tuple[int, int, int]]:
+        """
+        Find every rule violation in a text.
+
+        The prefilters are searched again from every position where a match
+        starts, so matches of different rules may overlap, also when they
+        start at the same position. A rule's own matches do not overlap.
+
+        Parameters
+        ----------
+        text : str
+            Text to scan
+
+        Returns
+        -------
+        List[Tuple[int, int, int]]
+            (rule index, start, end) of every match, ordered by position,
+            then rule order
+
+        Raises
+        ------
+        GuardTimeoutException
+            If the rules with nested quantifiers did not finish in time
+        """
+        starts: set[int] = set()
+        for prefilter in self.prefilters:
+            position = 0
+            while position <= len(text):
+                candidate = prefilter.search(text, position)
+                if candidate is None:
+                    break
+                starts.add(candidate.start())
+                position = candidate.start() + 1
+
+        found: list[tuple[int, int, int]] = []
+        rule_ends: dict[int, int] = {}
+        for start in sorted(starts):
+            match = self.combined.match(text, start)
+            for name, index in self._group_rules.items():
+                end = match.end(name)
+                if end >= 0 and start >= rule_ends.get(index, 0):
+                    found.append((index, start, end))
+                    rule_ends[index] = max(end, start + 1)
+        for index, compiled in self.standalone:
+            found.extend((index, *match.span()) for match in compiled.finditer(text))
+        if self.isolated:
+            found.extend(scan_isolated(self.isolated, text))
+        found.sort(key=lambda item: (item[1], item[0]))
+        return found
+
+
+# Rule packs shared per rules file for the lifetime of the process
+_rule_packs: dict[str, tuple[FileSignature, RulePack]] = {}
+_rule_packs_lock = threading.Lock()
+
+
+def load_rule_pack(rule_path: str | Path) -> RulePack:
+    """
+    Get the compiled rule pack of a rules file.
+
+    The pack is rebuilt only when the file's mtime or size changes.
+
+    Parameters
+    ----------
+    rule_path : str or Path
+        Path to a rules.json file
+
+    Returns
+    -------
+    RulePack
+        Compiled valid rules; empty for a missing or invalid file
+    """
+    signature = file_signature(rule_path)
+    with _rule_packs_lock:
+        cached = _rule_packs.get(str(rule_path))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    pack = RulePack(_read_rules(Path(rule_path)))
+    with _rule_packs_lock:
+        _rule_packs[str(rule_path)] = (signature, pack)
+    return pack
+
+
+def reset_rule_packs() -> None:
+    """
+    Drop all cached rule packs.
+
+    Primarily used for testing to ensure clean state.
+    """
+    with _rule_packs_lock:
+        _rule_packs.clear()
+
+
+def _read_rules(rule_path: Path) -> list[dict[str, str]]:
+    """
+    Load the valid rules of a rules file.
+
+    Parameters
+    ----------
+    rule_path : Path
+        Path to rules.json
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Rule dictionaries with id, pattern and message fields; empty if the
+        file is missing or invalid
+    """
+    if not rule_path.exists():
+        # Return empty rules if file doesn't exist (graceful handling)
+        return []
+
+    try:
+        with open(rule_path, encoding="utf-8") as f:
+            rules = json.load(f)
+
+        # Validate rules structure
+        if not isinstance(rules, list):
+            return []
+
+        # Filter valid rules that have required fields
+        valid_rules = []
+        for rule in rules:
+            if isinstance(rule, dict) and "id" in rule and "pattern" in rule and "message" in rule:
+                valid_rules.append(rule)
+
+        return valid_rules
+
+    except (json.JSONDecodeError, OSError):
+        # Return empty rules on file errors (graceful handling)
+        return []
+
 
 @register_guard(order=3)
 class RuleGuard(BaseGuard):
@@ -43,6 +395,12 @@ class RuleGuard(BaseGuard):
         else:
             self.rule_path = Path(rule_path)
         self.rules = self._load_rules()
+        self._file_rules = self.rules
+        self._pack = load_rule_pack(self.rule_path)
+
+    def config_paths(self) -> list[Path]:
+        """Configuration files loaded at construction time."""
+        return [Path(self.rule_path)]
 
     def _load_rules(self) -> list[dict[str, str]]:
         """
@@ -51,51 +409,24 @@ class RuleGuard(BaseGuard):
         Returns
         -------
         List[Dict[str, str]]
-            List of rule dictionaries with id, pattern, message fields
-
-        Raises
-        ------
-        FileNotFoundError
-            If rules file doesn't exist
-        json.JSONDecodeError
-            If rules file is invalid JSON
+            List of rule dictionaries with id, pattern, message fields (the
+            rules of the cached rule pack; empty if the file is missing or
+            invalid)
         """
-        if not self.rule_path.exists():
-            # Return empty rules if file doesn't exist (graceful handling)
-            return []
+        return load_rule_pack(self.rule_path).rules
 
-        try:
-            with open(self.rule_path, encoding="utf-8") as f:
-                rules = json.load(f)
-
-            # Validate rules structure
-            if not isinstance(rules, list):
-                return []
-
-            # Filter valid rules that have required fields
-            valid_rules = []
-            for rule in rules:
-                if (
-                    isinstance(rule, dict)
-                    and "id" in rule
-                    and "pattern" in rule
-                    and "message" in rule
-                ):
-                    valid_rules.append(rule)
-
-            return valid_rules
-
-        except (json.JSONDecodeError, OSError):
-            # Return empty rules on file errors (graceful handling)
-            return []
+    @classmethod
+    def job_args(cls, draft, analysis, episode_num, session):
+        """Scan the shared analysis of the draft."""
+        return (analysis,)
 
-    def check(self, text: str) -> dict[str, Any]:
+    def check(self, text: str | DocumentAnalysis) -> dict[str, Any]:
         """
         Check text against all rules and raise exception on first violation.
 
         Parameters
         ----------
-        text : str
+        text : str or DocumentAnalysis
             Text to check for rule violations
 
         Returns
@@ -108,6 +439,63 @@ class RuleGuard(BaseGuard):
         RetryException
             If any rule violation is found (first violation reported)
         """
+        results, error = self._scan(as_analysis(text).text, self._compile_rules())
+        if error is not None:
+            raise error
+
+        return results
+
+    def check_many(self, batch: list[str | DocumentAnalysis]) -> list[dict[str, Any]]:
+        """
+        Check many texts with the same rule pack.
+
+        Parameters
+        ----------
+        batch : List[str or DocumentAnalysis]
+            Texts to check for rule violations
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            One result per text; violating texts have "passed" False, the
+            flags of their violations and the first violation's "message"
+        """
+        pack = self._compile_rules()
+        outcomes = []
+        for text in batch:
+            results, error = self._scan(as_analysis(text).text, pack)
+            outcomes.append(results if error is None else failure_result(results, error))
+        return outcomes
+
+    def _compile_rules(self) -> RulePack:
+        """Get the rule pack of the current rules (cached per rules file)."""
+        if self.rules is self._file_rules:
+            # Follow the rules file, re-pointing rules at a reloaded pack
+            self._pack = load_rule_pack(self.rule_path)
+            self.rules = self._file_rules = self._pack.rules
+        elif self._pack.rules is not self.rules:
+            # Rules replaced after construction are compiled once on their own
+            self._pack = RulePack(self.rules)
+        return self._pack
+
+    def _scan(self, text: str, pack: RulePack) -> tuple[dict[str, Any], RetryException | None]:
+        """
+        Check a text against a rule pack in one scan.
+
+        Parameters
+        ----------
+        text : str
+            Text to check
+        pack : RulePack
+            Compiled rules
+
+        Returns
+        -------
+        Tuple[Dict[str, Any], RetryException or None]
+            Results dictionary with every violation, and the exception
+            reporting the first violation in rule order (None if the text
+            passes)
+        """
         results = {
             "passed": True,
             "rules_checked": len(self.rules),
@@ -117,50 +505,47 @@ class RuleGuard(BaseGuard):
 
         if not text.strip():
             # Empty text passes all checks
-            return results
-
-        # Check each rule in order, stop at first violation
-        for rule in self.rules:
-            rule_id = rule["id"]
-            pattern = rule["pattern"]
-            message = rule["message"]
-
-            try:
-                # Use re.search to find pattern match
-                match = re.search(pattern, text, re.IGNORECASE)
-
-                if match:
-                    # Rule violation found
-                    violation_details = {
-                        "rule_id": rule_id,
-                        "pattern": pattern,
-                        "message": message,
-                        "matched_text": match.group(),
-                        "match_position": match.start(),
-                    }
-
-                    results["passed"] = False
-                    results["violations"].append(violation_details)
-
-                    # Create flags for RetryException
-                    flags = {
-                        "rule_violation": {
-                            "rule_id": rule_id,
-                            "pattern": pattern,
-                            "matched_text": match.group(),
-                            "message": message,
-                        }
-                    }
-                    results["flags"] = flags
-
-                    # Raise exception on first violation (as per spec)
-                    raise RetryException(message=message, flags=flags, guard_name="rule_guard")
-
-            except re.error:
-                # Invalid regex pattern - skip this rule
-                continue
+            return results, None
+
+        found = pack.scan(text)
+        if not found:
+            return results, None
+
+        for index, start, end in found:
+            rule = pack.rules[index]
+            results["violations"].append(
+                {
+                    "rule_id": rule["id"],
+                    "pattern": rule["pattern"],
+                    "message": rule["message"],
+                    "matched_text": text[start:end],
+                    "match_position": start,
+                    "span": [start, end],
+                }
+            )
+
+        # Report the first violation in rule order (as per spec), listing all of them
+        first_index, first_start, first_end = min(found)
+        first_rule = pack.rules[first_index]
+        flags = {
+            "rule_violation": {
+                "rule_id": first_rule["id"],
+                "pattern": first_rule["pattern"],
+                "matched_text": text[first_start:first_end],
+                "match_position": first_start,
+                "message": first_rule["message"],
+                "violations": [
+                    {key: violation[key] for key in ("rule_id", "message", "matched_text", "span")}
+                    for violation in results["violations"]
+                ],
+            }
+        }
+        results["passed"] = False
+        results["flags"] = flags
 
-        return results
+        return results, RetryException(
+            message=first_rule["message"], flags=flags, guard_name="rule_guard"
+        )
 
 
 def check_rule_guard(text: str, rule_path: str = None, project: str = "default") -> dict[str, Any]:
@@ -16,7 +16,7 @@ from src.plugins.foreshadow_scheduler import (
 )
 
 
-@register_guard(order=5)
+@register_guard(order=5, pure=False, resources=("foreshadow.json",))
 class ScheduleGuard(BaseGuard):
     """
     Guard that checks foreshadow resolution compliance.
@@ -35,6 +35,11 @@ class ScheduleGuard(BaseGuard):
         """
         self.project = project
 
+    @classmethod
+    def job_args(cls, draft, analysis, episode_num, session):
+        """Check the foreshadowing due by the episode."""
+        return (episode_num,)
+
     def check(self, current_episode: int) -> dict[str, any]:
         """
         Check for overdue foreshadows that need resolution.
@@ -16,9 +16,11 @@ import yaml
 from dotenv import load_dotenv
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 
+from src.core.circuit_breaker import get_circuit_breaker, guarded_critique, llm_endpoint
+from src.core.retry_budget import RetryBudget, estimate_tokens
 from src.core.retry_controller import run_with_retry
 from src.embedding.vector_store import VectorStore
-from src.exceptions import RetryException
+from src.exceptions import BudgetExhaustedException, CircuitOpenException, RetryException
 from src.plugins.critique_guard import critique_guard
 from src.prompt_loader import load_style
 
@@ -160,7 +162,7 @@ scene_8:
         client = GeminiClient(temperature=TEMP_SCENE)
 
         logger.info(f"🎬 Scene Maker… (temperature={TEMP_SCENE})")
-        result = client.generate(prompt)
+        result = client.complete(prompt)
 
         logger.info(f"Generated scenes: {len(result)} characters")
         return result
@@ -270,7 +272,7 @@ def parse_scene_yaml(yaml_content: str) -> list[dict[str, Any]]:
         raise RetryException(f"Scene parsing failed: {str(e)}", guard_name="yaml_parse") from e
 
 
-def make_scenes(beat_json: dict) -> list[dict]:
+def make_scenes(beat_json: dict, budget: RetryBudget | None = None) -> list[dict]:
     """
     Generate 8-12 scene point dictionaries for a given beat using LLM.
 
@@ -278,6 +280,9 @@ def make_scenes(beat_json: dict) -> list[dict]:
     ----------
     beat_json : dict
         Example: {"idx": 1, "summary": "Opening beat", "anchor": False}
+    budget : RetryBudget, optional
+        Episode-wide retry budget; every LLM attempt spends from it and
+        fallback scenes are used once it is exhausted
 
     Returns
     -------
@@ -323,6 +328,9 @@ def make_scenes(beat_json: dict) -> list[dict]:
 
         return scenes
 
+    # Shared per endpoint/stage so an outage seen by one beat short-circuits the next
+    breaker = get_circuit_breaker(llm_endpoint(), "scene")
+
     while loop_count < MAX_LOOP:
         try:
             # Build prompt for scene generation
@@ -330,7 +338,13 @@ def make_scenes(beat_json: dict) -> list[dict]:
 
             # Call LLM with retry logic and guard validation
             def llm_wrapper(prompt_str: str = prompt):
-                raw_output = call_llm(prompt_str)
+                if budget is not None:
+                    budget.spend_attempt("scene")
+                raw_output = breaker.call(call_llm, prompt_str)
+                if budget is not None:
+                    budget.charge_tokens(
+                        "scene", estimate_tokens(prompt_str) + estimate_tokens(raw_output)
+                    )
                 scenes = parse_scene_yaml(raw_output)
 
                 # Add beat_id to each scene
@@ -341,7 +355,7 @@ def make_scenes(beat_json: dict) -> list[dict]:
                 scenes_text = "\n".join(
                     [f"Scene {scene['idx']}: {scene['desc']}" for scene in scenes]
                 )
-                validate_scenes_with_critique(scenes_text)
+                validate_scenes_with_critique(scenes_text, budget=budget)
 
                 return scenes
 
@@ -368,7 +382,11 @@ def make_scenes(beat_json: dict) -> list[dict]:
             return scenes
 
         except Exception as e:
-            loop_count += 1
+            if isinstance(e, CircuitOpenException | BudgetExhaustedException):
+                # Endpoint is down or the episode budget is spent - fall back now
+                loop_count = MAX_LOOP
+            else:
+                loop_count += 1
             logger.warning(
                 f"Scene generation failed for beat {beat_idx} (attempt {loop_count}/{MAX_LOOP}): {e}"
             )
@@ -403,7 +421,7 @@ def make_scenes(beat_json: dict) -> list[dict]:
     return _generate_fallback_scenes(beat_idx, beat_desc)
 
 
-def validate_scenes_with_critique(scenes_text: str) -> None:
+def validate_scenes_with_critique(scenes_text: str, budget: RetryBudget | None = None) -> None:
     """
     Validate scene descriptions with critique guard.
 
@@ -411,6 +429,9 @@ def validate_scenes_with_critique(scenes_text: str) -> None:
     ----------
     scenes_text : str
         Combined text of all scenes to validate
+    budget : RetryBudget, optional
+        Episode-wide retry budget; critique is low priority and is skipped
+        when the budget can no longer afford it
 
     Raises
     ------
@@ -423,8 +444,10 @@ def validate_scenes_with_critique(scenes_text: str) -> None:
         return
 
     try:
-        critique_guard(scenes_text)
+        guarded_critique("scene_critique", scenes_text, budget, critique_guard)
         logger.info("Scene critique validation PASS")
+    except (CircuitOpenException, BudgetExhaustedException) as e:
+        logger.warning(f"Scene critique validation SKIPPED: {e}")
     except RetryException as e:
         logger.warning(f"Scene critique validation FAIL: {e}")
         raise
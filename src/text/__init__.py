@@ -0,0 +1,48 @@
+"""
+text package
+
+Shared, memoized text processing (tokens, sentences, dialog, Korean particles)
+for the Final Engine guards.
+"""
+
+from src.text.tokenizer import (
+    DIALOG_PATTERN,
+    JOSA_SUFFIXES,
+    SCENE_BREAK_PATTERN,
+    SENTENCE_PATTERN,
+    SENTENCE_SPLIT_PATTERN,
+    STOP_WORDS,
+    WORD_PATTERN,
+    clear_text_cache,
+    content_words,
+    dialog_spans,
+    lower_tokens,
+    narration_sentences,
+    sentence_spans,
+    strip_josa,
+    text_key,
+    token_spans,
+    tokenize,
+    trie_pattern,
+)
+
+__all__ = [
+    "DIALOG_PATTERN",
+    "JOSA_SUFFIXES",
+    "SCENE_BREAK_PATTERN",
+    "SENTENCE_PATTERN",
+    "SENTENCE_SPLIT_PATTERN",
+    "STOP_WORDS",
+    "WORD_PATTERN",
+    "clear_text_cache",
+    "content_words",
+    "dialog_spans",
+    "lower_tokens",
+    "narration_sentences",
+    "sentence_spans",
+    "strip_josa",
+    "text_key",
+    "token_spans",
+    "tokenize",
+    "trie_pattern",
+]
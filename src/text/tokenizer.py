@@ -0,0 +1,330 @@
+"""
+tokenizer.py
+
+Shared tokenizer for Final Engine - words, sentences, dialog and Korean particles.
+
+Guards used to tokenize drafts ad hoc: ``\\b\\w+\\b`` in the lexical, emotion
+and anchor guards, ``[.!?。！？]+`` splits in PacingGuard and particle-stripping
+regexes in AnchorGuard. All patterns now live here, compiled once, and every
+function result is memoized in a bounded LRU keyed by a hash of the text, so a
+draft is tokenized once per process no matter how many guards look at it.
+
+Memoized results are shared between callers and therefore returned as tuples.
+The cache size can be set with TEXT_CACHE_SIZE (entries per function).
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from functools import wraps
+from typing import Any, TypeVar
+
+# Word tokens (Hangul syllables, Latin letters, digits, underscore)
+WORD_PATTERN = re.compile(r"\b\w+\b")
+
+# Quoted dialog and sentence boundaries; line breaks also end Korean sentences
+DIALOG_PATTERN = re.compile(r'"([^"]*)"')
+SENTENCE_SPLIT_PATTERN = re.compile(r"[.!?。！？]+")
+SENTENCE_PATTERN = re.compile(r"[^.!?。！？\n]+[.!?。！？]*")
+
+# Explicit scene breaks: a line holding only ***, * * *, ---, ### or similar
+SCENE_BREAK_PATTERN = re.compile(r"^[ \t]*(?:[*#=~-][ \t]*){3,}$", re.MULTILINE)
+
+# Korean particles (josa) and the plain declarative ending stripped from word ends
+JOSA_SUFFIXES = ("이", "가", "를", "을", "의", "에", "와", "과", "로", "으로", "는", "은", "다")
+JOSA_PATTERN = re.compile(f"({'|'.join(JOSA_SUFFIXES)})$")
+
+# Particles and function words that carry no meaning on their own
+STOP_WORDS = frozenset(JOSA_SUFFIXES) | {"한다", "고", "도"}
+
+# Entries kept per memoized function
+CACHE_SIZE = int(os.getenv("TEXT_CACHE_SIZE", "256"))
+
+T = TypeVar("T")
+
+_memoized: list["_TextMemo"] = []
+
+
+def text_key(text: str) -> bytes:
+    """
+    Get the cache key of a text.
+
+    Parameters
+    ----------
+    text : str
+        Text to hash
+
+    Returns
+    -------
+    bytes
+        128-bit BLAKE2b digest of the UTF-8 text
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class _TextMemo:
+    """Bounded, thread-safe LRU of one function's results keyed by text hash."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> tuple[bool, Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: bytes, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def memoize_text(func: Callable[[str], T]) -> Callable[[str], T]:
+    """
+    Memoize a one-argument text function by the hash of its argument.
+
+    Parameters
+    ----------
+    func : Callable[[str], T]
+        Function of the text only, returning an immutable value
+
+    Returns
+    -------
+    Callable[[str], T]
+        Memoized function; its cache is exposed as ``cache``
+    """
+    memo = _TextMemo(CACHE_SIZE)
+    _memoized.append(memo)
+
+    @wraps(func)
+    def wrapper(text: str) -> T:
+        key = text_key(text)
+        found, value = memo.get(key)
+        if found:
+            return value
+        value = func(text)
+        memo.put(key, value)
+        return value
+
+    wrapper.cache = memo
+    return wrapper
+
+
+def clear_text_cache() -> None:
+    """Drop all memoized tokenization results."""
+    for memo in _memoized:
+        memo.clear()
+
+
+@memoize_text
+def token_spans(text: str) -> tuple[tuple[int, int], ...]:
+    """
+    Get the (start, end) character offsets of every word token.
+
+    Parameters
+    ----------
+    text : str
+        Text to tokenize
+
+    Returns
+    -------
+    Tuple[Tuple[int, int], ...]
+        Token offsets in order
+    """
+    return tuple(match.span() for match in WORD_PATTERN.finditer(text))
+
+
+@memoize_text
+def tokenize(text: str) -> tuple[str, ...]:
+    """
+    Split a text into word tokens.
+
+    Parameters
+    ----------
+    text : str
+        Text to tokenize
+
+    Returns
+    -------
+    Tuple[str, ...]
+        Word tokens in original case
+    """
+    return tuple(text[start:end] for start, end in token_spans(text))
+
+
+@memoize_text
+def lower_tokens(text: str) -> tuple[str, ...]:
+    """
+    Split the lowercased text into word tokens.
+
+    Parameters
+    ----------
+    text : str
+        Text to tokenize
+
+    Returns
+    -------
+    Tuple[str, ...]
+        Lowercased word tokens
+    """
+    return tuple(WORD_PATTERN.findall(text.lower()))
+
+
+@memoize_text
+def sentence_spans(text: str) -> tuple[tuple[int, int], ...]:
+    """
+    Get sentence offsets; line breaks are sentence boundaries.
+
+    Parameters
+    ----------
+    text : str
+        Text to split
+
+    Returns
+    -------
+    Tuple[Tuple[int, int], ...]
+        (start, end) offsets of sentences with surrounding whitespace trimmed
+        and terminating punctuation included
+    """
+    spans = []
+    for match in SENTENCE_PATTERN.finditer(text):
+        start, end = match.span()
+        sentence = match.group()
+        start += len(sentence) - len(sentence.lstrip())
+        end -= len(sentence) - len(sentence.rstrip())
+        if start < end:
+            spans.append((start, end))
+    return tuple(spans)
+
+
+@memoize_text
+def dialog_spans(text: str) -> tuple[tuple[int, int], ...]:
+    """
+    Get the offsets of quoted dialog.
+
+    Parameters
+    ----------
+    text : str
+        Text to scan
+
+    Returns
+    -------
+    Tuple[Tuple[int, int], ...]
+        (start, end) offsets of each quotation, quotes included
+    """
+    return tuple(match.span() for match in DIALOG_PATTERN.finditer(text))
+
+
+@memoize_text
+def narration_sentences(text: str) -> tuple[str, ...]:
+    """
+    Split the narration of a text (all quoted dialog removed) into sentences.
+
+    Parameters
+    ----------
+    text : str
+        Text to split
+
+    Returns
+    -------
+    Tuple[str, ...]
+        Non-empty, whitespace-trimmed narration sentences
+    """
+    narration = DIALOG_PATTERN.sub("", text)
+    sentences = (sentence.strip() for sentence in SENTENCE_SPLIT_PATTERN.split(narration))
+    return tuple(sentence for sentence in sentences if sentence)
+
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the keywords, factored into a prefix trie.
+
+    At every position the regex engine follows one trie path instead of
+    trying each keyword, so matching costs O(longest keyword) per position.
+
+    Parameters
+    ----------
+    keywords : Iterable[str]
+        Literal keywords; empty strings are ignored
+
+    Returns
+    -------
+    str
+        Regex source (without capturing groups); "(?!)", which never
+        matches, when there are no keywords
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        if not keyword:
+            continue
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return build(trie) if trie else "(?!)"
+
+
+def strip_josa(word: str) -> str:
+    """
+    Remove one trailing Korean particle (josa) or the ending 다 from a word.
+
+    Parameters
+    ----------
+    word : str
+        Word token, e.g. "주인공이" or "등장한다"
+
+    Returns
+    -------
+    str
+        Word without its particle, e.g. "주인공" or "등장한"
+    """
+    return JOSA_PATTERN.sub("", word)
+
+
+@memoize_text
+def content_words(text: str) -> tuple[str, ...]:
+    """
+    Get the meaningful root words of a short text such as an anchor goal.
+
+    Parameters
+    ----------
+    text : str
+        Text to analyze
+
+    Returns
+    -------
+    Tuple[str, ...]
+        Words with particles stripped, keeping words of at least two
+        characters that are not stop words
+    """
+    words = (strip_josa(word) for word in tokenize(text))
+    return tuple(word for word in words if len(word) >= 2 and word not in STOP_WORDS)
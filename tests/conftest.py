@@ -29,6 +29,44 @@ def project_id():
     return PROJECT_ID
 
 
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Start every test with closed circuits so failures in one test don't leak."""
+    from src.core.circuit_breaker import reset_circuit_breakers as _reset
+
+    _reset()
+    yield
+    _reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_guard_sessions():
+    """Start every test without cached guard instances, configuration or results."""
+    from src.core.emotion_profiles import reset_emotion_stores
+    from src.core.guard_cache import reset_result_caches
+    from src.core.guard_session import reset_guard_sessions as _reset
+    from src.core.ngram_index import reset_ngram_indexes
+    from src.core.pacing_history import reset_pacing_histories
+    from src.plugins.relation_guard import reset_relation_timelines
+    from src.plugins.rule_guard import reset_rule_packs
+
+    _reset()
+    reset_result_caches()
+    reset_ngram_indexes()
+    reset_emotion_stores()
+    reset_pacing_histories()
+    reset_rule_packs()
+    reset_relation_timelines()
+    yield
+    _reset()
+    reset_result_caches()
+    reset_ngram_indexes()
+    reset_emotion_stores()
+    reset_pacing_histories()
+    reset_rule_packs()
+    reset_relation_timelines()
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_project():
     """
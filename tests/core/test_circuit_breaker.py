@@ -0,0 +1,282 @@
+"""
+test_circuit_breaker.py
+
+Tests for the Circuit Breaker - state transitions and pipeline short-circuiting.
+"""
+
+import os
+import sys
+import types
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    get_circuit_breaker,
+    guarded_critique,
+    llm_endpoint,
+    reset_circuit_breakers,
+)
+from src.exceptions import CircuitOpenException, RetryException
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock=None, **kwargs):
+    settings = {
+        "failure_rate_threshold": 0.5,
+        "window_size": 4,
+        "min_calls": 4,
+        "reset_timeout": 10.0,
+    }
+    settings.update(kwargs)
+    return CircuitBreaker("test/stage", clock=clock or FakeClock(), **settings)
+
+
+class TestCircuitBreaker:
+    """Test class for circuit breaker state machine."""
+
+    def test_starts_closed(self):
+        """Test that a new breaker allows requests."""
+        breaker = make_breaker()
+
+        assert breaker.state == CLOSED
+        assert breaker.allow_request() is True
+
+    def test_does_not_open_before_min_calls(self):
+        """Test that failures below min_calls keep the circuit closed."""
+        breaker = make_breaker()
+
+        for _ in range(3):
+            breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_opens_on_failure_rate(self):
+        """Test that reaching the failure rate threshold opens the circuit."""
+        breaker = make_breaker()
+
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.allow_request() is False
+
+    def test_call_rejected_while_open(self):
+        """Test that call() raises CircuitOpenException without calling func."""
+        breaker = make_breaker()
+        for _ in range(4):
+            breaker.record_failure()
+
+        func = Mock(return_value="ok")
+        with pytest.raises(CircuitOpenException) as exc_info:
+            breaker.call(func)
+
+        func.assert_not_called()
+        assert exc_info.value.circuit_name == "test/stage"
+
+    def test_half_open_after_timeout_then_close_on_success(self):
+        """Test open → half-open → closed transition."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure()
+
+        clock.now = 10.0
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request() is True
+        # Only one trial call at a time
+        assert breaker.allow_request() is False
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.failure_rate() == 0.0
+
+    def test_half_open_failure_reopens(self):
+        """Test that a failed trial call re-opens the circuit for another timeout."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure()
+
+        clock.now = 10.0
+        assert breaker.call is not None
+        with pytest.raises(RetryException):
+            breaker.call(Mock(side_effect=RetryException("still down")))
+
+        assert breaker.state == OPEN
+        clock.now = 15.0
+        assert breaker.state == OPEN
+        clock.now = 20.0
+        assert breaker.state == HALF_OPEN
+
+    def test_excluded_exceptions_count_as_success(self):
+        """Test that excluded exception types do not trip the circuit."""
+        breaker = make_breaker(excluded_exceptions=(RetryException,))
+
+        for _ in range(6):
+            with pytest.raises(RetryException):
+                breaker.call(Mock(side_effect=RetryException("low score")))
+
+        assert breaker.state == CLOSED
+        assert breaker.failure_rate() == 0.0
+
+    def test_reset(self):
+        """Test that reset() closes the circuit."""
+        breaker = make_breaker()
+        for _ in range(4):
+            breaker.record_failure()
+
+        breaker.reset()
+
+        assert breaker.state == CLOSED
+        assert breaker.allow_request() is True
+
+
+class TestCircuitBreakerRegistry:
+    """Test class for shared per-endpoint/stage breakers."""
+
+    def test_shared_per_endpoint_and_stage(self):
+        """Test that the same key returns the same breaker."""
+        first = get_circuit_breaker("gemini", "scene")
+        second = get_circuit_breaker("gemini", "scene")
+        other_stage = get_circuit_breaker("gemini", "beat")
+
+        assert first is second
+        assert first is not other_stage
+
+    def test_env_configuration(self, monkeypatch):
+        """Test that environment variables configure new breakers."""
+        monkeypatch.setenv("CB_MIN_CALLS", "2")
+        monkeypatch.setenv("CB_RESET_TIMEOUT", "5")
+
+        breaker = get_circuit_breaker("gemini", "env")
+
+        assert breaker.min_calls == 2
+        assert breaker.reset_timeout == 5.0
+
+    def test_reset_circuit_breakers(self):
+        """Test that reset_circuit_breakers drops shared state."""
+        first = get_circuit_breaker("gemini", "scene")
+        reset_circuit_breakers()
+
+        assert get_circuit_breaker("gemini", "scene") is not first
+
+
+class TestGuardedCritique:
+    """Test the budgeted, circuit-protected critique call."""
+
+    def test_failing_verdict_charged_and_not_an_outage(self):
+        """Test that a critique verdict is charged but never opens the circuit."""
+        budget = Mock()
+        critique = Mock(side_effect=RetryException("Low scores", guard_name="critique_guard"))
+
+        for _ in range(4):
+            with pytest.raises(RetryException):
+                guarded_critique("test_critique", "some text", budget, critique)
+
+        assert get_circuit_breaker(llm_endpoint(), "test_critique").state == CLOSED
+        assert budget.spend_attempt.call_count == 4
+        assert budget.charge_tokens.call_count == 4
+
+    def test_open_circuit_skips_critique(self):
+        """Test that an open circuit rejects the call before the critique runs."""
+        critique = Mock()
+        breaker = get_circuit_breaker(llm_endpoint(), "test_critique")
+        for _ in range(breaker.min_calls):
+            breaker.record_failure()
+
+        with pytest.raises(CircuitOpenException):
+            guarded_critique("test_critique", "some text", None, critique)
+
+        critique.assert_not_called()
+
+
+class TestPipelineShortCircuit:
+    """Test that open circuits route generation straight to fallbacks."""
+
+    @patch("src.beat_planner.call_llm")
+    @patch("src.core.retry_controller.time.sleep")
+    def test_plan_beats_stops_calling_llm_when_open(self, mock_sleep, mock_llm, monkeypatch):
+        """Test that remaining sequences use fallback beats once the circuit opens."""
+        from src.beat_planner import generate_fallback_beats, plan_beats
+
+        monkeypatch.setenv("GOOGLE_API_KEY", "test_key")
+        monkeypatch.delenv("UNIT_TEST_MODE", raising=False)
+        monkeypatch.setenv("CB_MIN_CALLS", "4")
+        mock_llm.side_effect = RetryException("LLM failed", guard_name="llm_call")
+
+        result = plan_beats(1)
+
+        # First sequence burns 3 attempts, the 4th failure opens the circuit
+        assert mock_llm.call_count == 4
+        episode = result["ep_1"]
+        for seq_num in range(1, 7):
+            assert episode[f"seq_{seq_num}"] == generate_fallback_beats(seq_num)
+
+    @patch("src.scene_maker.VectorStore")
+    @patch("src.scene_maker.call_llm")
+    @patch("src.core.retry_controller.time.sleep")
+    def test_make_scenes_falls_back_immediately_when_open(
+        self, mock_sleep, mock_llm, mock_vector_store
+    ):
+        """Test that make_scenes skips the MAX_LOOP cycle while the circuit is open."""
+        from src.core.circuit_breaker import llm_endpoint
+        from src.scene_maker import make_scenes
+
+        breaker = get_circuit_breaker(llm_endpoint(), "scene")
+        for _ in range(breaker.min_calls):
+            breaker.record_failure()
+
+        with patch.dict(os.environ, {"FAST_MODE": "0", "UNIT_TEST_MODE": "0"}):
+            scenes = make_scenes({"idx": 1, "summary": "Opening beat"})
+
+        mock_llm.assert_not_called()
+        assert len(scenes) == 10
+        assert all(scene["type"] == "placeholder" for scene in scenes)
+
+    @patch("src.core.retry_controller.time.sleep")
+    def test_client_errors_open_the_circuit(self, mock_sleep, monkeypatch):
+        """Test that API errors from the client itself are recorded as failures."""
+        from src.beat_planner import generate_fallback_beats, plan_beats
+
+        calls = []
+
+        class FailingClient:
+            def __init__(self, *_, **__): ...
+
+            def complete(self, prompt):
+                calls.append(prompt)
+                raise ConnectionError("API unavailable")
+
+            def generate(self, prompt, *_, **__):
+                # The swallowing fallback path must not be used by the stages
+                return "Episode 0\n\n[PLACEHOLDER DRAFT CONTENT]"
+
+        fake_module = types.ModuleType("src.llm.gemini_client")
+        fake_module.GeminiClient = FailingClient
+        monkeypatch.setitem(sys.modules, "src.llm.gemini_client", fake_module)
+        monkeypatch.setenv("GOOGLE_API_KEY", "test_key")
+        monkeypatch.delenv("UNIT_TEST_MODE", raising=False)
+        monkeypatch.delenv("FAST_MODE", raising=False)
+
+        result = plan_beats(1)
+
+        assert len(calls) == 4
+        assert get_circuit_breaker(llm_endpoint(), "beat").state == OPEN
+        assert result["ep_1"]["seq_6"] == generate_fallback_beats(6)
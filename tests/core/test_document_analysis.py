@@ -0,0 +1,124 @@
+"""
+test_document_analysis.py
+
+Tests for the shared DocumentAnalysis and guards consuming it.
+"""
+
+import re
+
+import pytest
+
+from src.core.document_analysis import DocumentAnalysis, as_analysis
+from src.exceptions import RetryException
+from src.plugins.emotion_guard import check_emotion_guard, classify_emotions
+from src.plugins.lexi_guard import calculate_3gram_duplication_rate, calculate_ttr
+from src.plugins.pacing_guard import PacingGuard
+
+SAMPLE = (
+    'He ran to the gate. "Open it now!" she shouted. '
+    "He felt afraid and worried.\n"
+    'The guard laughed. "No."  Happy endings are rare.'
+)
+
+
+class TestDocumentAnalysis:
+    """Test class for cached text views."""
+
+    def test_tokens_match_regex_tokenization(self):
+        """Test that tokens equal a direct regex tokenization."""
+        analysis = DocumentAnalysis(SAMPLE)
+
+        assert analysis.lower_tokens == re.findall(r"\b\w+\b", SAMPLE.lower())
+        assert analysis.tokens == re.findall(r"\b\w+\b", SAMPLE)
+        start, end = analysis.token_spans[0]
+        assert SAMPLE[start:end] == "He"
+
+    def test_views_are_cached(self):
+        """Test that each view is computed once per analysis."""
+        analysis = DocumentAnalysis(SAMPLE)
+
+        assert analysis.lower_tokens is analysis.lower_tokens
+        assert analysis.scenes is analysis.scenes
+        assert as_analysis(analysis) is analysis
+
+    def test_dialog_and_narration(self):
+        """Test dialog extraction and narration sentences without dialog."""
+        analysis = DocumentAnalysis(SAMPLE)
+
+        assert analysis.dialog_lines == ["Open it now!", "No."]
+        assert analysis.narration_sentences == [
+            "He ran to the gate",
+            "she shouted",
+            "He felt afraid and worried",
+            "The guard laughed",
+            "Happy endings are rare",
+        ]
+
+    def test_sentence_spans(self):
+        """Test that sentence spans are trimmed and split on newlines."""
+        analysis = DocumentAnalysis("First one.  Second!\nThird")
+
+        assert analysis.sentences == ["First one.", "Second!", "Third"]
+
+    def test_scenes_from_breaks_or_thirds(self):
+        """Test scene segmentation with and without explicit scene breaks."""
+        with_breaks = DocumentAnalysis("Scene one.\n***\nScene two.\n- - -\nScene three.")
+        without_breaks = DocumentAnalysis("abcdefghi")
+
+        assert [s.text.strip() for s in with_breaks.scenes] == [
+            "Scene one.",
+            "Scene two.",
+            "Scene three.",
+        ]
+        assert [s.text for s in without_breaks.scenes] == ["abc", "def", "ghi"]
+
+
+class TestGuardsWithAnalysis:
+    """Test class for guards accepting a DocumentAnalysis."""
+
+    def test_lexi_metrics_identical(self):
+        """Test that lexical metrics match for text and analysis."""
+        analysis = DocumentAnalysis(SAMPLE)
+
+        assert calculate_ttr(analysis) == calculate_ttr(SAMPLE)
+        assert calculate_3gram_duplication_rate(analysis) == calculate_3gram_duplication_rate(
+            SAMPLE
+        )
+
+    def test_lexi_metrics_share_one_encoding(self):
+        """Test that both lexical metrics reuse the analysis' cached token ids."""
+        analysis = DocumentAnalysis("the cat sat on the cat sat")
+
+        calculate_ttr(analysis)
+        vocab, ids = analysis.token_ids
+        calculate_3gram_duplication_rate(analysis)
+
+        assert analysis.token_ids[1] is ids
+        assert vocab == ["the", "cat", "sat", "on"]
+        assert ids.tolist() == [0, 1, 2, 3, 0, 1, 2]
+
+    def test_emotion_results_identical(self):
+        """Test that emotion classification and deltas match for text and analysis."""
+        prev_text = "This is neutral content from previous episode."
+        analysis = DocumentAnalysis(SAMPLE)
+
+        assert classify_emotions(analysis) == classify_emotions(SAMPLE)
+        try:
+            from_text = check_emotion_guard(prev_text, SAMPLE)
+        except RetryException as e:
+            with pytest.raises(RetryException) as exc_info:
+                check_emotion_guard(prev_text, analysis)
+            assert exc_info.value.flags == e.flags
+        else:
+            assert check_emotion_guard(prev_text, analysis) == from_text
+
+    def test_pacing_accepts_whole_draft_analysis(self):
+        """Test that PacingGuard analyzes a draft analysis like its scene list."""
+        guard = PacingGuard(project="test")
+        guard.config = {"tolerance": 10.0, "window": 10}
+        analysis = DocumentAnalysis(SAMPLE)
+
+        result = guard.check(analysis, 1)
+
+        assert result["passed"] is True
+        assert result["current_ratios"] == guard._analyze_text_content(SAMPLE)
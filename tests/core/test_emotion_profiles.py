@@ -0,0 +1,64 @@
+"""
+test_emotion_profiles.py
+
+Tests for EmotionProfileStore - stored per-episode emotion vectors.
+"""
+
+import numpy as np
+import pytest
+
+from src.core.emotion_profiles import EmotionProfileStore, emotion_profile, get_emotion_store
+from src.exceptions import RetryException
+from src.plugins.emotion_guard import EmotionGuard, classify_emotions, emotions_to_vector
+
+EPISODE = "I am so happy and joyful today!\n***\nThe road was long.\n***\nterrified horror fear"
+
+
+class TestEmotionProfileStore:
+    """Test class for episode emotion profiles."""
+
+    def test_profile_vectors(self):
+        """Test that a profile holds the episode, opening and closing scene vectors."""
+        profile = emotion_profile(EPISODE)
+
+        assert profile.shape == (3, 7)
+        for row, text in zip(
+            profile,
+            [EPISODE, "I am so happy and joyful today!", "terrified horror fear"],
+            strict=True,
+        ):
+            np.testing.assert_allclose(row, emotions_to_vector(classify_emotions(text)))
+
+    def test_get_and_put(self):
+        """Test lookups of stored and unknown episodes."""
+        store = EmotionProfileStore()
+        stored = store.put(3, EPISODE)
+
+        assert store.get(3) == stored
+        assert store.get(2) is None
+        assert store.get(4) is None
+        assert store.get(-1) is None
+
+    def test_persisted_profiles_reload(self, tmp_path):
+        """Test that profiles survive a new store instance."""
+        path = tmp_path / "emotion_profiles.npy"
+        EmotionProfileStore(path).put(1, EPISODE)
+        EmotionProfileStore(path).put(2, "calm quiet day")
+
+        reloaded = EmotionProfileStore(path)
+        assert reloaded.get(1)["closing"] == pytest.approx(emotion_profile(EPISODE)[2].tolist())
+        assert reloaded.get(2) is not None
+        assert np.load(path).shape == (3, 3, 7)
+
+    def test_shared_store_per_project(self):
+        """Test that the shared store is reused per project."""
+        assert get_emotion_store("demo") is get_emotion_store("demo")
+        assert get_emotion_store("demo") is not get_emotion_store("other")
+
+    def test_guard_accepts_stored_vector(self):
+        """Test that EmotionGuard compares a stored closing vector with new text."""
+        closing = EmotionProfileStore().put(1, EPISODE)["closing"]
+
+        assert EmotionGuard().check(closing, "fear dread terrified")["passed"] is True
+        with pytest.raises(RetryException):
+            EmotionGuard().check(closing, "I am so happy and joyful, smiling and laughing")
@@ -0,0 +1,216 @@
+"""
+test_guard_cache.py
+
+Tests for GuardResultCache - memoized guard results keyed by inputs and config.
+"""
+
+import os
+
+import pytest
+
+from src.core.document_analysis import DocumentAnalysis
+from src.core.guard_cache import GuardResultCache, get_result_cache, reset_result_caches
+from src.core.guard_executor import execute_guards
+from src.core.guard_registry import BaseGuard
+from src.core.guard_stats import GuardStats
+from src.exceptions import RetryException
+
+
+def touch_later(path, content):
+    """Rewrite a file and move its mtime forward so the change is always visible."""
+    path.write_text(content, encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class CountingGuard(BaseGuard):
+    """Guard failing on texts containing "bad", counting its checks."""
+
+    def __init__(self, threshold=1):
+        self.threshold = threshold
+        self.calls = 0
+
+    def cache_params(self):
+        return {"threshold": self.threshold}
+
+    def check(self, text):
+        self.calls += 1
+        if "bad" in str(getattr(text, "text", text)):
+            raise RetryException("bad text", flags={"word": "bad"}, guard_name="counting")
+        return {"passed": True, "length": len(text), "flags": {}}
+
+
+class TestGuardResultCache:
+    """Test class for guard result memoization."""
+
+    def test_passed_result_replayed(self):
+        """Test that a repeated check on the same text is a lookup."""
+        cache = GuardResultCache()
+        guard = CountingGuard()
+
+        first = cache.call(guard, "good text")
+        second = cache.call(guard, "good text")
+
+        assert first == second == {"passed": True, "length": 9, "flags": {}}
+        assert guard.calls == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_cached_result_is_a_copy(self):
+        """Test that callers mutating a result do not corrupt the cache."""
+        cache = GuardResultCache()
+        guard = CountingGuard()
+
+        cache.call(guard, "good text")["flags"]["added"] = True
+
+        assert cache.call(guard, "good text")["flags"] == {}
+
+    def test_failure_replayed(self):
+        """Test that a cached failure is raised again with its payload."""
+        cache = GuardResultCache()
+        guard = CountingGuard()
+
+        for _ in range(2):
+            with pytest.raises(RetryException) as exc_info:
+                cache.call(guard, "bad text")
+            assert exc_info.value.flags == {"word": "bad"}
+            assert exc_info.value.guard_name == "counting"
+            assert "bad text" in str(exc_info.value)
+
+        assert guard.calls == 1
+
+    def test_key_covers_inputs_and_params(self):
+        """Test that other texts and settings miss the cache."""
+        cache = GuardResultCache()
+        guard = CountingGuard()
+        strict = CountingGuard(threshold=2)
+
+        cache.call(guard, "good text")
+        cache.call(guard, "other text")
+        cache.call(strict, "good text")
+
+        assert guard.calls == 2
+        assert strict.calls == 1
+
+    def test_analysis_keyed_by_text(self):
+        """Test that analyses of equal text share an entry."""
+        cache = GuardResultCache()
+        guard = CountingGuard()
+
+        cache.call(guard, DocumentAnalysis("good text"))
+        cache.call(guard, DocumentAnalysis("good text"))
+
+        assert guard.calls == 1
+
+    def test_version_invalidates(self):
+        """Test that bumping a guard's version misses the cache."""
+        cache = GuardResultCache()
+
+        class NewCountingGuard(CountingGuard):
+            version = "2"
+
+        old = CountingGuard()
+        cache.call(old, "good text")
+        key_old = cache.key_for(old, ("good text",), {})
+        key_new = cache.key_for(NewCountingGuard(), ("good text",), {})
+
+        assert key_old != key_new
+
+    def test_config_change_invalidates(self, tmp_path):
+        """Test that editing a config file misses the cache."""
+        config = tmp_path / "rules.json"
+        config.write_text("[]", encoding="utf-8")
+
+        class ConfiguredGuard(CountingGuard):
+            def config_paths(self):
+                return [config]
+
+        cache = GuardResultCache()
+        guard = ConfiguredGuard()
+        cache.call(guard, "good text")
+        cache.call(guard, "good text")
+        touch_later(config, '["x"]')
+        cache.call(guard, "good text")
+
+        assert guard.calls == 2
+
+    def test_stateful_and_opted_out_guards_not_cached(self):
+        """Test that impure and non-cacheable guards always run."""
+
+        class StatefulGuard(CountingGuard):
+            pure = False
+
+        class VolatileGuard(CountingGuard):
+            cacheable = False
+
+        cache = GuardResultCache()
+        for guard in (StatefulGuard(), VolatileGuard()):
+            cache.call(guard, "good text")
+            cache.call(guard, "good text")
+            assert guard.calls == 2
+            assert cache.key_for(guard, ("good text",), {}) is None
+
+    def test_lru_eviction(self):
+        """Test that the in-memory cache keeps at most max_entries."""
+        cache = GuardResultCache(max_entries=2)
+        guard = CountingGuard()
+
+        for text in ("a", "b", "c", "a"):
+            cache.call(guard, text)
+
+        assert guard.calls == 4
+
+    def test_disk_cache_survives_restart(self, tmp_path):
+        """Test that disk entries are reused by a new cache instance."""
+        guard = CountingGuard()
+        GuardResultCache(tmp_path).call(guard, "good text")
+        with pytest.raises(RetryException):
+            GuardResultCache(tmp_path).call(guard, "bad text")
+
+        restarted = GuardResultCache(tmp_path)
+        assert restarted.call(guard, "good text")["length"] == 9
+        with pytest.raises(RetryException):
+            restarted.call(guard, "bad text")
+        assert guard.calls == 2
+
+    @pytest.mark.parametrize("text, passed", [("good text", True), ("bad text", False)])
+    def test_hits_not_recorded_in_guard_stats(self, text, passed):
+        """Test that replayed outcomes are marked cached and left out of GuardStats."""
+        cache = GuardResultCache()
+        guard = CountingGuard()
+        stats = GuardStats()
+
+        reports = [
+            execute_guards({CountingGuard: lambda: cache.call(guard, text)}, stats=stats)
+            for _ in range(3)
+        ]
+
+        assert guard.calls == 1
+        assert [r["results"]["CountingGuard"]["cached"] for r in reports] == [False, True, True]
+        assert [r["passed"] for r in reports] == [passed] * 3
+        assert stats.stats["CountingGuard"]["runs"] == 1
+        assert stats.stats["CountingGuard"]["failures"] == (0 if passed else 1)
+
+
+class TestSharedResultCache:
+    """Test class for per-project caches selected by GUARD_CACHE."""
+
+    def test_shared_per_project(self, monkeypatch):
+        """Test that a project's cache is reused until reset."""
+        monkeypatch.delenv("GUARD_CACHE", raising=False)
+        cache = get_result_cache("demo")
+
+        assert cache is get_result_cache("demo")
+        assert cache is not get_result_cache("other")
+        assert cache.directory is None
+
+        reset_result_caches()
+        assert get_result_cache("demo") is not cache
+
+    def test_off_and_disk_modes(self, monkeypatch):
+        """Test that GUARD_CACHE selects no cache or a disk cache."""
+        monkeypatch.setenv("GUARD_CACHE", "off")
+        assert get_result_cache("demo") is None
+
+        reset_result_caches()
+        monkeypatch.setenv("GUARD_CACHE", "disk")
+        assert get_result_cache("demo").directory.name == "guard_cache"
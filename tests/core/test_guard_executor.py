@@ -0,0 +1,303 @@
+"""
+test_guard_executor.py
+
+Tests for the guard executor - lane planning, concurrency and the combined report.
+"""
+
+import os
+import pstats
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.core.guard_executor import execute_guards, plan_lanes
+from src.core.guard_registry import BaseGuard, add_guard_hook, remove_guard_hook
+from src.core.guard_stats import GuardStats
+from src.exceptions import GuardTimeoutException, RetryException
+
+
+def make_guard(name, pure=True, resources=()):
+    """Create a guard class with the given declarations."""
+    return type(
+        name,
+        (BaseGuard,),
+        {"pure": pure, "resources": frozenset(resources), "check": lambda self: {}},
+    )
+
+
+class TestPlanLanes:
+    """Test class for grouping guards into lanes."""
+
+    def test_stateful_guards_share_one_lane(self):
+        """Test that stateful guards are serialized in registry order."""
+        date = make_guard("DateGuard", pure=False, resources=("dates",))
+        lexi = make_guard("LexiGuard")
+        schedule = make_guard("ScheduleGuard", pure=False, resources=("foreshadow",))
+        rule = make_guard("RuleGuard")
+
+        lanes = plan_lanes([date, lexi, schedule, rule])
+
+        assert lanes == [[date, schedule], [lexi], [rule]]
+
+    def test_shared_resources_are_serialized(self):
+        """Test that pure guards sharing a resource run in the same lane."""
+        first = make_guard("First", resources=("llm",))
+        other = make_guard("Other")
+        second = make_guard("Second", resources=("llm",))
+
+        assert plan_lanes([first, other, second]) == [[first, second], [other]]
+
+    def test_real_guards_lanes(self):
+        """Test lanes for the registered plugin guards."""
+        from src.plugins.date_guard import DateGuard
+        from src.plugins.immutable_guard import ImmutableGuard
+        from src.plugins.lexi_guard import LexiGuard
+        from src.plugins.schedule_guard import ScheduleGuard
+
+        lanes = plan_lanes([DateGuard, LexiGuard, ScheduleGuard, ImmutableGuard])
+
+        assert lanes == [[DateGuard, ScheduleGuard, ImmutableGuard], [LexiGuard]]
+
+
+class TestExecuteGuards:
+    """Test class for running guard jobs."""
+
+    def test_pure_guards_run_concurrently(self):
+        """Test that independent guards overlap in time."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def job():
+            barrier.wait()
+            return {"passed": True}
+
+        jobs = {make_guard("A"): job, make_guard("B"): job}
+
+        with patch.dict(os.environ, {"GUARD_PARALLEL": "1"}):
+            report = execute_guards(jobs)
+
+        assert report["passed"] is True
+        assert [entry["status"] for entry in report["results"].values()] == ["passed"] * 2
+
+    def test_report_collects_failures_and_errors(self):
+        """Test that failures and errors are reported in registry order."""
+        failure = RetryException("bad", flags={"x": {}}, guard_name="fail_guard")
+
+        def fail():
+            raise failure
+
+        def crash():
+            raise ValueError("boom")
+
+        jobs = {
+            make_guard("FailGuard"): fail,
+            make_guard("OkGuard"): lambda: {"passed": True},
+            make_guard("CrashGuard"): crash,
+        }
+
+        report = execute_guards(jobs)
+
+        assert report["passed"] is False
+        assert list(report["results"]) == ["FailGuard", "OkGuard", "CrashGuard"]
+        assert report["failures"] == {"FailGuard": failure}
+        assert report["results"]["CrashGuard"]["status"] == "error"
+        assert report["results"]["OkGuard"]["result"] == {"passed": True}
+        assert all(entry["elapsed"] >= 0 for entry in report["results"].values())
+
+    def test_stateful_guards_keep_order(self):
+        """Test that stateful guards run one after another in order."""
+        calls = []
+
+        def record(name):
+            return lambda: calls.append(name)
+
+        jobs = {
+            make_guard("DateGuard", pure=False): record("date"),
+            make_guard("LexiGuard"): lambda: None,
+            make_guard("ImmutableGuard", pure=False): record("immutable"),
+        }
+
+        report = execute_guards(jobs)
+
+        assert calls == ["date", "immutable"]
+        assert report["lanes"] == [["DateGuard", "ImmutableGuard"], ["LexiGuard"]]
+
+    def test_sequential_mode(self):
+        """Test that GUARD_PARALLEL=0 runs everything on the calling thread."""
+        threads = []
+
+        def job():
+            threads.append(threading.current_thread())
+
+        jobs = {make_guard("A"): job, make_guard("B"): job}
+
+        with patch.dict(os.environ, {"GUARD_PARALLEL": "0"}):
+            execute_guards(jobs)
+
+        assert threads == [threading.current_thread()] * 2
+
+    def test_slow_guard_times_out(self):
+        """Test that a guard over its budget gets the timeout outcome and the chain moves on."""
+        release = threading.Event()
+        slow = make_guard("SlowGuard")
+        slow.timeout = 0.1
+        jobs = {slow: lambda: release.wait(5), make_guard("OkGuard"): lambda: {"passed": True}}
+
+        try:
+            report = execute_guards(jobs)
+        finally:
+            release.set()
+
+        entry = report["results"]["SlowGuard"]
+        assert entry["status"] == "timeout"
+        assert isinstance(entry["error"], GuardTimeoutException)
+        assert entry["elapsed"] < 1
+        assert report["timeouts"] == ["SlowGuard"]
+        assert report["failures"] == {}
+        assert report["passed"] is False
+        assert report["results"]["OkGuard"]["status"] == "passed"
+
+    def test_stateful_timeout_waits_for_the_check(self):
+        """Test that a timed-out stateful guard finishes before the next stateful guard runs."""
+        calls = []
+        slow = make_guard("DateGuard", pure=False)
+        slow.timeout = 0.05
+
+        def slow_job():
+            threading.Event().wait(0.3)
+            calls.append("date")
+
+        jobs = {slow: slow_job, make_guard("ScheduleGuard", pure=False): lambda: calls.append("s")}
+
+        report = execute_guards(jobs)
+
+        assert calls == ["date", "s"]
+        assert report["results"]["DateGuard"]["status"] == "timeout"
+        assert report["timeouts_enforced"] is True
+
+    def test_hung_stateful_guard_blocks_only_its_lane(self):
+        """Test that a stateful check still running after the grace period skips its lane."""
+        release = threading.Event()
+        calls = []
+        hung = make_guard("DateGuard", pure=False)
+        hung.timeout = 0.05
+        jobs = {
+            hung: lambda: release.wait(5),
+            make_guard("ScheduleGuard", pure=False): lambda: calls.append("schedule"),
+            make_guard("LexiGuard"): lambda: calls.append("lexi"),
+        }
+
+        try:
+            with patch.dict(os.environ, {"GUARD_TIMEOUT_GRACE": "0.05"}):
+                report = execute_guards(jobs)
+        finally:
+            release.set()
+
+        assert calls == ["lexi"]
+        assert report["elapsed"] < 1
+        assert report["results"]["DateGuard"]["status"] == "timeout"
+        skipped = report["results"]["ScheduleGuard"]
+        assert skipped["status"] == "skipped"
+        assert isinstance(skipped["error"], GuardTimeoutException)
+        assert report["skipped"] == ["ScheduleGuard"]
+
+    def test_timeouts_recorded_as_failures(self):
+        """Test that a timeout counts as a failure costing the whole budget."""
+        release = threading.Event()
+        slow = make_guard("SlowGuard")
+        slow.timeout = 0.05
+        stats = GuardStats()
+
+        try:
+            execute_guards({slow: lambda: release.wait(5)}, stats=stats)
+        finally:
+            release.set()
+
+        entry = stats.stats["SlowGuard"]
+        assert entry["runs"] == 1
+        assert entry["failures"] == 1
+        assert entry["seconds"] == 0.05
+
+    def test_sequential_mode_reports_unenforced_timeouts(self):
+        """Test that GUARD_PARALLEL=0 reports that time budgets are not enforced."""
+        slow = make_guard("SlowGuard")
+        slow.timeout = 0.01
+
+        with patch.dict(os.environ, {"GUARD_PARALLEL": "0"}):
+            report = execute_guards({slow: lambda: threading.Event().wait(0.05)})
+
+        assert report["timeouts_enforced"] is False
+        assert report["results"]["SlowGuard"]["status"] == "passed"
+
+    def test_default_timeout_from_environment(self):
+        """Test that GUARD_TIMEOUT applies to guards without their own budget."""
+        release = threading.Event()
+        jobs = {make_guard("SlowGuard"): lambda: release.wait(5)}
+
+        try:
+            with patch.dict(os.environ, {"GUARD_TIMEOUT": "0.1"}):
+                report = execute_guards(jobs)
+        finally:
+            release.set()
+
+        assert report["results"]["SlowGuard"]["status"] == "timeout"
+
+
+class TestGuardProfiling:
+    """Test class for per-invocation timings, hooks and cProfile output."""
+
+    def test_entries_record_timings_and_input_size(self):
+        """Test that each entry carries wall/CPU time, input size and episode."""
+        guard = make_guard("LexiGuard")
+
+        def job():
+            return sum(range(10000))
+
+        report = execute_guards({guard: job}, episode=3, input_sizes={guard: 1200})
+        entry = report["results"]["LexiGuard"]
+
+        assert entry["episode"] == 3
+        assert entry["input_size"] == 1200
+        assert entry["elapsed"] >= 0 and entry["cpu"] >= 0
+
+    def test_pre_and_post_hooks(self):
+        """Test that hooks see every invocation and hook errors are contained."""
+        seen = []
+
+        def pre(guard_name, entry):
+            seen.append(("pre", guard_name, "status" in entry))
+
+        def post(guard_name, entry):
+            seen.append(("post", guard_name, entry["status"]))
+
+        def broken(guard_name, entry):
+            raise RuntimeError("hook bug")
+
+        for stage, hook in (("pre", pre), ("post", post), ("post", broken)):
+            add_guard_hook(stage, hook)
+        try:
+            report = execute_guards({make_guard("RuleGuard"): lambda: {"passed": True}})
+        finally:
+            for stage, hook in (("pre", pre), ("post", post), ("post", broken)):
+                remove_guard_hook(stage, hook)
+
+        assert report["passed"] is True
+        assert seen == [("pre", "RuleGuard", False), ("post", "RuleGuard", "passed")]
+
+    def test_unknown_hook_stage(self):
+        """Test that only pre and post hooks are accepted."""
+        with pytest.raises(ValueError):
+            add_guard_hook("during", lambda guard_name, entry: None)
+
+    def test_profile_written_for_selected_guard(self, tmp_path):
+        """Test that GUARD_PROFILE writes one .prof per episode for that guard only."""
+        jobs = {make_guard("PacingGuard"): lambda: {}, make_guard("LexiGuard"): lambda: {}}
+
+        with patch.dict(os.environ, {"GUARD_PROFILE": "PacingGuard"}):
+            report = execute_guards(jobs, episode=7, profile_dir=tmp_path)
+
+        profile = tmp_path / "PacingGuard_episode_7.prof"
+        assert report["results"]["PacingGuard"]["profile"] == str(profile)
+        assert "profile" not in report["results"]["LexiGuard"]
+        assert [p.name for p in tmp_path.iterdir()] == [profile.name]
+        assert pstats.Stats(str(profile)).total_calls > 0
@@ -0,0 +1,107 @@
+"""
+test_guard_session.py
+
+Tests for GuardSession - cached guard instances and mtime-based reloads.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.core.guard_registry import BaseGuard
+from src.core.guard_session import GuardSession, get_guard_session, reset_guard_sessions
+
+
+def touch_later(path, content):
+    """Rewrite a file and move its mtime forward so the change is always visible."""
+    path.write_text(content, encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestGuardSession:
+    """Test class for guard instance caching."""
+
+    def test_guard_built_once(self):
+        """Test that a guard without config files is built only once."""
+        constructed = []
+
+        class CountingGuard(BaseGuard):
+            def __init__(self, project="default"):
+                constructed.append(project)
+
+            def check(self):
+                return {"passed": True}
+
+        session = GuardSession("demo")
+
+        assert session.get(CountingGuard) is session.get(CountingGuard)
+        assert constructed == ["demo"]
+        assert session.builds == 1
+
+    def test_guard_rebuilt_when_config_changes(self, tmp_path):
+        """Test that a changed config file triggers a rebuild."""
+        config = tmp_path / "rules.json"
+        config.write_text("[]", encoding="utf-8")
+
+        class ConfiguredGuard(BaseGuard):
+            def __init__(self, project="default"):
+                with open(config, encoding="utf-8") as f:
+                    self.rules = json.load(f)
+
+            def config_paths(self):
+                return [config]
+
+            def check(self):
+                return {"passed": True}
+
+        session = GuardSession()
+        first = session.get(ConfiguredGuard)
+        assert session.get(ConfiguredGuard) is first
+
+        touch_later(config, '[{"id": "R1", "pattern": "x", "message": "m"}]')
+        second = session.get(ConfiguredGuard)
+
+        assert second is not first
+        assert second.rules[0]["id"] == "R1"
+
+    def test_real_rule_guard_reload(self, tmp_path, monkeypatch):
+        """Test RuleGuard reloading rules.json through the session."""
+        from src.exceptions import RetryException
+        from src.plugins.rule_guard import RuleGuard
+
+        rules = tmp_path / "rules.json"
+        rules.write_text("[]", encoding="utf-8")
+        monkeypatch.setattr("src.plugins.rule_guard.data_path", lambda fname, project: rules)
+        session = GuardSession("demo")
+
+        assert session.get(RuleGuard).check("a bad word")["passed"] is True
+
+        touch_later(rules, '[{"id": "R1", "pattern": "bad", "message": "No bad words"}]')
+
+        with pytest.raises(RetryException, match="No bad words"):
+            session.get(RuleGuard).check("a bad word")
+
+    def test_read_json_cached_until_changed(self, tmp_path):
+        """Test that JSON files are parsed once until they change."""
+        characters = tmp_path / "characters.json"
+        characters.write_text('{"a": {"name": "A"}}', encoding="utf-8")
+        session = GuardSession()
+
+        first = session.read_json(characters)
+        assert session.read_json(characters) is first
+
+        touch_later(characters, '{"b": {"name": "B"}}')
+        assert session.read_json(characters) == {"b": {"name": "B"}}
+        assert session.read_json(tmp_path / "missing.json", default={}) == {}
+
+    def test_shared_sessions_per_project(self):
+        """Test that sessions are shared per project until reset."""
+        session = get_guard_session("alpha")
+
+        assert get_guard_session("alpha") is session
+        assert get_guard_session("beta") is not session
+
+        reset_guard_sessions()
+        assert get_guard_session("alpha") is not session
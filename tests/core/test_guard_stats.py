@@ -0,0 +1,187 @@
+"""
+test_guard_stats.py
+
+Tests for guard statistics and fail-fast guard ordering.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.core.guard_executor import execute_guards
+from src.core.guard_registry import BaseGuard
+from src.core.guard_stats import GuardStats
+from src.exceptions import RetryException
+
+
+def make_guard(name, cost=1.0, pure=True):
+    """Create a guard class with a declared cost."""
+    return type(name, (BaseGuard,), {"cost": cost, "pure": pure, "check": lambda self: {}})
+
+
+def fail():
+    raise RetryException("failed", flags={"x": {}})
+
+
+class TestGuardStats:
+    """Test class for recorded guard statistics."""
+
+    def test_failure_rate_is_smoothed(self):
+        """Test Laplace-smoothed failure rates."""
+        stats = GuardStats()
+        assert stats.failure_rate("Unknown") == 0.5
+
+        for passed in (False, False, True):
+            stats.record("RuleGuard", passed, 0.001)
+
+        assert stats.failure_rate("RuleGuard") == 3 / 5
+
+    def test_expected_cost_switches_to_measured(self):
+        """Test that measured timings replace the declared cost after enough runs."""
+        guard = make_guard("SlowGuard", cost=1.0)
+        stats = GuardStats()
+
+        stats.record("SlowGuard", True, 0.5)
+        assert stats.expected_cost(guard) == 1.0
+
+        stats.record("SlowGuard", True, 0.5)
+        stats.record("SlowGuard", True, 0.5)
+        assert stats.expected_cost(guard) == 500.0
+
+    def test_order_by_cost_and_failure_rate(self):
+        """Test that cheap and often-failing guards come first."""
+        cheap_reliable = make_guard("CheapReliable", cost=1.0)
+        cheap_flaky = make_guard("CheapFlaky", cost=1.0)
+        expensive = make_guard("Expensive", cost=2000.0)
+        stats = GuardStats()
+        for _ in range(5):
+            stats.record("CheapReliable", True, 0.001)
+            stats.record("CheapFlaky", False, 0.001)
+
+        order = stats.order([expensive, cheap_reliable, cheap_flaky])
+
+        assert order == [cheap_flaky, cheap_reliable, expensive]
+
+    def test_save_and_load(self, tmp_path, monkeypatch):
+        """Test that statistics round-trip through the project data file."""
+        monkeypatch.setattr(
+            "src.core.guard_stats.data_path", lambda fname, project: tmp_path / project / fname
+        )
+
+        stats = GuardStats.load("demo")
+        stats.record("LexiGuard", False, 0.002)
+        stats.save()
+
+        loaded = GuardStats.load("demo")
+        assert loaded.stats == {
+            "LexiGuard": {
+                "runs": 1,
+                "failures": 1,
+                "seconds": 0.002,
+                "cpu_seconds": 0.0,
+                "chars": 0,
+            }
+        }
+        assert loaded.summary()["LexiGuard"]["failure_rate"] == 2 / 3
+
+    def test_summary_normalizes_by_input_size(self):
+        """Test that CPU time and per-character cost are summarized."""
+        stats = GuardStats()
+        stats.record("PacingGuard", True, 0.010, cpu=0.008, input_size=2000)
+        stats.record("PacingGuard", True, 0.030, cpu=0.024, input_size=6000)
+        stats.record("DateGuard", True, 0.001)
+
+        summary = stats.summary()
+
+        assert summary["PacingGuard"]["mean_ms"] == pytest.approx(20.0)
+        assert summary["PacingGuard"]["mean_cpu_ms"] == pytest.approx(16.0)
+        assert summary["PacingGuard"]["ms_per_kchar"] == pytest.approx(5.0)
+        assert summary["DateGuard"]["ms_per_kchar"] is None
+
+
+class TestFailFast:
+    """Test class for fail-fast execution."""
+
+    def test_expensive_guard_skipped_after_failure(self):
+        """Test that the expensive guard is not called once a cheap guard failed."""
+        calls = []
+        critique = make_guard("CritiqueGuard", cost=2000.0)
+        rule = make_guard("RuleGuard")
+        jobs = {rule: fail, critique: lambda: calls.append("critique")}
+
+        report = execute_guards(jobs, fail_fast=True)
+
+        assert calls == []
+        assert report["skipped"] == ["CritiqueGuard"]
+        assert report["results"]["CritiqueGuard"]["status"] == "skipped"
+        assert list(report["failures"]) == ["RuleGuard"]
+        assert report["order"] == ["RuleGuard", "CritiqueGuard"]
+
+    def test_expensive_guard_runs_when_cheap_guards_pass(self):
+        """Test that expensive guards run when no failure is certain."""
+        critique = make_guard("CritiqueGuard", cost=2000.0)
+        rule = make_guard("RuleGuard")
+        jobs = {critique: lambda: {"passed": True}, rule: lambda: {"passed": True}}
+
+        report = execute_guards(jobs, fail_fast=True)
+
+        assert report["passed"] is True
+        assert report["skipped"] == []
+
+    def test_stateful_guards_never_skipped(self):
+        """Test that expensive stateful guards still run after a failure."""
+        calls = []
+        snapshot = make_guard("SnapshotGuard", cost=5000.0, pure=False)
+        jobs = {make_guard("RuleGuard"): fail, snapshot: lambda: calls.append("snapshot")}
+
+        execute_guards(jobs, fail_fast=True)
+
+        assert calls == ["snapshot"]
+
+    def test_disabled_fail_fast_runs_everything(self):
+        """Test that fail_fast=False runs every guard and records stats."""
+        calls = []
+        critique = make_guard("CritiqueGuard", cost=2000.0)
+        stats = GuardStats()
+        jobs = {make_guard("RuleGuard"): fail, critique: lambda: calls.append("critique")}
+
+        execute_guards(jobs, fail_fast=False, stats=stats)
+
+        assert calls == ["critique"]
+        assert stats.stats["RuleGuard"]["failures"] == 1
+        assert stats.stats["CritiqueGuard"]["runs"] == 1
+
+    def test_recorded_stats_change_execution_order(self):
+        """Test that lanes and stateful guards run cheapest / most failing first."""
+        stats = GuardStats()
+        calls = []
+
+        def record(name):
+            return lambda: calls.append(name)
+
+        slow = make_guard("SlowGuard")
+        flaky = make_guard("FlakyGuard")
+        date = make_guard("DateGuard", pure=False)
+        schedule = make_guard("ScheduleGuard", pure=False)
+        jobs = {
+            slow: record("slow"),
+            date: record("date"),
+            flaky: record("flaky"),
+            schedule: record("schedule"),
+        }
+
+        with patch.dict(os.environ, {"GUARD_PARALLEL": "0"}):
+            execute_guards(jobs, stats=stats)
+            assert calls == ["slow", "date", "schedule", "flaky"]
+
+            for _ in range(3):
+                stats.record("SlowGuard", True, 0.050)
+                stats.record("DateGuard", True, 0.020)
+                stats.record("ScheduleGuard", False, 0.0005)
+                stats.record("FlakyGuard", False, 0.002)
+            calls.clear()
+            report = execute_guards(jobs, stats=stats)
+
+        assert calls == ["schedule", "date", "flaky", "slow"]
+        assert report["order"][:2] == ["ScheduleGuard", "FlakyGuard"]
@@ -0,0 +1,124 @@
+"""
+test_ngram_index.py
+
+Tests for SeasonNgramIndex - cross-episode n-gram counts.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.core.ngram_index import SeasonNgramIndex, get_ngram_index, ngram_hashes
+
+STOCK = "그는 천천히 고개를 끄덕였다"
+
+
+def episode_text(number: int) -> str:
+    """Text with words unique to the episode plus a shared stock phrase."""
+    words = " ".join(f"ep{number}w{i}" for i in range(30))
+    return f"{words}. {STOCK}. ep{number}end"
+
+
+def expected_counts(texts):
+    """Episode count of every n-gram hash, computed directly."""
+    counts = Counter()
+    for text in texts:
+        counts.update(set(ngram_hashes(text)[0].tolist()))
+    return counts
+
+
+class TestSeasonNgramIndex:
+    """Test class for the season n-gram hash table."""
+
+    def test_ngram_hashes(self):
+        """Test that 3-, 4- and 5-grams are hashed stably and case-insensitively."""
+        hashes, starts, sizes = ngram_hashes("A b c d e")
+
+        assert len(hashes) == 3 + 2 + 1
+        assert sizes.tolist() == [3, 3, 3, 4, 4, 5]
+        assert starts.tolist() == [0, 1, 2, 0, 1, 0]
+        assert np.array_equal(hashes, ngram_hashes("a B c D e")[0])
+        assert len(ngram_hashes("two words")[0]) == 0
+
+    @pytest.mark.parametrize("bloom", [True, False])
+    def test_counts_match_direct_counting(self, bloom):
+        """Test episode counts with and without the Bloom filter, across growth."""
+        import src.core.ngram_index as ngram_index
+
+        texts = [episode_text(n) for n in range(1, 41)]
+        original = ngram_index.INITIAL_CAPACITY
+        try:
+            ngram_index.INITIAL_CAPACITY = 64
+            index = SeasonNgramIndex(bloom=bloom)
+        finally:
+            ngram_index.INITIAL_CAPACITY = original
+        for number, text in enumerate(texts, 1):
+            index.add_episode(number, text)
+
+        expected = expected_counts(texts)
+        hashes = np.array(list(expected), dtype=np.uint64)
+        assert index.episode_counts(hashes).tolist() == list(expected.values())
+        assert index.episode_counts(np.array([12345], dtype=np.uint64)).tolist() == [0]
+        assert len(index.keys) > 64
+
+    def test_reindexing_replaces_episode(self):
+        """Test that adding an episode again replaces its earlier version."""
+        index = SeasonNgramIndex()
+        index.add_episode(1, episode_text(1))
+        index.add_episode(2, episode_text(2))
+        index.add_episode(2, episode_text(3))
+
+        expected = expected_counts([episode_text(1), episode_text(3)])
+        hashes = np.array(list(expected), dtype=np.uint64)
+        assert index.episode_counts(hashes).tolist() == list(expected.values())
+
+        assert index.remove_episode(2) is True
+        assert index.remove_episode(2) is False
+        assert index.score(episode_text(3))["repeated"] == len(ngram_hashes(STOCK + ".")[0])
+
+    def test_score_reports_stock_phrases(self):
+        """Test that a draft is scored against other episodes only."""
+        index = SeasonNgramIndex()
+        for number in range(1, 4):
+            index.add_episode(number, episode_text(number))
+
+        draft = episode_text(3)
+        score = index.score(draft, exclude_episode=3, min_episodes=2)
+
+        assert score["ngrams"] == len(ngram_hashes(draft)[0])
+        assert score["repeated"] == 3  # the 3- and 4-grams of the stock phrase
+        assert score["phrases"] == [
+            {"text": STOCK, "episodes": 2, "span": [draft.index(STOCK), draft.index(STOCK) + 15]}
+        ]
+        assert index.score(draft, exclude_episode=3, min_episodes=3)["repeated"] == 0
+        assert SeasonNgramIndex().score(draft)["rate"] == 0.0
+
+    def test_persisted_index_reloads(self, tmp_path):
+        """Test that a new instance reads counts and episodes from disk."""
+        index = SeasonNgramIndex(tmp_path)
+        index.add_episode(1, episode_text(1))
+        index.add_episode(2, episode_text(2))
+
+        reloaded = SeasonNgramIndex(tmp_path)
+        assert reloaded.score(episode_text(3))["repeated"] == 3
+
+        reloaded.remove_episode(1)
+        assert SeasonNgramIndex(tmp_path).score(episode_text(3), min_episodes=2)["repeated"] == 0
+        assert not (tmp_path / "episodes" / "episode_1.npy").exists()
+
+    def test_bloom_rebuilt_after_updates_without_it(self, tmp_path):
+        """Test that a filter left stale by SEASON_INDEX_BLOOM=0 runs is not trusted."""
+        SeasonNgramIndex(tmp_path).add_episode(1, "the quiet harbor at dawn.")
+        SeasonNgramIndex(tmp_path, bloom=False).add_episode(2, episode_text(2))
+
+        reloaded = SeasonNgramIndex(tmp_path)
+
+        draft = episode_text(3)
+        assert reloaded.score(draft)["repeated"] == 3
+        assert reloaded.score(draft, hashed=ngram_hashes(draft))["repeated"] == 3
+
+    def test_shared_index_disabled(self, monkeypatch):
+        """Test that SEASON_INDEX=off disables the shared index."""
+        monkeypatch.setenv("SEASON_INDEX", "off")
+        assert get_ngram_index("demo") is None
@@ -0,0 +1,129 @@
+"""
+test_pacing_history.py
+
+Tests for PacingHistory - rolling action/dialog/monolog baselines.
+"""
+
+import numpy as np
+import pytest
+
+from src.core.pacing_history import PacingHistory, get_pacing_history
+from src.plugins.pacing_guard import PacingGuard
+
+RNG_RATIOS = np.random.default_rng(7).dirichlet([1.0, 1.0, 1.0], size=25)
+
+
+def _window_mean(ratios, before, window):
+    """Mean of the last ``window`` rows before an episode (rows indexed from episode 1)."""
+    earlier = ratios[: before - 1][-window:]
+    return earlier.mean(axis=0).tolist()
+
+
+class TestPacingHistory:
+    """Test class for the pacing history ring buffer."""
+
+    def test_running_average_matches_window_mean(self):
+        """Test that O(1) updates track the mean of the last window episodes."""
+        history = PacingHistory(window=4)
+        assert history.average() is None
+
+        for episode, row in enumerate(RNG_RATIOS, start=1):
+            history.record(episode, row)
+            expected = RNG_RATIOS[:episode][-4:].mean(axis=0)
+            assert list(history.average().values()) == pytest.approx(expected.tolist())
+
+        assert len(history) == len(RNG_RATIOS)
+
+    def test_average_before_earlier_episode(self):
+        """Test averages that exclude the episode being checked and later ones."""
+        history = PacingHistory(window=3)
+        history.extend(range(1, 11), RNG_RATIOS[:10])
+
+        assert list(history.average(before=11).values()) == pytest.approx(
+            _window_mean(RNG_RATIOS, 11, 3)
+        )
+        assert list(history.average(before=6).values()) == pytest.approx(
+            _window_mean(RNG_RATIOS, 6, 3)
+        )
+        assert history.average(before=1) is None
+
+    def test_rerecording_and_window_change(self):
+        """Test that overwriting an earlier episode and resizing refill the ring."""
+        history = PacingHistory(window=2)
+        for episode in (1, 2, 3):
+            history.record(episode, {"action": episode, "dialog": 0.0, "monolog": 0.0})
+        history.record(2, {"action": 10.0, "dialog": 0.0, "monolog": 0.0})
+
+        assert history.average()["action"] == pytest.approx(6.5)
+        history.window = 3
+        assert history.average()["action"] == pytest.approx(14 / 3)
+
+    def test_persisted_history_reloads(self, tmp_path):
+        """Test that recorded ratios survive a new history instance."""
+        path = tmp_path / "pacing_history.npy"
+        PacingHistory(path, window=2).record(1, [0.2, 0.5, 0.3])
+        PacingHistory(path, window=2).record(3, [0.4, 0.3, 0.3])
+
+        reloaded = PacingHistory(path, window=2)
+        assert reloaded.average() == pytest.approx({"action": 0.3, "dialog": 0.4, "monolog": 0.3})
+        assert np.isnan(np.load(path)[2]).all()
+
+    def test_record_writes_rows_in_place(self, tmp_path):
+        """Test that recording writes one row into the mapped file until it must grow."""
+        path = tmp_path / "pacing_history.npy"
+        history = PacingHistory(path)
+        history.record(1, RNG_RATIOS[0])
+        inode = path.stat().st_ino
+
+        for episode, row in enumerate(RNG_RATIOS[1:], start=2):
+            history.record(episode, row)
+
+        assert path.stat().st_ino == inode
+        assert np.load(path)[1 : len(RNG_RATIOS) + 1] == pytest.approx(RNG_RATIOS)
+
+        history.record(200, RNG_RATIOS[0])
+        assert len(np.load(path)) > 200
+        assert PacingHistory(path).average(before=201) == pytest.approx(history.average())
+
+    def test_revision_changes_on_record(self):
+        """Test that the revision (part of the guard cache key) follows the data."""
+        history = PacingHistory()
+        before = history.revision
+        history.record(1, [0.3, 0.4, 0.3])
+
+        assert history.revision != before
+        assert get_pacing_history("demo") is get_pacing_history("demo")
+
+
+class TestPacingGuardHistory:
+    """Test class for PacingGuard with a recorded history."""
+
+    def test_backfill_and_rolling_baseline(self, tmp_path):
+        """Test that backfilled episodes replace the blended baseline."""
+        outputs = tmp_path / "outputs"
+        outputs.mkdir()
+        episodes = {
+            1: '그는 달렸다. 그는 뛰었다. "가자!"',
+            2: '그녀는 생각했다. 그는 잡았다. "응."',
+            3: '문을 열었다. "누구?" "나야."',
+        }
+        for number, text in episodes.items():
+            (outputs / f"episode_{number}.txt").write_text(text, encoding="utf-8")
+        (outputs / "episode_notes.txt").write_text("ignored", encoding="utf-8")
+
+        guard = PacingGuard("pacing_history_test")
+        guard.config["window"] = 2
+        guard.history.path = None
+
+        assert guard.backfill_history(outputs) == 3
+        expected = np.mean(
+            [list(guard._analyze_text_content(episodes[n]).values()) for n in (2, 3)], axis=0
+        )
+        average = guard._get_rolling_average(4, ["아무 장면"])
+        assert list(average.values()) == pytest.approx(expected.tolist())
+
+        ratios = guard.record_history('그는 던졌다. "끝!"', 4)
+        latest = [guard._analyze_text_content(episodes[3]), ratios]
+        assert guard.history.average() == pytest.approx(
+            {key: (latest[0][key] + latest[1][key]) / 2 for key in ratios}
+        )
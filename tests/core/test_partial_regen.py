@@ -0,0 +1,229 @@
+"""
+test_partial_regen.py
+
+Tests for targeted partial regeneration - segment location, stitching and draft repair.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.core.partial_regen import (
+    coverage,
+    expand_to_sentence,
+    find_failing_segments,
+    merge_segments,
+    regenerate_segments,
+)
+from src.exceptions import RetryException
+
+
+class TestFindFailingSegments:
+    """Test class for mapping guard flags to text segments."""
+
+    def test_expand_to_sentence(self):
+        """Test that a span grows to the sentence that contains it."""
+        text = "First sentence. The bad word is here. Last one."
+        start = text.index("bad")
+        assert expand_to_sentence(text, start, start + 3) == (16, 37)
+
+    def test_rule_violation_segment(self):
+        """Test that a rule violation yields the sentence holding the match."""
+        text = "Calm opening. Then the forbidden thing happened. Calm ending."
+        error = RetryException(
+            "Forbidden content",
+            flags={
+                "rule_violation": {
+                    "matched_text": "forbidden",
+                    "match_position": text.index("forbidden"),
+                    "message": "No forbidden things",
+                }
+            },
+            guard_name="rule_guard",
+        )
+
+        segments = find_failing_segments(text, error)
+
+        assert len(segments) == 1
+        segment = segments[0]
+        assert text[segment["start"] : segment["end"]] == "Then the forbidden thing happened."
+        assert segment["kind"] == "replace"
+        assert "No forbidden things" in segment["reason"]
+
+    def test_all_rule_violations_become_segments(self):
+        """Test that every violation RuleGuard lists is located for one repair."""
+        text = "A bad start. Calm middle. A worse end."
+        spans = [[text.index("bad"), text.index("bad") + 3], [text.index("worse"), len(text) - 5]]
+        error = RetryException(
+            "No bad words",
+            flags={
+                "rule_violation": {
+                    "matched_text": "bad",
+                    "match_position": spans[0][0],
+                    "message": "No bad words",
+                    "violations": [
+                        {"rule_id": "BAD", "message": "No bad words", "span": spans[0]},
+                        {"rule_id": "WORSE", "message": "No worse words", "span": spans[1]},
+                    ],
+                }
+            },
+            guard_name="rule_guard",
+        )
+
+        segments = find_failing_segments(text, error)
+
+        assert [text[s["start"] : s["end"]] for s in segments] == ["A bad start.", "A worse end."]
+        assert "No worse words" in segments[1]["reason"]
+
+    def test_missing_anchor_becomes_insertion(self):
+        """Test that missing anchors are inserted at the end of the text."""
+        text = "The hero walked home."
+        error = RetryException(
+            "Anchor missing",
+            flags={"anchor_compliance": {"missing_anchors": [{"goal": "Hero meets mentor"}]}},
+            guard_name="anchor_guard",
+        )
+
+        segments = find_failing_segments(text, error)
+
+        assert segments == [
+            {
+                "start": len(text),
+                "end": len(text),
+                "kind": "insert",
+                "reason": "Include the required story event: Hero meets mentor",
+            }
+        ]
+
+    def test_duplicate_phrases_target_later_copy(self):
+        """Test that repeated passages keep the first copy and target the repeat."""
+        text = "She opened the old door. Birds sang outside. She opened the old door again."
+        error = RetryException(
+            "Repetitive", flags={"duplicate_phrases": {"value": 0.1}}, guard_name="lexi_guard"
+        )
+
+        segments = find_failing_segments(text, error)
+
+        assert len(segments) == 1
+        assert text[segments[0]["start"] : segments[0]["end"]] == ("She opened the old door again.")
+
+    def test_explicit_spans_and_unlocalised_flags(self):
+        """Test that span flags are used and global flags yield no segments."""
+        text = "Scene one text. Scene two text."
+        spans_error = RetryException("bad scene", flags={"scene": {"span": [16, 31]}})
+        global_error = RetryException("low ttr", flags={"too_repetitive": {"value": 0.2}})
+
+        assert find_failing_segments(text, spans_error)[0]["start"] == 16
+        assert find_failing_segments(text, global_error) == []
+
+    def test_merge_overlapping_segments(self):
+        """Test that overlapping replace segments merge into one."""
+        segments = merge_segments(
+            [
+                {"start": 10, "end": 20, "kind": "replace", "reason": "a"},
+                {"start": 0, "end": 12, "kind": "replace", "reason": "b"},
+                {"start": 30, "end": 30, "kind": "insert", "reason": "c"},
+            ]
+        )
+
+        assert [(s["start"], s["end"]) for s in segments] == [(0, 20), (30, 30)]
+        assert segments[0]["reason"] == "b; a"
+        assert coverage("x" * 40, segments) == 0.5
+
+
+class TestRegenerateSegments:
+    """Test class for stitching regenerated segments."""
+
+    def test_only_segments_are_regenerated(self):
+        """Test that text outside segments is untouched and context is passed."""
+        text = "Keep this. Replace this. Keep that."
+        start = text.index("Replace")
+        segments = [{"start": start, "end": start + 13, "kind": "replace", "reason": "why"}]
+        calls = []
+
+        def fake_regenerate(segment, reason, before, after):
+            calls.append((segment, reason, before, after))
+            return "Rewritten."
+
+        result = regenerate_segments(text, segments, fake_regenerate)
+
+        assert result == "Keep this. Rewritten. Keep that."
+        assert calls == [("Replace this.", "why", "Keep this. ", " Keep that.")]
+
+    def test_insertion_appends_paragraph(self):
+        """Test that insert segments add a new paragraph."""
+        text = "The end."
+        segments = [{"start": 8, "end": 8, "kind": "insert", "reason": "add event"}]
+
+        result = regenerate_segments(text, segments, lambda *args: " New event. ")
+
+        assert result == "The end.\n\nNew event."
+
+
+class TestRepairDraft:
+    """Test class for draft repair in the draft generator."""
+
+    def test_repair_draft_rewrites_flagged_sentence(self):
+        """Test that only the flagged sentence is sent to the LLM."""
+        from src.draft_generator import repair_draft
+
+        draft = "Line one is fine. " * 10 + "The forbidden act. " + "Line two is fine. " * 10
+        error = RetryException(
+            "Forbidden",
+            flags={"rule_violation": {"matched_text": "forbidden", "message": "No forbidden"}},
+        )
+
+        with (
+            patch.dict(os.environ, {"UNIT_TEST_MODE": "0", "FAST_MODE": "0"}),
+            patch("src.draft_generator.call_llm", return_value="A harmless act.") as mock_llm,
+        ):
+            repaired = repair_draft(draft, [error])
+
+        assert mock_llm.call_count == 1
+        assert "The forbidden act." in mock_llm.call_args[0][0]
+        assert "forbidden" not in repaired
+        assert repaired.count("Line one is fine.") == 10
+        assert "A harmless act." in repaired
+
+    def test_repair_draft_falls_back_to_full_regeneration(self):
+        """Test that unlocalised or oversized failures return None."""
+        from src.draft_generator import repair_draft
+
+        draft = "Short bad text."
+        localised = RetryException("bad", flags={"rule_violation": {"matched_text": "bad"}})
+        global_error = RetryException("low ttr", flags={"too_repetitive": {"value": 0.2}})
+
+        assert repair_draft(draft, [global_error]) is None
+        assert repair_draft(draft, [localised]) is None
+
+    def test_repair_draft_keeps_segment_when_llm_fails(self):
+        """Test that a failed LLM call leaves the original segment in place."""
+        from src.draft_generator import repair_draft
+
+        draft = "Fine sentence here. " * 5 + "A bad sentence."
+        error = RetryException("bad", flags={"rule_violation": {"matched_text": "bad"}})
+
+        with patch.dict(os.environ, {"UNIT_TEST_MODE": "1"}):
+            assert repair_draft(draft, [error]) == draft
+
+    @pytest.mark.parametrize(
+        "llm",
+        [
+            {"side_effect": ValueError("Empty response from Gemini")},
+            {"return_value": "Episode 0\n\n[PLACEHOLDER DRAFT CONTENT]\n\nStory narrative."},
+            {"return_value": "A very long rewrite. " * 100},
+        ],
+    )
+    def test_repair_draft_rejects_failed_or_fallback_replacement(self, llm):
+        """Test that client errors, fallback episodes and runaway rewrites keep the segment."""
+        from src.draft_generator import repair_draft
+
+        draft = "Fine sentence here. " * 5 + "A bad sentence."
+        error = RetryException("bad", flags={"rule_violation": {"matched_text": "bad"}})
+
+        with (
+            patch.dict(os.environ, {"UNIT_TEST_MODE": "0", "FAST_MODE": "0"}),
+            patch("src.draft_generator.call_llm", **llm),
+        ):
+            assert repair_draft(draft, [error]) == draft
@@ -0,0 +1,152 @@
+"""
+test_retry_budget.py
+
+Tests for the Retry Budget - limits, priorities and pipeline integration.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.core.retry_budget import RetryBudget, estimate_tokens
+from src.exceptions import BudgetExhaustedException, RetryException
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRetryBudget:
+    """Test class for retry budget accounting."""
+
+    def test_estimate_tokens(self):
+        """Test rough token estimation."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abc") == 2
+        assert estimate_tokens("a" * 300) == 101
+
+    def test_spend_attempts_until_exhausted(self):
+        """Test that the attempt cap is enforced for top-priority stages."""
+        budget = RetryBudget(max_attempts=3)
+
+        for _ in range(3):
+            budget.spend_attempt("draft")
+
+        with pytest.raises(BudgetExhaustedException) as exc_info:
+            budget.spend_attempt("draft")
+
+        assert exc_info.value.stage == "draft"
+        assert budget.attempts_used == 3
+        assert budget.summary()["denied"] == {"draft": 1}
+
+    def test_lower_priority_keeps_reserve_for_draft(self):
+        """Test that scene attempts cannot eat into the draft's reserve."""
+        budget = RetryBudget(max_attempts=10)
+
+        spent = 0
+        while budget.can_spend("scene"):
+            budget.spend_attempt("scene")
+            spent += 1
+
+        # NORMAL priority holds back 15% of the budget
+        assert spent == 8
+        assert budget.can_spend("critique") is False
+        assert budget.can_spend("draft") is True
+        budget.spend_attempt("draft")
+
+    def test_critique_is_lowest_priority(self):
+        """Test that critique stops spending before generation stages."""
+        budget = RetryBudget(max_attempts=10)
+
+        for _ in range(7):
+            budget.spend_attempt("beat")
+
+        assert budget.can_spend("critique") is False
+        assert budget.can_spend("beat") is True
+
+    def test_token_cap(self):
+        """Test that charged tokens count against the budget."""
+        budget = RetryBudget(max_attempts=100, max_tokens=1000)
+
+        budget.charge_tokens("scene", 900)
+
+        assert budget.can_spend("scene") is False
+        assert budget.can_spend("draft") is True
+        budget.charge_tokens("draft", 200)
+        assert budget.can_spend("draft") is False
+        assert budget.summary()["stage_tokens"] == {"scene": 900, "draft": 200}
+
+    def test_wall_time_cap(self):
+        """Test that elapsed time counts against the budget."""
+        clock = FakeClock()
+        budget = RetryBudget(max_seconds=100, clock=clock)
+
+        clock.now = 50
+        assert budget.can_spend("critique") is True
+        clock.now = 70
+        assert budget.can_spend("critique") is False
+        assert budget.can_spend("draft") is True
+        clock.now = 100
+        assert budget.can_spend("draft") is False
+
+    def test_from_env(self, monkeypatch):
+        """Test environment configuration."""
+        monkeypatch.setenv("RETRY_BUDGET_ATTEMPTS", "7")
+        monkeypatch.setenv("RETRY_BUDGET_TOKENS", "1234")
+        monkeypatch.setenv("RETRY_BUDGET_SECONDS", "12.5")
+
+        budget = RetryBudget.from_env()
+
+        assert budget.max_attempts == 7
+        assert budget.max_tokens == 1234
+        assert budget.max_seconds == 12.5
+
+
+class TestRetryBudgetPipeline:
+    """Test that generation stages spend from a shared budget."""
+
+    @patch("src.beat_planner.call_llm")
+    @patch("src.core.retry_controller.time.sleep")
+    def test_plan_beats_bounded_by_budget(self, mock_sleep, mock_llm, monkeypatch):
+        """Test that failing beat sequences stop calling the LLM once the budget is spent."""
+        from src.beat_planner import plan_beats
+
+        monkeypatch.setenv("GOOGLE_API_KEY", "test_key")
+        monkeypatch.delenv("UNIT_TEST_MODE", raising=False)
+        monkeypatch.setenv("CB_MIN_CALLS", "1000")
+        mock_llm.side_effect = RetryException("LLM failed", guard_name="llm_call")
+        budget = RetryBudget(max_attempts=20)
+
+        result = plan_beats(1, budget=budget)
+
+        # NORMAL priority may use 17 of 20 attempts; without a budget this is 18
+        assert mock_llm.call_count == 17
+        assert budget.attempts_used == 17
+        assert budget.can_spend("draft") is True
+        assert len(result["ep_1"]) == 6
+
+    @patch("src.scene_maker.VectorStore")
+    @patch("src.scene_maker.call_llm")
+    @patch("src.core.retry_controller.time.sleep")
+    def test_make_scenes_falls_back_when_budget_spent(
+        self, mock_sleep, mock_llm, mock_vector_store
+    ):
+        """Test that an exhausted budget sends make_scenes straight to fallback scenes."""
+        from src.scene_maker import make_scenes
+
+        budget = RetryBudget(max_attempts=1)
+        budget.spend_attempt("draft")
+
+        with patch.dict(os.environ, {"FAST_MODE": "0", "UNIT_TEST_MODE": "0"}):
+            scenes = make_scenes({"idx": 1, "summary": "Opening beat"}, budget=budget)
+
+        mock_llm.assert_not_called()
+        assert len(scenes) == 10
+        assert budget.summary()["denied"] == {"scene": 1}
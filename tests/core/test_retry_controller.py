@@ -5,12 +5,13 @@ Tests for the Retry Controller - comprehensive test suite.
 Tests retry functionality, backoff intervals, and error handling.
 """
 
+import asyncio
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from src.core.retry_controller import run_with_retry
+from src.core.retry_controller import arun_with_retry, run_with_retry
 from src.exceptions import RetryException
 
 
@@ -249,3 +250,109 @@ class TestRetryController:
 
         exception = exc_info.value
         assert exception.guard_name == "test_function"
+
+
+@patch("src.core.retry_controller.asyncio.sleep", new_callable=AsyncMock)
+class TestAsyncRetryController:
+    """Test class for the asyncio retry controller."""
+
+    def test_arun_with_retry_success_first_attempt(self, mock_sleep):
+        """Test awaited success on first attempt without backoff."""
+        mock_func = AsyncMock(return_value="success")
+        mock_func.__name__ = "test_func"
+
+        result = asyncio.run(arun_with_retry(mock_func, "arg1", kwarg1="value1"))
+
+        assert result == "success"
+        mock_func.assert_awaited_once_with("arg1", kwarg1="value1")
+        mock_sleep.assert_not_awaited()
+
+    def test_arun_with_retry_success_after_retries(self, mock_sleep):
+        """Test success on third attempt with the same backoff schedule as the sync version."""
+        mock_func = AsyncMock()
+        mock_func.__name__ = "test_func"
+        mock_func.side_effect = [
+            RetryException("First attempt failed", guard_name="test_guard"),
+            RetryException("Second attempt failed", guard_name="test_guard"),
+            "success",
+        ]
+
+        result = asyncio.run(arun_with_retry(mock_func, max_retry=2))
+
+        assert result == "success"
+        assert mock_func.await_count == 3
+        assert [call[0][0] for call in mock_sleep.await_args_list] == [0.5, 1.0]
+
+    def test_arun_with_retry_all_attempts_fail_unit_test_format(self, mock_sleep, monkeypatch):
+        """Test combined message format under UNIT_TEST_MODE."""
+        monkeypatch.setenv("UNIT_TEST_MODE", "1")
+        mock_func = AsyncMock()
+        mock_func.__name__ = "test_func"
+        mock_func.side_effect = [
+            RetryException("First attempt failed", guard_name="test_guard"),
+            RetryException("Second attempt failed", guard_name="test_guard", flags={"a": 1}),
+        ]
+
+        with pytest.raises(RetryException) as exc_info:
+            asyncio.run(arun_with_retry(mock_func, max_retry=1))
+
+        exception_str = str(exc_info.value)
+        assert "First attempt failed" in exception_str
+        assert "Second attempt failed" in exception_str
+        assert exc_info.value.guard_name == "test_guard"
+        assert exc_info.value.flags == {"a": 1}
+
+    def test_arun_with_retry_all_attempts_fail_summary_format(self, mock_sleep, monkeypatch):
+        """Test production summary message when not in UNIT_TEST_MODE."""
+        monkeypatch.delenv("UNIT_TEST_MODE", raising=False)
+        mock_func = AsyncMock(side_effect=RetryException("Always fails"))
+        mock_func.__name__ = "test_func"
+
+        with pytest.raises(RetryException) as exc_info:
+            asyncio.run(arun_with_retry(mock_func, max_retry=2))
+
+        assert "test_func failed after 3 attempts" in str(exc_info.value)
+        assert exc_info.value.guard_name == "test_func"
+
+    def test_arun_with_retry_non_retry_exception_no_retry(self, mock_sleep):
+        """Test that non-RetryException errors propagate immediately."""
+        mock_func = AsyncMock(side_effect=ValueError("Not a retry exception"))
+        mock_func.__name__ = "test_func"
+
+        with pytest.raises(ValueError):
+            asyncio.run(arun_with_retry(mock_func, max_retry=2))
+
+        assert mock_func.await_count == 1
+
+    def test_arun_with_retry_cancellation_during_backoff(self, mock_sleep):
+        """Test that cancelling the task while backing off stops retrying."""
+        mock_sleep.side_effect = asyncio.CancelledError
+        mock_func = AsyncMock(side_effect=RetryException("fails", guard_name="test_guard"))
+        mock_func.__name__ = "test_func"
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(arun_with_retry(mock_func, max_retry=2))
+
+        assert mock_func.await_count == 1
+
+    def test_arun_with_retry_task_cancel(self, mock_sleep):
+        """Test that a cancelled task is not retried."""
+        calls = []
+
+        async def runner():
+            started = asyncio.Event()
+
+            async def slow_func():
+                calls.append(True)
+                started.set()
+                await asyncio.Event().wait()
+
+            task = asyncio.create_task(arun_with_retry(slow_func, max_retry=2))
+            await started.wait()
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(runner())
+
+        assert len(calls) == 1
@@ -14,8 +14,10 @@ import pytest
 from src.exceptions import RetryException
 from src.plugins.anchor_guard import (
     AnchorGuard,
+    AnchorIndex,
     anchor_guard,
     check_anchor_guard,
+    goal_keywords,
 )
 
 
@@ -391,3 +393,39 @@ class TestAnchorGuard:
         assert result["passed"] is True
         assert len(result["anchors_checked"]) == 0
         assert len(result["missing_anchors"]) == 0
+
+    def test_anchor_index_active_episodes(self):
+        """Test that the index lists each anchor for anchor_ep ± 1 only."""
+        index = AnchorIndex(
+            [
+                {"id": "A", "goal": "주인공 각성", "anchor_ep": 5},
+                {"id": "B", "goal": "동료 합류", "anchor_ep": 6},
+                {"id": "C", "anchor_ep": 5},
+                {"id": "D", "goal": "목표 없음", "anchor_ep": "5"},
+            ]
+        )
+
+        assert [entry["id"] for entry in index.active(4)] == ["A"]
+        assert [entry["id"] for entry in index.active(5)] == ["A", "B"]
+        assert [entry["id"] for entry in index.active(7)] == ["B"]
+        assert index.active(8) == []
+        assert index.active(5)[0]["keywords"] == goal_keywords("주인공 각성")
+
+    def test_anchor_index_matches_substring_search(self):
+        """Test that the keyword automaton agrees with per-keyword containment."""
+        anchors = [
+            {"id": "A1", "goal": "주인공 등장", "anchor_ep": 3},
+            {"id": "A2", "goal": "인공 지능", "anchor_ep": 3},
+            {"id": "A3", "goal": "Dragon awakening", "anchor_ep": 4},
+            {"id": "A4", "goal": "마법사 소환", "anchor_ep": 2},
+        ]
+        index = AnchorIndex(anchors)
+        text = "마침내 주인공이 Dragon을 깨웠다".lower()
+
+        for episode in range(1, 6):
+            found = index.found_keywords(text, episode)
+            for entry in index.active(episode):
+                expected = any(keyword.lower() in text for keyword in entry["keywords"])
+                assert any(keyword.lower() in found for keyword in entry["keywords"]) is expected
+        # Overlapping keywords ("주인공" contains "인공") are both found
+        assert {"주인공", "인공"} <= index.found_keywords(text, 3)
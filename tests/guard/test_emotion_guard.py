@@ -8,13 +8,18 @@ Tests emotion classification and delta calculation functionality.
 import numpy as np
 import pytest
 
+from src.core.document_analysis import DocumentAnalysis
 from src.exceptions import RetryException
 from src.plugins.emotion_guard import (
+    EmotionGuard,
     calculate_emotion_delta,
     check_emotion_guard,
     classify_emotions,
+    classify_emotions_batch,
     cosine_delta,
+    emotion_deltas,
     emotion_guard,
+    emotion_trajectory,
     emotions_to_vector,
 )
 
@@ -323,3 +328,110 @@ def test_emotion_guard_exception_message():
 
     exception = exc_info.value
     assert str(exception).startswith("[emotion_guard] Emotion jump")
+
+
+def test_classify_emotions_batch_matches_single_texts():
+    """Test that batch classification rows equal per-text classification."""
+    texts = [
+        "I am so happy and joyful today!",
+        "He was startled and terrified by the threat.",
+        "The weather is normal and calm.",
+        "",
+        "furious angry rage but also smiling",
+    ]
+
+    matrix = classify_emotions_batch(texts)
+
+    assert matrix.shape == (5, 7)
+    for row, text in zip(matrix, texts, strict=True):
+        np.testing.assert_allclose(row, emotions_to_vector(classify_emotions(text)))
+
+
+def test_emotion_deltas_match_pairwise_delta():
+    """Test that vectorized deltas include the neutral amplification."""
+    prev = ["The weather is normal and calm.", "I am happy", "calm quiet"]
+    curr = ["terrified horror panic fear", "I am glad", "furious rage angry hate"]
+
+    deltas = emotion_deltas(classify_emotions_batch(prev), classify_emotions_batch(curr))
+
+    for delta, prev_text, curr_text in zip(deltas, prev, curr, strict=True):
+        assert delta == pytest.approx(calculate_emotion_delta(prev_text, curr_text))
+
+
+def test_emotion_check_many_reports_failures():
+    """Test that check_many returns one result per pair without raising."""
+    pairs = [
+        ("I am so happy", "I am glad and cheerful"),
+        ("The weather is normal and calm.", "terrified horror scared afraid fear"),
+    ]
+
+    results = EmotionGuard().check_many(pairs)
+
+    assert results[0]["passed"] is True
+    assert results[1]["passed"] is False
+    assert "emotion_jump" in results[1]["flags"]
+    assert results[1]["message"] == "Emotion jump"
+
+
+def test_classify_emotions_lexicon_counts_each_emotion_once():
+    """Test that shared keywords count for every emotion and duplicates only once."""
+    startled = classify_emotions("startled quiet walk home")
+    disappointed = classify_emotions("disappointed quiet walk home")
+
+    # "startled" is both fear and surprise; 1 of 4 words scores 1 / 4 * 5 capped at 0.8
+    assert startled["fear"] == pytest.approx(0.8)
+    assert startled["surprise"] == pytest.approx(0.8)
+    # "disappointed" is listed twice under sadness but is one keyword
+    assert disappointed["sadness"] == pytest.approx(0.8)
+    assert disappointed["neutral"] == pytest.approx(0.8)
+
+
+def test_classify_emotions_memoized_per_text():
+    """Test that a text is classified once and callers get independent dicts."""
+    from src.plugins.emotion_guard import _classify
+    from src.text import clear_text_cache
+
+    clear_text_cache()
+    first = classify_emotions("I am so happy and joyful today!")
+    first["joy"] = -1.0
+    second = classify_emotions("I am so happy and joyful today!")
+
+    assert second["joy"] > 0
+    assert (_classify.cache.hits, _classify.cache.misses) == (1, 1)
+
+
+def test_emotion_trajectory_matches_pairwise_deltas():
+    """Test that trajectory deltas equal the consecutive pairwise deltas."""
+    scenes = [
+        "The weather is normal and calm.",
+        "calm quiet steady",
+        "terrified horror panic fear",
+        "I am so happy and joyful",
+        "I am glad and cheerful",
+    ]
+
+    trajectory = emotion_trajectory(scenes)
+
+    assert trajectory["matrix"].shape == (5, 7)
+    expected = [calculate_emotion_delta(a, b) for a, b in zip(scenes[:-1], scenes[1:], strict=True)]
+    np.testing.assert_allclose(trajectory["deltas"], expected)
+    assert trajectory["jumps"].tolist() == [i for i, d in enumerate(expected) if d > 0.7]
+    assert emotion_trajectory(scenes[:1])["deltas"].shape == (0,)
+
+
+def test_check_trajectory_reports_scene_spans():
+    """Test that jumps between scenes of an analysis carry the later scene's span."""
+    text = "The weather is normal and calm.\n***\nterrified horror panic fear\n***\nfear dread"
+    analysis = DocumentAnalysis(text)
+
+    with pytest.raises(RetryException) as exc_info:
+        EmotionGuard().check_trajectory(analysis)
+
+    flag = exc_info.value.flags["emotion_jump"]
+    assert [t[:2] for t in flag["transitions"]] == [[0, 1]]
+    start, end = flag["spans"][0]
+    assert text[start:end].strip() == "terrified horror panic fear"
+
+    result = EmotionGuard().check_trajectory(["I am happy", "I am glad"])
+    assert result["passed"] is True
+    assert result["jumps"] == []
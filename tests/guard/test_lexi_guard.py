@@ -9,9 +9,11 @@ import pytest
 
 from src.exceptions import RetryException
 from src.plugins.lexi_guard import (
+    LexiGuard,
     calculate_3gram_duplication_rate,
     calculate_ttr,
     lexi_guard,
+    lexi_profiles,
 )
 
 # Test cases that should PASS (5 tests)
@@ -214,3 +216,64 @@ def test_calculate_3gram_duplication_rate_with_duplicates():
     # "the cat sat" appears twice
     rate = calculate_3gram_duplication_rate("the cat sat on the cat sat")
     assert rate > 0.0  # Should have some duplication
+
+
+def test_lexi_check_many_matches_single_checks():
+    """Test that the vectorized batch check agrees with per-text metrics."""
+    texts = [
+        "the quick brown fox jumps over the lazy dog",
+        "the cat sat on the cat sat on the cat sat",
+        "",
+        "one two",
+        "용사가 검을 들었다 용사가 검을 들었다",
+    ]
+
+    results = LexiGuard().check_many(texts)
+
+    assert len(results) == len(texts)
+    for text, result in zip(texts, results, strict=True):
+        assert result["ttr"] == calculate_ttr(text)
+        assert result["trigram_dup_rate"] == calculate_3gram_duplication_rate(text)
+    assert results[0]["passed"] is True
+    assert results[1]["passed"] is False
+    assert "duplicate_phrases" in results[1]["flags"]
+    assert results[1]["message"].startswith("Lexical quality issues detected")
+
+
+def test_lexi_mattr_matches_sliding_windows():
+    """Test MATTR and the least diverse window against a direct window scan."""
+    words = ["a", "b", "c", "d", "e", "a", "a", "a", "a", "f", "g", "h"]
+    text = " ".join(words)
+
+    profile = lexi_profiles([text, "too short"], window=4, mattr=True)
+
+    diversity = [len(set(words[i : i + 4])) / 4 for i in range(len(words) - 3)]
+    assert profile[0]["mattr"] == pytest.approx(sum(diversity) / len(diversity))
+    assert profile[0]["lowest_window"]["ttr"] == min(diversity)
+    lowest = profile[0]["lowest_window"]
+    assert text[lowest["start"] : lowest["end"]] == "a a a a"
+    assert profile[1]["mattr"] == profile[1]["ttr"]
+    assert profile[1]["lowest_window"] is None
+
+
+def test_lexi_mattr_only_on_request():
+    """Test that MATTR is computed only when the guard is asked for it."""
+    text = "the brave knight rode through the quiet forest at dawn"
+
+    assert "mattr" not in LexiGuard().check(text)
+    result = LexiGuard(mattr=True).check(text)
+    assert result["mattr"] == result["ttr"]
+    assert result["lowest_window"] is None
+
+
+def test_lexi_duplicate_flag_locates_repeats():
+    """Test that the duplicate_phrases flag names the repeats and spans later copies."""
+    text = "the cat sat here. the cat sat there. a dog ran. the cat sat again."
+
+    with pytest.raises(RetryException) as exc_info:
+        LexiGuard().check(text)
+
+    flag = exc_info.value.flags["duplicate_phrases"]
+    assert flag["repeated_trigrams"][0] == {"trigram": "the cat sat", "count": 3}
+    assert [text[start:end] for start, end in flag["spans"]] == ["the cat sat"] * 2
+    assert flag["spans"][0][0] == text.index("the cat sat there")
@@ -305,3 +305,79 @@ class TestPacingGuard:
 
         with pytest.raises(RetryException):
             pacing_guard(imbalanced_scenes, 5, "default")
+
+    def test_pacing_check_many_matches_single_checks(self):
+        """Test that batched episodes get the same verdicts as single checks."""
+        batch = [
+            (
+                [
+                    '그는 달렸다. "어디로 가야 하지?" 그는 생각했다.',
+                    '그녀가 말했다. "안녕하세요." 기분이 좋았다고 느꼈다.',
+                ],
+                1,
+            ),
+            (['"안녕?" "그래." "가자!" "어디로?" "저기로."', '"좋아." "출발!"'], 2),
+            ([], 3),
+        ]
+        guard = PacingGuard("default")
+
+        results = guard.check_many(batch)
+
+        assert len(results) == 3
+        for result, (scene_texts, episode_num) in zip(results, batch, strict=True):
+            try:
+                expected = guard.check(scene_texts, episode_num)
+            except RetryException as e:
+                assert result["passed"] is False
+                assert result["message"] == e.args[0]
+                continue
+            assert result["passed"] is True
+            assert result["current_ratios"] == expected["current_ratios"]
+            assert result["average_ratios"] == pytest.approx(expected["average_ratios"])
+        assert results[1]["passed"] is False
+        assert results[2]["violations"] == []
+
+
+def test_label_sentences_matches_keyword_containment():
+    """Test that the compiled scan labels sentences like per-keyword substring checks."""
+    from src.plugins.pacing_guard import ACTION_KEYWORDS, MONOLOG_KEYWORDS, label_sentences
+
+    sentences = [
+        "그는 달렸다",
+        "그녀는 다짐했다",
+        "그가 왔다짐했다",  # action keyword followed by a monolog keyword
+        "문이 열렸다",
+        "",
+        "생각했다 그리고 뛰었다",
+    ]
+
+    labels = label_sentences(sentences)
+
+    expected = [
+        (
+            2
+            if any(k in s for k in MONOLOG_KEYWORDS)
+            else 1 if any(k in s for k in ACTION_KEYWORDS) else 0
+        )
+        for s in sentences
+    ]
+    assert labels.tolist() == expected
+    assert labels[2] == 2
+
+
+def test_pacing_keywords_loaded_from_project_config(tmp_path):
+    """Test that action and monolog keywords can be replaced in pacing_config.json."""
+    config_path = tmp_path / "pacing_config.json"
+    config_path.write_text(
+        json.dumps({"action_keywords": ["점프"], "monolog_keywords": ["고민"]}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    guard = PacingGuard("default")
+    guard.config_path = config_path
+    guard.config = guard._load_config()
+
+    ratios = guard._analyze_text_content("그는 점프했다. 그는 고민했다. 그는 달렸다.")
+
+    assert guard.config["tolerance"] == 0.25
+    # "달렸다" is no longer an action keyword, so only two sentences count
+    assert ratios == {"action": 0.5, "dialog": 0.0, "monolog": 0.5}
@@ -9,12 +9,18 @@ import json
 import os
 import tempfile
 
+import numpy as np
 import pytest
 
 from src.exceptions import RetryException
 from src.plugins.relation_guard import (
     RelationGuard,
+    RelationTimeline,
+    append_episode_relations,
+    audit_relation_guard,
     check_relation_guard,
+    last_listed,
+    load_relation_timeline,
     relation_guard,
 )
 
@@ -306,3 +312,158 @@ class TestRelationGuard:
         guard = RelationGuard(self.relation_path)
         result = guard.check(3)
         assert result["passed"] is True
+
+    # TIMELINE INDEX TESTS (2 tests)
+
+    def test_timeline_latest_relation_lookup(self):
+        """Test bisect lookups of the latest relation for unordered episodes."""
+        timeline = RelationTimeline(
+            [
+                {"ep": 7, "relations": {"B,A": "적"}},
+                {"ep": 2, "relations": {"A,B": "친구", "A,C": ""}},
+                {"ep": 4, "relations": {"A,B": "동료"}},
+                {"ep": 4, "relations": {"A,B": "적", "B,C": "친구"}},
+            ]
+        )
+
+        assert timeline.latest("A,B", 2) is None
+        assert timeline.latest("B,A", 4) == (2, "친구")
+        assert timeline.latest("A,B", 4, inclusive=True) == (4, "동료")
+        assert timeline.latest("A,B", 100) == (7, "적")
+        assert timeline.latest("C,B", 5) == (4, "친구")
+        assert timeline.latest("A,C", 5) is None
+        assert timeline.relations_at(4) == {"A,B": "동료"}
+
+    def test_jsonl_relations_load_incrementally(self):
+        """Test episode-per-line storage and reloading only appended episodes."""
+        jsonl_path = os.path.join(self.temp_dir, "relation_matrix.jsonl")
+        append_episode_relations(jsonl_path, 1, {"A,B": "친구"})
+        append_episode_relations(jsonl_path, 2, {"A,C": "동료"})
+
+        guard = RelationGuard(jsonl_path, tolerance_ep=3)
+        assert len(guard.relations) == 2
+        timeline = guard.timeline
+
+        append_episode_relations(jsonl_path, 6, {"B,A": "적"})
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            f.write('{"ep": 7, "relat')  # Episode still being written
+
+        assert load_relation_timeline(jsonl_path) is timeline
+        guard = RelationGuard(jsonl_path, tolerance_ep=3)
+        assert [record["ep"] for record in guard.relations] == [1, 2, 6]
+        with pytest.raises(RetryException) as exc_info:
+            guard.check(6)
+        assert exc_info.value.flags["relation_violation"]["previous_episode"] == 1
+
+    def test_replaced_relations_rebuild_timeline_once(self):
+        """Test that replacing relations rebuilds the timeline once, not on every access."""
+        self.create_test_relations([{"ep": 1, "relations": {"A,B": "친구"}}])
+        guard = RelationGuard(self.relation_path, tolerance_ep=3)
+
+        guard.relations = [
+            {"ep": 1, "relations": {"A,B": "친구"}},
+            {"ep": 2, "relations": {"A,B": "적"}},
+        ]
+
+        assert guard.timeline is guard.timeline
+        assert guard.timeline.latest("A,B", 3) == (2, "적")
+
+    def test_relation_edits_stay_private_to_the_guard(self):
+        """Test that appending to relations updates that guard only, not the shared timeline."""
+        self.create_test_relations([{"ep": 1, "relations": {"A,B": "친구"}}])
+        guard = RelationGuard(self.relation_path, tolerance_ep=3)
+        other = RelationGuard(self.relation_path, tolerance_ep=3)
+
+        guard.relations.append({"ep": 2, "relations": {"A,B": "적"}})
+
+        assert guard.timeline.latest("A,B", 3) == (2, "적")
+        assert len(other.relations) == 1
+        assert other.timeline.latest("A,B", 3) == (1, "친구")
+        assert len(load_relation_timeline(self.relation_path).records) == 1
+
+    # SEASON AUDIT TESTS (3 tests)
+
+    def test_relation_tensor_forward_fill(self):
+        """Test the symmetric code tensor and forward-filled last episodes."""
+        timeline = RelationTimeline(
+            [
+                {"ep": 1, "relations": {"B,A": "친구"}},
+                {"ep": 3, "relations": {"A,C": "적", "A,B": "동료"}},
+            ]
+        )
+        encoded = timeline.tensor()
+        updates = encoded["updates"]
+
+        assert encoded["characters"] == ["A", "B", "C"]
+        assert updates.shape == (4, 3, 3)
+        assert (updates == updates.transpose(0, 2, 1)).all()
+        assert encoded["relations"][updates[1, 0, 1]] == "친구"
+
+        since = last_listed(updates)
+        filled = np.take_along_axis(updates, since, axis=0)
+        assert since[:, 0, 1].tolist() == [0, 1, 1, 3]
+        assert [encoded["relations"][code] for code in filled[:, 0, 1]] == [
+            "",
+            "친구",
+            "친구",
+            "동료",
+        ]
+
+    def test_audit_matches_per_episode_checks(self):
+        """Test that the season audit finds every flip check() would raise."""
+        test_relations = [
+            {"ep": 1, "relations": {"A,B": "친구", "A,C": "적", "B,C": "친구"}},
+            {"ep": 2, "relations": {"C,D": "친구"}},
+            {"ep": 5, "relations": {"C,A": "친구", "B,A": "적", "B,C": "동료"}},
+            {"ep": 6, "relations": {"A,B": "친구", "D,C": "적"}},
+            {"ep": 9, "relations": {"D,C": "적"}},
+            {"ep": 10, "relations": {"A,B": "적", "B,C": "적"}},
+        ]
+        self.create_test_relations(test_relations)
+        guard = RelationGuard(self.relation_path, tolerance_ep=3)
+
+        audit = audit_relation_guard(relation_path=self.relation_path, tolerance_ep=3)
+
+        assert audit["passed"] is False
+        assert audit["episodes"] == 10
+        assert audit["failed_episodes"] == [5, 6, 10]
+        assert [(v["current_episode"], v["char_pair"]) for v in audit["violations"]] == [
+            (5, "C,A"),
+            (5, "B,A"),
+            (6, "D,C"),
+            (10, "A,B"),
+        ]
+
+        episodes = list(range(0, 12))
+        for episode, result in zip(episodes, guard.check_many(episodes), strict=True):
+            if episode in audit["failed_episodes"]:
+                with pytest.raises(RetryException) as exc_info:
+                    guard.check(episode)
+                assert result["passed"] is False
+                assert result["flags"] == exc_info.value.flags
+            else:
+                assert result == guard.check(episode)
+
+    def test_audit_checks_both_orders_of_a_pair(self):
+        """Test that a pair listed as both "C,D" and "D,C" is audited entry by entry."""
+        test_relations = [
+            {"ep": 1, "relations": {"C,D": "친구"}},
+            {"ep": 6, "relations": {"C,D": "친구", "D,C": "적"}},
+            {"ep": 11, "relations": {"D,C": "친구", "C,D": "적"}},
+        ]
+        self.create_test_relations(test_relations)
+        guard = RelationGuard(self.relation_path, tolerance_ep=3)
+
+        audit = guard.audit()
+
+        assert [(v["current_episode"], v["char_pair"]) for v in audit["violations"]] == [
+            (6, "D,C"),
+            (11, "C,D"),
+        ]
+        for episode in (6, 11):
+            with pytest.raises(RetryException) as exc_info:
+                guard.check(episode)
+            violation = audit["violations"][audit["failed_episodes"].index(episode)]
+            assert exc_info.value.flags["relation_violation"] == {
+                key: value for key, value in violation.items() if key != "message"
+            }
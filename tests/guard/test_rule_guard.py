@@ -8,13 +8,16 @@ Tests forbidden pattern detection and rule violation functionality.
 import json
 import os
 import tempfile
+from unittest.mock import patch
 
 import pytest
 
-from src.exceptions import RetryException
+from src.exceptions import GuardTimeoutException, RetryException
 from src.plugins.rule_guard import (
     RuleGuard,
     check_rule_guard,
+    load_rule_pack,
+    nested_quantifiers,
     rule_guard,
 )
 
@@ -336,3 +339,114 @@ class TestRuleGuard:
 
         assert len(results["violations"]) > 0
         assert results["violations"][0]["match_position"] == text.find("마법")
+
+    def test_rule_check_many_reports_first_violation_per_text(self):
+        """Test that a batch check reports each text's first violation in rule order."""
+        rules = [
+            {"id": "NO_MAGIC", "pattern": "마법|마도", "message": "마법 사용은 금지!"},
+            {"id": "BAD_REGEX", "pattern": "[", "message": "invalid"},
+            {"id": "NO_ELF", "pattern": "엘프", "message": "엘프 금지!"},
+        ]
+        self._create_test_rules(rules)
+        texts = ["용사가 모험을 떠났다.", "엘프가 마법을 썼다.", "엘프가 나타났다.", ""]
+
+        results = RuleGuard(rule_path=self.test_rules_path).check_many(texts)
+
+        assert [result["passed"] for result in results] == [True, False, False, True]
+        assert results[1]["flags"]["rule_violation"]["rule_id"] == "NO_MAGIC"
+        assert results[1]["message"] == "마법 사용은 금지!"
+        assert results[2]["flags"]["rule_violation"]["rule_id"] == "NO_ELF"
+
+    def test_rule_guard_reports_all_violations_in_one_scan(self):
+        """Test that every violation is listed while the first rule's message is kept."""
+        rules = [
+            {"id": "SUFFIX", "pattern": "법사", "message": "법사 금지!"},
+            {"id": "NO_MAGIC", "pattern": "마법", "message": "마법 금지!"},
+            {"id": "DOUBLED", "pattern": r"(다)\1", "message": "반복 금지!"},
+            {"id": "NO_ELF", "pattern": "엘프", "message": "엘프 금지!"},
+        ]
+        self._create_test_rules(rules)
+        text = "마법사가 왔다다. 엘프와 마법을 썼다."
+
+        with pytest.raises(RetryException) as exc_info:
+            RuleGuard(rule_path=self.test_rules_path).check(text)
+
+        flag = exc_info.value.flags["rule_violation"]
+        # SUFFIX overlaps the earlier NO_MAGIC match but is first in rule order
+        assert flag["rule_id"] == "SUFFIX"
+        assert str(exc_info.value).startswith("[rule_guard] 법사 금지!")
+        found = [(v["rule_id"], text[v["span"][0] : v["span"][1]]) for v in flag["violations"]]
+        assert found == [
+            ("NO_MAGIC", "마법"),
+            ("SUFFIX", "법사"),
+            ("DOUBLED", "다다"),
+            ("NO_ELF", "엘프"),
+            ("NO_MAGIC", "마법"),
+        ]
+
+    def test_rule_pack_cached_until_file_changes(self):
+        """Test that rules are compiled once per rules file version."""
+        self._create_test_rules([{"id": "A", "pattern": "마법", "message": "m"}])
+
+        pack = load_rule_pack(self.test_rules_path)
+        assert load_rule_pack(self.test_rules_path) is pack
+        guard = RuleGuard(rule_path=self.test_rules_path)
+        assert guard.rules is pack.rules
+
+        self._create_test_rules([{"id": "B", "pattern": "엘프|드워프", "message": "e"}])
+        reloaded = load_rule_pack(self.test_rules_path)
+        assert reloaded is not pack
+        assert [rule["id"] for rule in reloaded.rules] == ["B"]
+
+        # An existing guard follows the reloaded pack instead of recompiling per check
+        assert guard._compile_rules() is reloaded
+        assert guard.rules is reloaded.rules
+        assert guard._compile_rules() is reloaded
+
+    def test_rules_matching_at_the_same_position_are_all_reported(self):
+        """Test that merged rules starting at the same offset are each reported."""
+        rules = [
+            {"id": "R1", "pattern": "bad", "message": "r1"},
+            {"id": "R2", "pattern": "bad word", "message": "r2"},
+            {"id": "R3", "pattern": r"\bword\b", "message": "r3"},
+        ]
+        self._create_test_rules(rules)
+        text = "this is a bad word here"
+
+        with pytest.raises(RetryException) as exc_info:
+            RuleGuard(rule_path=self.test_rules_path).check(text)
+
+        violations = exc_info.value.flags["rule_violation"]["violations"]
+        found = [(v["rule_id"], text[v["span"][0] : v["span"][1]]) for v in violations]
+        assert found == [("R1", "bad"), ("R2", "bad word"), ("R3", "word")]
+
+    def test_nested_quantifier_rules_are_isolated(self):
+        """Test that risky patterns are flagged at load time and still checked."""
+        assert nested_quantifiers(r"(\w+\s?)+$")
+        assert nested_quantifiers("((마+)법)*")
+        assert not nested_quantifiers(r"(\d{2}-)+")
+        assert not nested_quantifiers("마법|마도")
+
+        rules = [
+            {"id": "SAFE", "pattern": "엘프", "message": "엘프 금지!"},
+            {"id": "NESTED", "pattern": "(마+)+법", "message": "마법 금지!"},
+        ]
+        self._create_test_rules(rules)
+        pack = load_rule_pack(self.test_rules_path)
+        assert pack.isolated == [(1, "(마+)+법")]
+
+        with pytest.raises(RetryException) as exc_info:
+            RuleGuard(rule_path=self.test_rules_path).check("마마법을 쓰는 엘프")
+        assert exc_info.value.flags["rule_violation"]["matched_text"] == "엘프"
+        violations = exc_info.value.flags["rule_violation"]["violations"]
+        assert [v["rule_id"] for v in violations] == ["NESTED", "SAFE"]
+
+    def test_catastrophic_pattern_is_killed(self):
+        """Test that a backtracking pattern times out instead of stalling the check."""
+        self._create_test_rules([{"id": "EVIL", "pattern": "(a+)+$", "message": "evil"}])
+
+        with patch.dict(os.environ, {"RULE_SCAN_TIMEOUT": "0.5"}):
+            with pytest.raises(GuardTimeoutException) as exc_info:
+                RuleGuard(rule_path=self.test_rules_path).check("a" * 40 + "b")
+
+        assert exc_info.value.timeout == 0.5
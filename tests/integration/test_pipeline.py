@@ -203,5 +203,87 @@ def test_different_episode_numbers():
         assert len(result) > 0, f"Episode {ep_num} should not be empty"
 
 
+@pytest.mark.parametrize(
+    "second_run, kept",
+    [({}, True), ({"LexiGuard": "broken"}, False), ({"CritiqueGuard": "low score"}, True)],
+)
+def test_repaired_draft_rechecked_by_full_chain(monkeypatch, second_run, kept):
+    """Test that a repaired draft re-runs every guard and is kept unless a passed guard breaks."""
+    import shutil
+
+    from src.exceptions import RetryException
+    from src.utils.path_helper import data_path
+
+    monkeypatch.setenv("UNIT_TEST_MODE", "1")
+    project = "repair_recheck_test"
+    checked = []
+
+    def fake_guards(draft, episode_num, project="default", session=None):
+        checked.append(draft)
+        if len(checked) == 1:
+            # CritiqueGuard was fail-fast skipped, so the original was never critiqued
+            return {
+                "failures": {"RuleGuard": RetryException("rule violated", guard_name="rule_guard")},
+                "results": {
+                    "RuleGuard": {"status": "failed"},
+                    "LexiGuard": {"status": "passed"},
+                    "CritiqueGuard": {"status": "skipped"},
+                },
+            }
+        return {"failures": {name: RetryException(message) for name, message in second_run.items()}}
+
+    monkeypatch.setattr("src.main.run_guards_auto_registry", fake_guards)
+    monkeypatch.setattr("src.draft_generator.repair_draft", lambda draft, *a, **k: f"FIXED {draft}")
+
+    try:
+        result = run_pipeline(1, project)
+    finally:
+        shutil.rmtree(data_path("x", project).parent.parent, ignore_errors=True)
+
+    assert len(checked) == 2
+    assert checked[1] == f"FIXED {checked[0]}"
+    assert ("FIXED" in result) is kept
+
+
+def test_emotion_profiles_skipped_when_guard_disabled(monkeypatch):
+    """Test that Step 6.7 stores no emotion profiles when EmotionGuard is not enabled."""
+    import json
+    import shutil
+
+    from src.utils.path_helper import data_path
+
+    monkeypatch.setenv("UNIT_TEST_MODE", "1")
+    project = "emotion_disabled_test"
+    config_path = data_path("guard_config.json", project)
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    config_path.write_text(json.dumps({"enabled": ["LexiGuard"]}), encoding="utf-8")
+
+    try:
+        run_pipeline(1, project)
+        assert not data_path("emotion_profiles.npy", project).exists()
+    finally:
+        shutil.rmtree(config_path.parent.parent, ignore_errors=True)
+
+
+def test_pacing_history_skipped_when_guard_disabled(monkeypatch):
+    """Test that Step 6.8 records no pacing history when PacingGuard is not enabled."""
+    import json
+    import shutil
+
+    from src.utils.path_helper import data_path
+
+    monkeypatch.setenv("UNIT_TEST_MODE", "1")
+    project = "pacing_disabled_test"
+    config_path = data_path("guard_config.json", project)
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    config_path.write_text(json.dumps({"enabled": ["LexiGuard"]}), encoding="utf-8")
+
+    try:
+        run_pipeline(1, project)
+        assert not data_path("pacing_history.npy", project).exists()
+    finally:
+        shutil.rmtree(config_path.parent.parent, ignore_errors=True)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
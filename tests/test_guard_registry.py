@@ -5,17 +5,26 @@ Comprehensive test suite for the Guard Registry System.
 Tests registration, ordering, and auto-discovery functionality.
 """
 
+import json
+import sys
+from types import SimpleNamespace
+
 import pytest
 
+import src.core.guard_registry as guard_registry
 from src.core.guard_registry import (
     BaseGuard,
     GuardRegistry,
     clear_registry,
+    discover_guards,
+    enabled_guards,
     get_guard_count,
     get_registered_orders,
     get_sorted_guards,
+    load_guards,
     register_guard,
 )
+from src.exceptions import RetryException
 
 
 class TestGuardRegistry:
@@ -293,3 +302,140 @@ class TestGuardRegistry:
         result2 = guard2.check("test")
         assert result2["project"] == "custom"
         assert result2["param1"] == "value"
+
+    def test_register_guard_purity_and_resources(self):
+        """Test that register_guard records purity and resources on the class."""
+        clear_registry()
+
+        @register_guard(order=1, pure=False, resources=("episode_dates.json",))
+        class StatefulGuard(BaseGuard):
+            def check(self):
+                return {"passed": True}
+
+        @register_guard(order=2)
+        class PureGuard(BaseGuard):
+            def check(self):
+                return {"passed": True}
+
+        assert StatefulGuard.pure is False
+        assert StatefulGuard.resources == frozenset({"episode_dates.json"})
+        assert PureGuard.pure is True
+        assert PureGuard.resources == frozenset()
+
+    def test_load_guards_imports_only_enabled_modules(self):
+        """Test that load_guards imports nothing but the enabled guards' modules."""
+        clear_registry()
+
+        guards = load_guards(["RuleGuard", "LexiGuard"])
+
+        assert [guard.__name__ for guard in guards] == ["RuleGuard", "LexiGuard"]
+        assert "src.plugins.lexi_guard" in sys.modules
+        assert "src.plugins.emotion_guard" not in sys.modules
+        assert "src.plugins.critique_guard" not in sys.modules
+
+    def test_load_guards_all_by_default(self):
+        """Test that every manifest guard is loaded when nothing is configured."""
+        clear_registry()
+
+        guards = load_guards()
+
+        assert [guard.__name__ for guard in guards] == list(discover_guards())
+        assert get_registered_orders() == list(range(1, 11))
+
+    def test_entry_point_guards_discovered(self, tmp_path, monkeypatch):
+        """Test that third-party guards plug in through the entry-point group."""
+        clear_registry()
+        (tmp_path / "third_party_guard.py").write_text(
+            "from src.core.guard_registry import BaseGuard, register_guard\n"
+            "\n"
+            "@register_guard(order=50)\n"
+            "class ThirdPartyGuard(BaseGuard):\n"
+            "    def check(self, text):\n"
+            "        return {'passed': True}\n",
+            encoding="utf-8",
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        fake_entry_points = [
+            SimpleNamespace(name="ThirdPartyGuard", module="third_party_guard"),
+            SimpleNamespace(name="LexiGuard", module="third_party_guard"),
+        ]
+        monkeypatch.setattr(guard_registry, "entry_points", lambda group: fake_entry_points)
+
+        try:
+            modules = discover_guards()
+            guards = load_guards(["ThirdPartyGuard"])
+        finally:
+            sys.modules.pop("third_party_guard", None)
+
+        assert modules["ThirdPartyGuard"] == "third_party_guard"
+        assert modules["LexiGuard"] == "src.plugins.lexi_guard"
+        assert [guard.__name__ for guard in guards] == ["ThirdPartyGuard"]
+
+    def test_entry_point_guard_runs_in_pipeline(self, tmp_path, monkeypatch):
+        """Test that a third-party guard builds its own check() arguments in the pipeline."""
+        import src.main as main
+
+        clear_registry()
+        (tmp_path / "third_party_guard.py").write_text(
+            "from src.core.guard_registry import BaseGuard, register_guard\n"
+            "\n"
+            "calls = []\n"
+            "\n"
+            "@register_guard(order=50)\n"
+            "class ThirdPartyGuard(BaseGuard):\n"
+            "    def __init__(self, project='default'):\n"
+            "        self.project = project\n"
+            "\n"
+            "    @classmethod\n"
+            "    def job_args(cls, draft, analysis, episode_num, session):\n"
+            "        return (len(analysis.tokens), episode_num)\n"
+            "\n"
+            "    def check(self, words, episode_num):\n"
+            "        calls.append((words, episode_num))\n"
+            "        return {'passed': True}\n",
+            encoding="utf-8",
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        fake_entry_points = [SimpleNamespace(name="ThirdPartyGuard", module="third_party_guard")]
+        monkeypatch.setattr(guard_registry, "entry_points", lambda group: fake_entry_points)
+        monkeypatch.setattr(main, "enabled_guards", lambda project: ["ThirdPartyGuard"])
+
+        try:
+            report = main.run_guards_auto_registry("three little words", 4)
+            calls = sys.modules["third_party_guard"].calls
+        finally:
+            sys.modules.pop("third_party_guard", None)
+
+        assert report["failures"] == {}
+        assert calls == [(3, 4)]
+
+    def test_enabled_guards_from_project_config(self, tmp_path, monkeypatch):
+        """Test that data/guard_config.json selects the project's guards."""
+        monkeypatch.chdir(tmp_path)
+        data_dir = tmp_path / "projects" / "demo" / "data"
+        data_dir.mkdir(parents=True)
+
+        assert enabled_guards("demo") is None
+
+        (data_dir / "guard_config.json").write_text(
+            json.dumps({"enabled": ["LexiGuard", "PacingGuard"]}), encoding="utf-8"
+        )
+        assert enabled_guards("demo") == ["LexiGuard", "PacingGuard"]
+
+        (data_dir / "guard_config.json").write_text("not json", encoding="utf-8")
+        assert enabled_guards("demo") is None
+
+    def test_default_check_many_loops_over_check(self):
+        """Test that the default batch check returns one result per item without raising."""
+
+        class ThresholdGuard(BaseGuard):
+            def check(self, value, limit=10):
+                if value > limit:
+                    raise RetryException("too big", flags={"value": value}, guard_name="t")
+                return {"passed": True, "value": value}
+
+        results = ThresholdGuard().check_many([1, (20, 30), 11])
+
+        assert results[0] == {"passed": True, "value": 1}
+        assert results[1] == {"passed": True, "value": 20}
+        assert results[2] == {"passed": False, "flags": {"value": 11}, "message": "too big"}
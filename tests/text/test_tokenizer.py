@@ -0,0 +1,77 @@
+"""
+test_tokenizer.py
+
+Tests for the shared, memoized text tokenizer.
+"""
+
+from src.core.document_analysis import DocumentAnalysis
+from src.text import (
+    clear_text_cache,
+    content_words,
+    dialog_spans,
+    lower_tokens,
+    narration_sentences,
+    sentence_spans,
+    strip_josa,
+    tokenize,
+)
+
+SAMPLE = '그는 문을 열었다. "누구야?" 그녀가 물었다!\n대답은 없었다'
+
+
+class TestTokenizer:
+    """Test class for token, sentence and dialog views."""
+
+    def test_tokens(self):
+        """Test word tokenization in original and lower case."""
+        assert tokenize("Hello 세계, hello!") == ("Hello", "세계", "hello")
+        assert lower_tokens("Hello 세계, hello!") == ("hello", "세계", "hello")
+
+    def test_sentences_and_dialog(self):
+        """Test sentence spans, dialog spans and narration sentences."""
+        sentences = [SAMPLE[start:end] for start, end in sentence_spans(SAMPLE)]
+        assert sentences == ["그는 문을 열었다.", '"누구야?', '" 그녀가 물었다!', "대답은 없었다"]
+        assert [SAMPLE[start:end] for start, end in dialog_spans(SAMPLE)] == ['"누구야?"']
+        assert narration_sentences(SAMPLE) == ("그는 문을 열었다", "그녀가 물었다", "대답은 없었다")
+
+    def test_strip_josa(self):
+        """Test that one trailing particle is removed."""
+        assert strip_josa("주인공이") == "주인공"
+        assert strip_josa("학교로") == "학교"
+        assert strip_josa("등장한다") == "등장한"
+        assert strip_josa("사랑") == "사랑"
+
+    def test_content_words(self):
+        """Test that particles, stop words and single characters are dropped."""
+        assert content_words("주인공이 학교에 등장한다") == ("주인공", "학교", "등장한")
+        assert content_words("이 가 를") == ()
+
+
+class TestTextCache:
+    """Test class for per-text memoization."""
+
+    def test_results_memoized_by_text(self):
+        """Test that equal texts are tokenized once and share the result."""
+        clear_text_cache()
+        first = tokenize("같은 문장 " * 3)
+        second = tokenize("같은 문장 " * 3)
+
+        assert first is second
+        assert (tokenize.cache.hits, tokenize.cache.misses) == (1, 1)
+
+    def test_analyses_share_tokenization(self):
+        """Test that separate analyses of one text reuse the memoized tokens."""
+        clear_text_cache()
+        first = DocumentAnalysis(SAMPLE).lower_tokens
+        second = DocumentAnalysis(SAMPLE).lower_tokens
+
+        assert first == second
+        assert lower_tokens.cache.misses == 1
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used entries are evicted."""
+        clear_text_cache()
+        for i in range(tokenize.cache.maxsize + 10):
+            tokenize(f"text {i}")
+
+        assert len(tokenize.cache._entries) == tokenize.cache.maxsize
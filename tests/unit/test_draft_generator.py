@@ -221,3 +221,38 @@ def test_retry_on_short_output(monkeypatch):
     # Should raise RetryException due to short output
     with pytest.raises(RetryException):
         generate_draft("dummy", 1)
+
+
+def test_exhausted_budget_skips_draft_critique(monkeypatch):
+    """Draft critique is low priority: once the budget is spent it is skipped."""
+    from src.core.retry_budget import RetryBudget
+
+    monkeypatch.delenv("UNIT_TEST_MODE", raising=False)
+    monkeypatch.delenv("FAST_MODE", raising=False)
+    monkeypatch.setattr("src.draft_generator.call_llm", lambda *a, **k: "story line\n" * 30)
+
+    budget = RetryBudget(max_attempts=1)
+    with patch("src.draft_generator.critique_guard") as mock_critique:
+        result = generate_draft("dummy", 1, budget=budget)
+
+    mock_critique.assert_not_called()
+    assert "story line" in result
+    assert budget.attempts_used == 1
+
+
+def test_draft_critique_charges_tokens(monkeypatch):
+    """Draft critique spends a critique attempt and charges its tokens."""
+    from src.core.retry_budget import RetryBudget, estimate_tokens
+
+    monkeypatch.delenv("UNIT_TEST_MODE", raising=False)
+    monkeypatch.delenv("FAST_MODE", raising=False)
+    monkeypatch.setattr("src.draft_generator.call_llm", lambda *a, **k: "story line\n" * 30)
+
+    budget = RetryBudget()
+    with patch("src.draft_generator.critique_guard") as mock_critique:
+        generate_draft("dummy", 1, budget=budget)
+        draft_tokens = budget.tokens_used - estimate_tokens(mock_critique.call_args[0][0])
+
+    mock_critique.assert_called_once()
+    assert budget.attempts_used == 2
+    assert draft_tokens > 0